@@ -1,5 +1,12 @@
 """Pythonpedia package."""
 
-from app.main import main
-
 __all__ = ["main"]
+
+
+def __getattr__(name: str):
+    if name == "main":
+        from app.main import main
+
+        globals()["main"] = main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1 @@
+"""Synthetic corpora and search latency benchmarks."""
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import sys
+import types
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Mapping
+
+from app.lesson_base import Lesson, LessonInfo
+from app.utils.library_catalog import LIBRARIES, LibraryItem
+
+DEFAULT_LESSON_WORDS = 1500
+SYNTHETIC_PACKAGE = "app.benchmarks.synthetic"
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+_IDENTIFIER_RE = re.compile(r"[a-z_][a-z0-9_]*")
+_TERM_KINDS = ("method", "method", "function", "builtin", "attribute", "explicit")
+_OWNERS = (
+    ("df", "DataFrame", "pandas"),
+    ("serie", "Series", "pandas"),
+    ("texto", "str", "builtin"),
+    ("lista", "list", "builtin"),
+    ("datos", "dict", "builtin"),
+    ("sesion", "Session", "sqlalchemy"),
+)
+_LIBRARY_PREFIXES = ("pd", "np", "plt", "tf", "torch")
+_SECTIONS_PER_LESSON = 4
+_RELATED_PER_TERM = 8
+
+
+class SyntheticLesson(Lesson):
+    SUMMARY: str = ""
+    SECTIONS: list[dict] = []
+    PITFALLS: list[tuple[str, str]] = []
+    EXAMPLES: list[tuple[str, str]] = []
+    EXERCISES: list[dict] = []
+
+    def summary(self) -> str:
+        return self.SUMMARY
+
+    def guide(self) -> str:
+        return "\n\n".join(section["content"] for section in self.SECTIONS)
+
+    def guide_sections(self) -> list[dict] | None:
+        return list(self.SECTIONS)
+
+    def common_pitfalls(self) -> list[tuple[str, str]]:
+        return list(self.PITFALLS)
+
+    def code_examples(self) -> list[tuple[str, str]]:
+        return list(self.EXAMPLES)
+
+    def exercises(self) -> list[dict]:
+        return list(self.EXERCISES)
+
+
+@dataclass
+class SyntheticCorpus:
+    scale: int
+    module_name: str
+    lessons: list[LessonInfo]
+    source_hashes: dict[str, str]
+    glossary: dict[str, dict[str, object]]
+    term_meta: dict[str, dict[str, str | None]]
+    term_labels: dict[str, str]
+    term_related: dict[str, list[str]]
+    libraries: dict[str, dict[str, object]]
+
+    def sizes(self) -> dict[str, int]:
+        return {
+            "lessons": len(self.lessons),
+            "terms": len(self.glossary),
+            "library_items": sum(len(library["items"]) for library in self.libraries.values()),
+        }
+
+
+class _TextWriter:
+    def __init__(self, rng: random.Random, words: list[str], names: list[str]) -> None:
+        self._rng = rng
+        self._words = words
+        self._names = names
+
+    def sentence(self, length: int) -> str:
+        words = self._rng.choices(self._words, k=max(3, length))
+        if self._rng.random() < 0.35:
+            alias, _owner, _namespace = self._rng.choice(_OWNERS)
+            words.insert(self._rng.randrange(len(words)), f"{alias}.{self._rng.choice(self._names)}()")
+        return words[0].capitalize() + " " + " ".join(words[1:]) + "."
+
+    def paragraph(self, words: int) -> str:
+        sentences = []
+        while words > 0:
+            length = self._rng.randint(8, 20)
+            sentences.append(self.sentence(length))
+            words -= length
+        return " ".join(sentences)
+
+    def code(self, lines: int) -> str:
+        code = ["import pandas as pd", f"df = pd.read_csv('datos_{self._rng.randrange(1000)}.csv')"]
+        for index in range(lines):
+            name = self._rng.choice(self._names)
+            if index % 3 == 0:
+                code.append(f"resultado = {self._rng.choice(_LIBRARY_PREFIXES)}.{name}(df)")
+            else:
+                alias, _owner, _namespace = self._rng.choice(_OWNERS)
+                code.append(f"resultado = {alias}.{name}()")
+        code.append("print(len(resultado))")
+        return "\n".join(code)
+
+
+def _vocabulary() -> tuple[list[str], list[str]]:
+    words: dict[str, None] = {}
+    names: dict[str, None] = {}
+    for library in LIBRARIES.values():
+        for text in (library.get("summary", ""), " ".join(library.get("tags", []))):
+            words.update(dict.fromkeys(word.lower() for word in _WORD_RE.findall(text)))
+        for item in library.get("items", []):
+            name = str(item.get("name", "")).lower()
+            if _IDENTIFIER_RE.fullmatch(name):
+                names[name] = None
+            for text in (item.get("what", ""), " ".join(item.get("when", [])), " ".join(item.get("pitfalls", []))):
+                words.update(dict.fromkeys(word.lower() for word in _WORD_RE.findall(text)))
+    return sorted(words), sorted(names)
+
+
+def _lesson_attrs(writer: _TextWriter, info: LessonInfo, lesson_words: int) -> dict[str, object]:
+    section_words = max(20, lesson_words // (_SECTIONS_PER_LESSON + 2))
+    return {
+        "TITLE": info.title,
+        "CATEGORY": info.category,
+        "SUBCATEGORY": info.subcategory,
+        "LEVEL": info.level,
+        "TAGS": list(info.tags),
+        "SUMMARY": writer.sentence(18),
+        "SECTIONS": [
+            {"title": writer.sentence(4).rstrip("."), "content": writer.paragraph(section_words)}
+            for _index in range(_SECTIONS_PER_LESSON)
+        ],
+        "PITFALLS": [(writer.sentence(4).rstrip("."), writer.paragraph(section_words // 4)) for _index in range(3)],
+        "EXAMPLES": [(writer.sentence(4).rstrip("."), writer.code(8)) for _index in range(2)],
+        "EXERCISES": [
+            {
+                "question": writer.paragraph(section_words // 4),
+                "hints": [writer.sentence(8) for _hint in range(2)],
+                "solution": writer.code(4),
+            }
+            for _index in range(2)
+        ],
+    }
+
+
+def _synthetic_lessons(
+    rng: random.Random,
+    scale: int,
+    base_lessons: list[LessonInfo],
+    lesson_words: int,
+) -> tuple[str, list[LessonInfo], dict[str, str]]:
+    words, names = _vocabulary()
+    writer = _TextWriter(rng, words, names)
+    module_name = f"{SYNTHETIC_PACKAGE}_x{scale}"
+    module = types.ModuleType(module_name)
+    digest = hashlib.sha1(f"{module_name}:{lesson_words}".encode("utf-8"))
+    infos: list[LessonInfo] = []
+    for index in range(scale * len(base_lessons)):
+        base = base_lessons[index % len(base_lessons)]
+        round_number = index // len(base_lessons)
+        class_name = f"SyntheticLesson{index:06d}"
+        info = LessonInfo(
+            module=module_name,
+            class_name=class_name,
+            title=base.title if round_number == 0 else f"{base.title} ({round_number + 1})",
+            category=base.category,
+            subcategory=base.subcategory,
+            level=base.level,
+            tags=list(base.tags),
+        )
+        attrs = _lesson_attrs(writer, info, lesson_words)
+        attrs["__module__"] = module_name
+        attrs["__qualname__"] = class_name
+        setattr(module, class_name, type(class_name, (SyntheticLesson,), attrs))
+        digest.update(f"{class_name}:{attrs['SUMMARY']}\n".encode("utf-8"))
+        infos.append(info)
+    sys.modules[module_name] = module
+    return module_name, infos, {module_name: digest.hexdigest()}
+
+
+def _synthetic_terms(
+    rng: random.Random,
+    scale: int,
+    base_glossary: Mapping[str, dict[str, object]],
+) -> tuple[dict[str, dict[str, object]], dict[str, dict[str, str | None]], dict[str, str], dict[str, list[str]]]:
+    glossary: dict[str, dict[str, object]] = {}
+    term_meta: dict[str, dict[str, str | None]] = {}
+    term_labels: dict[str, str] = {}
+    owner_groups: dict[str, list[str]] = {}
+    base_items = list(base_glossary.items())
+    for round_number in range(scale):
+        for term, data in base_items:
+            term_id = term if round_number == 0 else f"{term}_{round_number}"
+            kind = rng.choice(_TERM_KINDS)
+            owner = namespace = None
+            if kind in {"method", "attribute"}:
+                _alias, owner, namespace = rng.choice(_OWNERS)
+            elif kind == "builtin":
+                namespace = "builtin"
+            label = f"{term_id}()" if kind in {"method", "function", "builtin"} else term_id
+            glossary[term_id] = data
+            term_labels[term_id] = label
+            term_meta[term_id] = {
+                "name": term_id,
+                "kind": kind,
+                "owner": owner,
+                "namespace": namespace or "manual",
+                "label": label,
+            }
+            if owner:
+                owner_groups.setdefault(owner, []).append(term_id)
+    term_related: dict[str, list[str]] = {}
+    for members in owner_groups.values():
+        for position, term_id in enumerate(members):
+            neighbours = members[max(0, position - _RELATED_PER_TERM // 2) : position + _RELATED_PER_TERM // 2 + 1]
+            term_related[term_id] = [other for other in neighbours if other != term_id]
+    return glossary, term_meta, term_labels, term_related
+
+
+def _renamed_item(item: LibraryItem, name: str) -> LibraryItem:
+    return LibraryItem(
+        name=name,
+        kind=item.kind,
+        common=item.common,
+        category=item.category,
+        signature=item.signature.replace(item.name, name, 1),
+        what=item.what,
+        when=item.when,
+        pitfalls=item.pitfalls,
+        example_code=item.example_code,
+    )
+
+
+def _synthetic_libraries(scale: int) -> dict[str, dict[str, object]]:
+    libraries: dict[str, dict[str, object]] = {}
+    for key, library in LIBRARIES.items():
+        items = [
+            item if round_number == 0 else _renamed_item(item, f"{item.name}_{round_number}")
+            for round_number in range(scale)
+            for item in library.get("items", [])
+        ]
+        libraries[key] = {**library, "items": items}
+    return libraries
+
+
+def build_corpus(
+    scale: int,
+    base_lessons: list[LessonInfo],
+    base_glossary: Mapping[str, dict[str, object]],
+    lesson_words: int = DEFAULT_LESSON_WORDS,
+    seed: int = 0,
+) -> SyntheticCorpus:
+    rng = random.Random(f"{seed}:{scale}")
+    module_name, lessons, source_hashes = _synthetic_lessons(rng, scale, base_lessons, lesson_words)
+    glossary, term_meta, term_labels, term_related = _synthetic_terms(rng, scale, base_glossary)
+    return SyntheticCorpus(
+        scale=scale,
+        module_name=module_name,
+        lessons=lessons,
+        source_hashes=source_hashes,
+        glossary=glossary,
+        term_meta=term_meta,
+        term_labels=term_labels,
+        term_related=term_related,
+        libraries=_synthetic_libraries(scale),
+    )
+
+
+@contextmanager
+def installed_libraries(libraries: Mapping[str, dict[str, object]]) -> Iterator[None]:
+    shipped = dict(LIBRARIES)
+    LIBRARIES.clear()
+    LIBRARIES.update(libraries)
+    try:
+        yield
+    finally:
+        LIBRARIES.clear()
+        LIBRARIES.update(shipped)
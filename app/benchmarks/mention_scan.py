@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Sequence
+from urllib.parse import unquote
+
+from app.utils.mention_indexer import (
+    _ATTRIBUTE_OWNER_MAP,
+    _BUILTIN_FUNCTIONS,
+    _LIB_ALIAS_MAP,
+    _METHOD_OWNER_MAP,
+    LessonSources,
+    MentionKey,
+    _alias_set,
+    _infer_owner_from_object,
+    _mention_key,
+    _namespace_from_owner,
+    _scan_mentions,
+)
+
+LOGGER = logging.getLogger(__name__)
+REPORT_VERSION = 1
+DEFAULT_REPORT_FILE = "mention_scan_benchmark.json"
+DEFAULT_SCALES = (1, 10)
+DEFAULT_REPEATS = 5
+
+_METHOD_WORD_RE = re.compile(r"\b(" + "|".join(sorted(_METHOD_OWNER_MAP)) + r")\b", re.IGNORECASE)
+_ATTRIBUTE_WORD_RE = re.compile(r"\b(" + "|".join(sorted(_ATTRIBUTE_OWNER_MAP)) + r")\b", re.IGNORECASE)
+_LIB_CALL_RE = re.compile(r"\b(?P<prefix>[A-Za-z_]\w*)\.(?P<name>[A-Za-z_]\w*)\s*\(")
+_METHOD_CALL_RE = re.compile(
+    r"(?P<object>(?:\"[^\"]*\"|'[^']*'|\[[^\]]*\]|\{[^\}]*\}|\b[A-Za-z_]\w*\b))\.(?P<name>[A-Za-z_]\w*)\s*\("
+)
+_ATTR_RE = re.compile(
+    r"(?P<object>(?:\"[^\"]*\"|'[^']*'|\[[^\]]*\]|\{[^\}]*\}|\b[A-Za-z_]\w*\b))\.(?P<name>[A-Za-z_]\w*)\b(?!\s*\()"
+)
+_FUNC_CALL_RE = re.compile(r"(?<!\.)\b([A-Za-z_]\w*)\s*\(")
+_TIP_ANCHOR_RE = re.compile(r"tip:([A-Za-z0-9:_\.\-%]+)")
+_KW_MARK_RE = re.compile(r"class\s*=\s*[\"'][^\"']*\bkw\b[^\"']*[\"'][^>]*>([^<]+)")
+
+
+@dataclass
+class MentionedTerm:
+    key: MentionKey
+    aliases: set[str] = field(default_factory=set)
+
+
+Extractor = Callable[[Sequence[str]], tuple[dict[MentionKey, MentionedTerm], dict[MentionKey, list[int]]]]
+
+
+def _add_term(
+    terms: dict[MentionKey, MentionedTerm],
+    kind: str,
+    namespace: str,
+    owner: str | None,
+    name: str,
+    aliases: Iterable[str],
+) -> MentionKey:
+    key = MentionKey(kind=kind, namespace=namespace, owner=owner, name=name.lower())
+    term = terms.get(key)
+    if term is None:
+        term = MentionedTerm(key=key)
+        terms[key] = term
+    for alias in aliases:
+        alias_clean = alias.strip()
+        if alias_clean:
+            term.aliases.add(alias_clean.lower())
+    return key
+
+
+def _record(
+    found: set[MentionKey],
+    occurrences: dict[MentionKey, list[int]],
+    key: MentionKey,
+    offset: int,
+) -> None:
+    found.add(key)
+    seen = occurrences.get(key)
+    if seen is None:
+        occurrences[key] = [1, offset]
+        return
+    seen[0] += 1
+    if offset < seen[1]:
+        seen[1] = offset
+
+
+def multipass_mentions(
+    text: str,
+    terms: dict[MentionKey, MentionedTerm],
+    occurrences: dict[MentionKey, list[int]],
+    base_offset: int = 0,
+) -> set[MentionKey]:
+    found: set[MentionKey] = set()
+    for match in _TIP_ANCHOR_RE.finditer(text):
+        term_id = unquote(match.group(1)).strip().lower()
+        if term_id:
+            key = _add_term(terms, "explicit", "manual", None, term_id, {term_id})
+            _record(found, occurrences, key, base_offset + match.start())
+    for match in _KW_MARK_RE.finditer(text):
+        term_text = match.group(1).strip()
+        if term_text:
+            key = _add_term(terms, "explicit", "manual", None, term_text.lower(), {term_text, term_text.lower()})
+            _record(found, occurrences, key, base_offset + match.start())
+    for match in _LIB_CALL_RE.finditer(text):
+        prefix = match.group("prefix")
+        if prefix not in _LIB_ALIAS_MAP:
+            continue
+        name = match.group("name").lower()
+        aliases = {f"{prefix}.{name}", f"{prefix}.{name}()", name, f"{name}()"}
+        key = _add_term(terms, "function", _LIB_ALIAS_MAP[prefix], None, name, aliases)
+        _record(found, occurrences, key, base_offset + match.start())
+    for match in _METHOD_CALL_RE.finditer(text):
+        obj = match.group("object")
+        if obj in _LIB_ALIAS_MAP:
+            continue
+        name = match.group("name").lower()
+        owner = _infer_owner_from_object(obj, name)
+        aliases = {f".{name}", f".{name}()", name, f"{name}()"}
+        key = _add_term(terms, "method", _namespace_from_owner(owner), owner, name, aliases)
+        _record(found, occurrences, key, base_offset + match.start())
+    for match in _ATTR_RE.finditer(text):
+        name = match.group("name").lower()
+        if name in _METHOD_OWNER_MAP:
+            owner = _METHOD_OWNER_MAP[name]
+            aliases = {f".{name}", f".{name}()", name, f"{name}()"}
+            key = _add_term(terms, "method", _namespace_from_owner(owner), owner, name, aliases)
+        else:
+            owner = _ATTRIBUTE_OWNER_MAP.get(name)
+            key = _add_term(terms, "attribute", _namespace_from_owner(owner), owner, name, {f".{name}", name})
+        _record(found, occurrences, key, base_offset + match.start())
+    for match in _FUNC_CALL_RE.finditer(text):
+        name = match.group(1).lower()
+        if name in _BUILTIN_FUNCTIONS:
+            key = _add_term(terms, "builtin", "builtin", None, name, {name, f"{name}()"})
+        else:
+            key = _add_term(terms, "function", "unknown", None, name, {name, f"{name}()"})
+        _record(found, occurrences, key, base_offset + match.start())
+    for match in _METHOD_WORD_RE.finditer(text):
+        name = match.group(1).lower()
+        owner = _METHOD_OWNER_MAP.get(name)
+        key = _add_term(terms, "method", _namespace_from_owner(owner), owner, name, {name})
+        _record(found, occurrences, key, base_offset + match.start())
+    for match in _ATTRIBUTE_WORD_RE.finditer(text):
+        name = match.group(1).lower()
+        owner = _ATTRIBUTE_OWNER_MAP.get(name)
+        key = _add_term(terms, "attribute", _namespace_from_owner(owner), owner, name, {name})
+        _record(found, occurrences, key, base_offset + match.start())
+    return found
+
+
+def multipass_lesson(texts: Sequence[str]) -> tuple[dict[MentionKey, MentionedTerm], dict[MentionKey, list[int]]]:
+    terms: dict[MentionKey, MentionedTerm] = {}
+    occurrences: dict[MentionKey, list[int]] = {}
+    offset = 0
+    for text in texts:
+        multipass_mentions(text, terms, occurrences, offset)
+        offset += len(text) + 1
+    return terms, occurrences
+
+
+def single_pass_lesson(texts: Sequence[str]) -> tuple[dict[MentionKey, MentionedTerm], dict[MentionKey, list[int]]]:
+    terms: dict[MentionKey, MentionedTerm] = {}
+    occurrences: dict[MentionKey, list[int]] = {}
+    hits: dict[tuple[str, str, str | None, str], list[int]] = {}
+    offset = 0
+    for text in texts:
+        _scan_mentions(text, hits, offset)
+        offset += len(text) + 1
+    for raw_key, (count, first_offset, aliases) in hits.items():
+        key = _mention_key(raw_key)
+        terms[key] = MentionedTerm(key=key, aliases=set(_alias_set(key.name, key.namespace, aliases)))
+        occurrences[key] = [count, first_offset]
+    return terms, occurrences
+
+
+def _snapshot(
+    result: tuple[dict[MentionKey, MentionedTerm], dict[MentionKey, list[int]]],
+) -> tuple[dict[MentionKey, set[str]], dict[MentionKey, tuple[int, ...]]]:
+    terms, occurrences = result
+    return {key: term.aliases for key, term in terms.items()}, {key: tuple(seen) for key, seen in occurrences.items()}
+
+
+def _scanned_texts(source: LessonSources) -> list[str]:
+    return [*source.texts, *source.code]
+
+
+def mismatched_lessons(sources: Sequence[LessonSources]) -> list[str]:
+    return [
+        source.lesson_key
+        for source in sources
+        if _snapshot(multipass_lesson(_scanned_texts(source))) != _snapshot(single_pass_lesson(_scanned_texts(source)))
+    ]
+
+
+def time_extractor(extractor: Extractor, sources: Sequence[LessonSources], repeats: int) -> list[float]:
+    samples: list[float] = []
+    for _repeat in range(repeats):
+        started = time.perf_counter()
+        for source in sources:
+            extractor(_scanned_texts(source))
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _timing_summary(samples: Sequence[float], characters: int) -> dict[str, float]:
+    best = min(samples)
+    return {
+        "best_seconds": best,
+        "median_seconds": statistics.median(samples),
+        "mb_per_second": characters / best / 1_000_000 if best else 0.0,
+    }
+
+
+def collect_sources(scale: int) -> list[LessonSources]:
+    from app.benchmarks.corpus import build_corpus
+    from app.registry import discover_lessons
+    from app.utils.mention_indexer import extract_lesson_sources
+
+    base_lessons = discover_lessons()
+    infos = base_lessons
+    if scale > 1:
+        infos = build_corpus(scale, base_lessons, {}).lessons
+    sources: list[LessonSources] = []
+    for info in infos:
+        lesson = info.lesson_cls()
+        try:
+            sources.append(extract_lesson_sources(lesson))
+        finally:
+            lesson.deleteLater()
+    return sources
+
+
+def run_scale(scale: int, repeats: int) -> dict[str, object]:
+    sources = collect_sources(scale)
+    characters = sum(len(text) for source in sources for text in _scanned_texts(source))
+    LOGGER.info("Escala x%d: %d lecciones, %d caracteres", scale, len(sources), characters)
+    mismatched = mismatched_lessons(sources)
+    if mismatched:
+        LOGGER.warning("%d lecciones con menciones distintas entre extractores", len(mismatched))
+    multipass = _timing_summary(time_extractor(multipass_lesson, sources, repeats), characters)
+    single_pass = _timing_summary(time_extractor(single_pass_lesson, sources, repeats), characters)
+    return {
+        "scale": scale,
+        "lessons": len(sources),
+        "texts": sum(len(_scanned_texts(source)) for source in sources),
+        "characters": characters,
+        "identical": not mismatched,
+        "mismatched_lessons": mismatched[:20],
+        "multipass": multipass,
+        "single_pass": single_pass,
+        "speedup": multipass["best_seconds"] / single_pass["best_seconds"] if single_pass["best_seconds"] else 0.0,
+    }
+
+
+def _print_summary(results: list[dict[str, object]]) -> None:
+    print(f"{'escala':>6}  {'lecciones':>9}  {'8 pasadas':>10}  {'1 pasada':>10}  {'mejora':>7}  iguales")
+    for result in results:
+        print(
+            f"x{result['scale']:<5}  {result['lessons']:>9}  "
+            f"{result['multipass']['best_seconds'] * 1000:>8.1f}ms  "
+            f"{result['single_pass']['best_seconds'] * 1000:>8.1f}ms  "
+            f"{result['speedup']:>6.2f}x  {'sí' if result['identical'] else 'no'}"
+        )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.mention_scan")
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SCALES),
+        metavar="N",
+        help="Multiplicadores del contenido incluido (por defecto: 1 10).",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help="Veces que se extraen las menciones de todo el corpus con cada extractor.",
+    )
+    parser.add_argument(
+        "--output",
+        default=DEFAULT_REPORT_FILE,
+        metavar="RUTA",
+        help="Archivo JSON donde guardar los tiempos.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("PYTHONPEDIA_CACHE_DIR", tempfile.mkdtemp(prefix="pythonpedia-bench-cache-"))
+
+    from PySide6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    repeats = max(1, args.repeats)
+    results = [run_scale(scale, repeats) for scale in args.scales]
+    app.processEvents()
+    report = {
+        "version": REPORT_VERSION,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "results": results,
+    }
+    output = Path(args.output).expanduser().resolve()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    _print_summary(results)
+    LOGGER.info("Informe de extracción de menciones guardado en %s", output)
+    return 0 if all(result["identical"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Sequence
+
+LOGGER = logging.getLogger(__name__)
+REPORT_VERSION = 1
+DEFAULT_REPORT_FILE = "search_benchmark.json"
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_REPEATS = 5
+PERCENTILES = (50, 90, 95, 99)
+_IDLE_SLEEP_SECONDS = 0.002
+_INDEXING_TIMEOUT_SECONDS = 1800.0
+
+LESSON_QUERIES = (
+    "pandas",
+    "groupby",
+    "lista comprension",
+    "cat:pandas merge",
+    "nivel:avanzado tag:sql consulta",
+    "datfrane",
+)
+TERM_QUERIES = (
+    "append",
+    "read_csv",
+    "diccionario",
+    "dataframe columna",
+    "apend",
+)
+METHOD_QUERIES = (
+    "append",
+    "str.split",
+    "groupby",
+    "mean",
+    "splt",
+)
+LIBRARY_QUERIES = (
+    "DataFrame",
+    "tensor",
+    "lib:pandas merge",
+    "tipo:funcion común:sí read",
+    "cat:io read",
+    "dataframee",
+)
+
+
+@dataclass
+class ViewTarget:
+    name: str
+    line_edit: object
+    controller: object
+    queries: Sequence[str]
+
+
+@dataclass
+class LatencySamples:
+    keystroke: list[float] = field(default_factory=list)
+    apply_filter: list[float] = field(default_factory=list)
+
+
+def percentile(samples: Sequence[float], rank: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * rank / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def latency_summary(samples: Sequence[float]) -> dict[str, float]:
+    summary: dict[str, float] = {"count": len(samples)}
+    for rank in PERCENTILES:
+        summary[f"p{rank}_ms"] = percentile(samples, rank) * 1000
+    summary["max_ms"] = max(samples, default=0.0) * 1000
+    summary["mean_ms"] = statistics.fmean(samples) * 1000 if samples else 0.0
+    return summary
+
+
+def _settle(app: object) -> None:
+    app.processEvents()
+    time.sleep(_IDLE_SLEEP_SECONDS)
+
+
+def _timed(app: object, action: Callable[[], None]) -> float:
+    started = time.perf_counter()
+    action()
+    app.processEvents()
+    return time.perf_counter() - started
+
+
+def measure_view(app: object, target: ViewTarget, repeats: int) -> LatencySamples:
+    samples = LatencySamples()
+    line_edit = target.line_edit
+    controller = target.controller
+
+    def type_text(text: str) -> None:
+        line_edit.setText(text)
+        controller.flush()
+
+    for query in target.queries:
+        for _repeat in range(repeats):
+            type_text("")
+            _settle(app)
+            for length in range(1, len(query) + 1):
+                samples.keystroke.append(_timed(app, lambda: type_text(query[:length])))
+                _settle(app)
+            samples.apply_filter.append(_timed(app, controller.refresh))
+            _settle(app)
+    type_text("")
+    _settle(app)
+    return samples
+
+
+def _wait_for_indexing(app: object, window: object) -> None:
+    deadline = time.perf_counter() + _INDEXING_TIMEOUT_SECONDS
+    while window._indexer is not None and window._indexer.is_running:
+        if time.perf_counter() > deadline:
+            raise TimeoutError("La indexación de lecciones no terminó a tiempo")
+        _settle(app)
+
+
+def run_scale(app: object, scale: int, repeats: int, lesson_words: int) -> dict[str, object]:
+    from PySide6.QtCore import QSettings
+
+    from app.benchmarks.corpus import build_corpus, installed_libraries
+    from app.main import MainWindow
+    from app.registry import discover_lessons, install_lessons
+    from app.ui.glossary_view import GlossaryView
+    from app.ui.library_reference_view import LibraryReferenceView
+    from app.ui.method_reference_view import MethodReferenceView
+    from app.utils.content_index import (
+        GLOSSARY_KINDS,
+        GLOSSARY_SOURCE,
+        KIND_LIBRARY,
+        LIBRARY_SOURCE,
+        ContentIndex,
+        glossary_records,
+        library_records,
+    )
+    from app.utils.glossary import GLOSSARY
+
+    base_lessons = discover_lessons()
+    started = time.perf_counter()
+    corpus = build_corpus(scale, base_lessons, dict(GLOSSARY.items()), lesson_words=lesson_words)
+    corpus_seconds = time.perf_counter() - started
+    LOGGER.info("Corpus x%d: %s", scale, corpus.sizes())
+
+    views: dict[str, dict[str, object]] = {}
+    setup: dict[str, float] = {}
+    with installed_libraries(corpus.libraries):
+        install_lessons(corpus.lessons, corpus.source_hashes)
+        settings_file = Path(tempfile.mkdtemp(prefix="pythonpedia-bench-")) / "settings.ini"
+        settings = QSettings(str(settings_file), QSettings.IniFormat)
+
+        started = time.perf_counter()
+        window = MainWindow(app, settings, "light")
+        window.show()
+        _wait_for_indexing(app, window)
+        setup["MainWindow"] = time.perf_counter() - started
+
+        content_index = ContentIndex()
+        content_index.add_source(
+            GLOSSARY_SOURCE,
+            GLOSSARY_KINDS,
+            lambda: glossary_records(corpus.glossary, corpus.term_meta, corpus.term_labels),
+        )
+        content_index.add_source(LIBRARY_SOURCE, (KIND_LIBRARY,), library_records)
+
+        started = time.perf_counter()
+        content_index.ensure(GLOSSARY_KINDS)
+        glossary_view = GlossaryView(content_index)
+        glossary_view.load_terms(corpus.glossary, corpus.term_meta, corpus.term_labels, corpus.term_related)
+        glossary_view.show()
+        setup["GlossaryView"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        method_view = MethodReferenceView(content_index)
+        method_view.load_terms(corpus.glossary, corpus.term_meta, corpus.term_labels)
+        method_view.show()
+        setup["MethodReferenceView"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        content_index.ensure(KIND_LIBRARY)
+        library_view = LibraryReferenceView(content_index)
+        library_view.show()
+        setup["LibraryReferenceView"] = time.perf_counter() - started
+        _settle(app)
+
+        targets = (
+            ViewTarget("MainWindow", window.search_input, window.search_controller, LESSON_QUERIES),
+            ViewTarget("GlossaryView", glossary_view.search_input, glossary_view.search_controller, TERM_QUERIES),
+            ViewTarget("MethodReferenceView", method_view.search_input, method_view.search_controller, METHOD_QUERIES),
+            ViewTarget(
+                "LibraryReferenceView", library_view.search_input, library_view.search_controller, LIBRARY_QUERIES
+            ),
+        )
+        for target in targets:
+            LOGGER.info("Midiendo %s x%d", target.name, scale)
+            samples = measure_view(app, target, repeats)
+            views[target.name] = {
+                "setup_seconds": setup[target.name],
+                "keystroke": latency_summary(samples.keystroke),
+                "apply_filter": latency_summary(samples.apply_filter),
+            }
+
+        for widget in (library_view, method_view, glossary_view, window):
+            widget.close()
+            widget.deleteLater()
+        _settle(app)
+
+    return {
+        "scale": scale,
+        "sizes": corpus.sizes(),
+        "corpus_seconds": corpus_seconds,
+        "views": views,
+    }
+
+
+def _print_summary(results: list[dict[str, object]]) -> None:
+    print(f"{'escala':>6}  {'vista':<22} {'p50':>8} {'p95':>8} {'p99':>8} {'filtro p95':>11}")
+    for result in results:
+        for name, view in result["views"].items():
+            keystroke = view["keystroke"]
+            print(
+                f"x{result['scale']:<5}  {name:<22} "
+                f"{keystroke['p50_ms']:>6.1f}ms {keystroke['p95_ms']:>6.1f}ms {keystroke['p99_ms']:>6.1f}ms "
+                f"{view['apply_filter']['p95_ms']:>9.1f}ms"
+            )
+
+
+def parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.search_latency")
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SCALES),
+        metavar="N",
+        help="Multiplicadores del contenido incluido (por defecto: 1 10 100).",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=DEFAULT_REPEATS,
+        help="Veces que se teclea cada consulta por vista.",
+    )
+    parser.add_argument(
+        "--lesson-words",
+        type=int,
+        default=None,
+        help="Palabras aproximadas por lección sintética.",
+    )
+    parser.add_argument(
+        "--output",
+        default=DEFAULT_REPORT_FILE,
+        metavar="RUTA",
+        help="Archivo JSON donde guardar los percentiles.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("PYTHONPEDIA_CACHE_DIR", tempfile.mkdtemp(prefix="pythonpedia-bench-cache-"))
+
+    from PySide6 import __version__ as pyside_version
+    from PySide6.QtWidgets import QApplication
+
+    from app.benchmarks.corpus import DEFAULT_LESSON_WORDS
+    from app.utils.theme import apply_theme
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    apply_theme(app, "light")
+    lesson_words = args.lesson_words or DEFAULT_LESSON_WORDS
+    results = [run_scale(app, scale, max(1, args.repeats), lesson_words) for scale in args.scales]
+    report = {
+        "version": REPORT_VERSION,
+        "python": sys.version.split()[0],
+        "pyside": pyside_version,
+        "platform": platform.platform(),
+        "qt_platform": os.environ["QT_QPA_PLATFORM"],
+        "lesson_words": lesson_words,
+        "repeats": max(1, args.repeats),
+        "results": results,
+    }
+    output = Path(args.output).expanduser().resolve()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    _print_summary(results)
+    LOGGER.info("Informe de latencia guardado en %s", output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
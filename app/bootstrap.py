@@ -10,6 +10,15 @@ def run():
         print('Comprueba con: python -c "import PySide6"')
         return
 
-    from app.main import main
+    from app.cli import parse_args
+    from app.utils import startup_profiler
+
+    args, _qt_argv = parse_args(sys.argv)
+    if args.profile_startup:
+        startup_profiler.start_profiling(args.profile_startup)
+    with startup_profiler.phase("import PySide6"):
+        import PySide6.QtWidgets  # noqa: F401
+    with startup_profiler.phase("import app.main"):
+        from app.main import main
 
     main()
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import argparse
+
+from app.utils.startup_profiler import DEFAULT_REPORT_FILE
+
+
+def parse_args(argv: list[str]) -> tuple[argparse.Namespace, list[str]]:
+    parser = argparse.ArgumentParser(prog="python -m app")
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="Ignora las cachés en disco y reconstruye el manifiesto y los índices.",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        nargs="?",
+        const=DEFAULT_REPORT_FILE,
+        default=None,
+        metavar="RUTA",
+        help="Mide tiempo y memoria de cada fase del arranque y guarda un informe JSON al salir.",
+    )
+    args, qt_args = parser.parse_known_args(argv[1:])
+    return args, [argv[0], *qt_args]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Literal
+import importlib
+from dataclasses import dataclass, field
+from typing import Literal, NamedTuple
+from weakref import WeakKeyDictionary
 
 from PySide6.QtWidgets import QWidget
 
@@ -43,9 +45,115 @@ class Lesson(QWidget):
 
 @dataclass(frozen=True)
 class LessonInfo:
-    lesson_cls: type[Lesson]
+    module: str
+    class_name: str
     title: str
     category: str
     subcategory: str
     level: str
     tags: list[str]
+    badges: list[str] = field(default_factory=list)
+    lesson_badge: str = ""
+
+    @property
+    def lesson_id(self) -> str:
+        return f"{self.module}.{self.class_name}"
+
+    @property
+    def lesson_cls(self) -> type[Lesson]:
+        module = importlib.import_module(self.module)
+        return getattr(module, self.class_name)
+
+
+class GuideSection(NamedTuple):
+    title: str
+    content: str
+
+
+class LessonExercise(NamedTuple):
+    question: str
+    hints: tuple[str, ...]
+    solution: str
+
+
+_LESSON_CONTENT_FIELDS = ("summary", "tutorial", "sections", "pitfalls", "examples", "exercises", "requirements")
+
+
+class LessonContent:
+    __slots__ = _LESSON_CONTENT_FIELDS
+
+    summary: str
+    tutorial: str
+    sections: tuple[GuideSection, ...]
+    pitfalls: tuple[tuple[str, str], ...]
+    examples: tuple[tuple[str, str], ...]
+    exercises: tuple[LessonExercise, ...]
+    requirements: tuple[str, ...]
+
+    def __init__(
+        self,
+        summary: str,
+        tutorial: str,
+        sections: tuple[GuideSection, ...] = (),
+        pitfalls: tuple[tuple[str, str], ...] = (),
+        examples: tuple[tuple[str, str], ...] = (),
+        exercises: tuple[LessonExercise, ...] = (),
+        requirements: tuple[str, ...] = (),
+    ) -> None:
+        values = (summary, tutorial, sections, pitfalls, examples, exercises, requirements)
+        for name, value in zip(_LESSON_CONTENT_FIELDS, values):
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_lesson(cls, lesson: Lesson) -> LessonContent:
+        return cls(
+            summary=lesson.summary(),
+            tutorial=lesson.tutorial(),
+            sections=tuple(
+                GuideSection(str(section.get("title", "")), str(section.get("content", "")))
+                for section in lesson.guide_sections() or []
+            ),
+            pitfalls=tuple((title, detail) for title, detail in lesson.common_pitfalls()),
+            examples=tuple((title, code) for title, code in lesson.code_examples()),
+            exercises=tuple(
+                LessonExercise(
+                    str(exercise.get("question", "")),
+                    tuple(exercise.get("hints", [])),
+                    str(exercise.get("solution", "")),
+                )
+                for exercise in lesson.exercises()
+            ),
+            requirements=tuple(lesson.requirements()),
+        )
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"LessonContent es inmutable: no se puede asignar {name!r}")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"LessonContent es inmutable: no se puede borrar {name!r}")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LessonContent):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _LESSON_CONTENT_FIELDS)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, name) for name in _LESSON_CONTENT_FIELDS))
+
+    def __reduce__(self) -> tuple[type[LessonContent], tuple[object, ...]]:
+        return LessonContent, tuple(getattr(self, name) for name in _LESSON_CONTENT_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"LessonContent({self.summary[:40]!r}, sections={len(self.sections)}, examples={len(self.examples)})"
+
+
+_LESSON_CONTENT: WeakKeyDictionary[type[Lesson], LessonContent] = WeakKeyDictionary()
+
+
+def lesson_content(lesson: Lesson) -> LessonContent:
+    lesson_cls = type(lesson)
+    content = _LESSON_CONTENT.get(lesson_cls)
+    if content is None:
+        content = LessonContent.from_lesson(lesson)
+        _LESSON_CONTENT[lesson_cls] = content
+    return content
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+
+from app.lesson_base import Lesson, LessonInfo
+from app.registry import load_lesson_class
+
+LOGGER = logging.getLogger(__name__)
+DEFAULT_CACHE_SIZE = 8
+
+
+class LessonHandle:
+    def __init__(self, info: LessonInfo) -> None:
+        self.info = info
+        self._lesson_cls: type[Lesson] | None = None
+        self._instance: Lesson | None = None
+
+    @property
+    def lesson_id(self) -> str:
+        return self.info.lesson_id
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._instance is not None
+
+    def lesson_cls(self) -> type[Lesson] | None:
+        if self._lesson_cls is None:
+            self._lesson_cls = load_lesson_class(self.info)
+        return self._lesson_cls
+
+    def create(self) -> Lesson | None:
+        lesson_cls = self.lesson_cls()
+        if lesson_cls is None:
+            return None
+        try:
+            return lesson_cls()
+        except Exception:
+            LOGGER.exception("No se pudo instanciar %s", self.info.title)
+            return None
+
+    def get(self) -> Lesson | None:
+        if self._instance is None:
+            self._instance = self.create()
+        return self._instance
+
+    def release(self) -> None:
+        instance = self._instance
+        self._instance = None
+        if instance is not None:
+            instance.deleteLater()
+
+
+class LessonInstanceCache:
+    def __init__(self, capacity: int = DEFAULT_CACHE_SIZE) -> None:
+        self.capacity = max(1, capacity)
+        self._handles: OrderedDict[str, LessonHandle] = OrderedDict()
+
+    def acquire(self, handle: LessonHandle) -> Lesson | None:
+        lesson = handle.get()
+        if lesson is None:
+            return None
+        self._handles[handle.lesson_id] = handle
+        self._handles.move_to_end(handle.lesson_id)
+        while len(self._handles) > self.capacity:
+            _lesson_id, evicted = self._handles.popitem(last=False)
+            evicted.release()
+        return lesson
+
+    def discard(self, handle: LessonHandle) -> None:
+        stored = self._handles.pop(handle.lesson_id, None)
+        if stored is not None:
+            stored.release()
+
+    def clear(self) -> None:
+        while self._handles:
+            _lesson_id, handle = self._handles.popitem(last=False)
+            handle.release()
+
+    def __len__(self) -> int:
+        return len(self._handles)
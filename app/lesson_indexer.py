@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+import time
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+from app.lesson_base import LessonContent, lesson_content
+from app.lesson_cache import LessonHandle
+from app.registry import lesson_source_hash
+from app.utils import startup_profiler
+from app.utils.lesson_content_store import LessonContentStore
+from app.utils.mention_indexer import (
+    CodeMentionCache,
+    LessonSources,
+    MentionIndex,
+    ResolvedMentionIndex,
+    build_mention_index,
+    content_sources,
+    install_mention_index,
+    load_code_mention_cache,
+    resolve_mention_index,
+    save_mention_index_cache,
+)
+
+LOGGER = logging.getLogger(__name__)
+_CHUNK_BUDGET_SECONDS = 0.012
+
+
+class _MentionIndexSignals(QObject):
+    finished = Signal(object, object, object)
+    failed = Signal(str)
+
+
+class _MentionIndexTask(QRunnable):
+    def __init__(
+        self,
+        sources: list[LessonSources],
+        glossary: dict[str, dict[str, object]],
+        fingerprint: str,
+    ) -> None:
+        super().__init__()
+        self.setAutoDelete(False)
+        self.signals = _MentionIndexSignals()
+        self._sources = sources
+        self._glossary = glossary
+        self._fingerprint = fingerprint
+
+    def run(self) -> None:
+        try:
+            code_cache = load_code_mention_cache()
+            with startup_profiler.phase("build_mention_index"):
+                index = build_mention_index(self._sources, code_cache)
+            with startup_profiler.phase("resolve_mention_index"):
+                resolved = resolve_mention_index(index, self._glossary)
+            save_mention_index_cache(self._fingerprint, index, resolved, code_cache)
+        except Exception as exc:
+            LOGGER.exception("No se pudo construir el índice de menciones")
+            self.signals.failed.emit(f"{type(exc).__name__}: {exc}")
+            return
+        self.signals.finished.emit(index, resolved, code_cache)
+
+
+class LessonIndexer(QObject):
+    lessonsLoaded = Signal(list)
+    lessonFailed = Signal(object)
+    progress = Signal(int, int)
+    contentReady = Signal()
+    mentionIndexReady = Signal(object)
+    mentionIndexFailed = Signal(str)
+
+    def __init__(
+        self,
+        handles: list[LessonHandle],
+        content_store: LessonContentStore,
+        glossary: dict[str, dict[str, object]],
+        fingerprint: str | None,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._handles = handles
+        self._content_store = content_store
+        self._glossary = glossary
+        self._fingerprint = fingerprint
+        self._position = 0
+        self._sources: list[LessonSources] = []
+        self._task: _MentionIndexTask | None = None
+        self._cancelled = False
+        self.content_ready = False
+        self.mention_index_ready = fingerprint is None
+
+    @property
+    def is_running(self) -> bool:
+        return not self._cancelled and not (self.content_ready and self.mention_index_ready)
+
+    def start(self) -> None:
+        self.progress.emit(0, len(self._handles))
+        QTimer.singleShot(0, self._step)
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def _step(self) -> None:
+        if self._cancelled:
+            return
+        deadline = time.perf_counter() + _CHUNK_BUDGET_SECONDS
+        loaded: list[tuple[LessonHandle, LessonContent]] = []
+        while self._position < len(self._handles) and time.perf_counter() < deadline:
+            handle = self._handles[self._position]
+            content = self._index_handle(handle)
+            if content is not None:
+                loaded.append((handle, content))
+            self._position += 1
+        if loaded:
+            self.lessonsLoaded.emit(loaded)
+        self.progress.emit(self._position, len(self._handles))
+        if self._position < len(self._handles):
+            QTimer.singleShot(0, self._step)
+            return
+        self._finish_content()
+
+    def _index_handle(self, handle: LessonHandle) -> LessonContent | None:
+        source = lesson_source_hash(handle.info.module)
+        content = self._content_store.get(handle.lesson_id, source)
+        try:
+            if content is None:
+                content = self._snapshot(handle, source)
+            if content is not None and not self.mention_index_ready:
+                self._sources.append(content_sources(handle.info, content))
+        except Exception:
+            LOGGER.exception("No se pudo indexar la lección %s", handle.info.title)
+            content = None
+        if content is None:
+            self.lessonFailed.emit(handle)
+        return content
+
+    def _snapshot(self, handle: LessonHandle, source: str) -> LessonContent | None:
+        with startup_profiler.phase("lesson.instantiate"):
+            lesson = handle.create()
+        if lesson is None:
+            return None
+        try:
+            content = lesson_content(lesson)
+        finally:
+            lesson.deleteLater()
+        self._content_store.set(handle.lesson_id, content, source)
+        return content
+
+    def _finish_content(self) -> None:
+        self.content_ready = True
+        startup_profiler.mark("lesson_content_indexed")
+        self.contentReady.emit()
+        if self.mention_index_ready or self._fingerprint is None:
+            return
+        self._task = _MentionIndexTask(self._sources, self._glossary, self._fingerprint)
+        self._task.signals.finished.connect(self._on_mention_index_finished)
+        self._task.signals.failed.connect(self._on_mention_index_failed)
+        QThreadPool.globalInstance().start(self._task)
+
+    def _on_mention_index_finished(
+        self,
+        index: MentionIndex,
+        resolved: ResolvedMentionIndex,
+        code_cache: CodeMentionCache,
+    ) -> None:
+        self._sources = []
+        self.mention_index_ready = True
+        if self._cancelled:
+            return
+        install_mention_index(index, resolved, self._glossary, code_cache)
+        startup_profiler.mark("mention_index_ready")
+        self.mentionIndexReady.emit(resolved)
+
+    def _on_mention_index_failed(self, message: str) -> None:
+        self._sources = []
+        self.mention_index_ready = True
+        if not self._cancelled:
+            self.mentionIndexFailed.emit(message)
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import logging
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from app.utils import disk_cache
+
+LOGGER = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+MANIFEST_FILE = "lesson_manifest.json"
+LESSONS_PACKAGE = "app.lessons"
+LESSONS_ROOT = Path(__file__).resolve().parent / "lessons"
+
+_LESSON_BASES = {"Lesson"}
+_LESSON_DEFAULTS: dict[str, object] = {
+    "TITLE": "",
+    "CATEGORY": "",
+    "SUBCATEGORY": "",
+    "LEVEL": "Básico",
+    "TAGS": [],
+    "BADGES": [],
+    "LESSON_BADGE": "",
+}
+
+
+@dataclass(frozen=True)
+class ManifestLesson:
+    module: str
+    class_name: str
+    title: str
+    category: str
+    subcategory: str
+    level: str
+    tags: list[str]
+    badges: list[str]
+    lesson_badge: str
+
+
+@dataclass
+class ManifestModule:
+    module: str
+    path: str
+    mtime_ns: int
+    size: int
+    sha1: str
+    lessons: list[ManifestLesson] = field(default_factory=list)
+    dynamic: bool = False
+    error: str | None = None
+
+
+class _DynamicLesson(Exception):
+    pass
+
+
+def iter_lesson_files(root: Path = LESSONS_ROOT, package: str = LESSONS_PACKAGE) -> list[tuple[str, Path]]:
+    found: list[tuple[str, Path]] = []
+    stack: list[tuple[str, Path]] = [(package, root)]
+    while stack:
+        current_package, current_dir = stack.pop()
+        init_file = current_dir / "__init__.py"
+        if init_file.is_file():
+            found.append((current_package, init_file))
+        try:
+            children = sorted(current_dir.iterdir())
+        except OSError as exc:
+            LOGGER.warning("No se pudo listar %s: %s", current_dir, exc)
+            continue
+        for child in children:
+            if child.name.startswith((".", "_")):
+                continue
+            if child.is_dir():
+                if (child / "__init__.py").is_file():
+                    stack.append((f"{current_package}.{child.name}", child))
+            elif child.suffix == ".py" and child.stem.isidentifier():
+                found.append((f"{current_package}.{child.stem}", child))
+    return found
+
+
+def _literal(node: ast.expr, name: str) -> object:
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError) as exc:
+        raise _DynamicLesson(name) from exc
+    if name in {"TAGS", "BADGES"}:
+        if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+            raise _DynamicLesson(name)
+        return list(value)
+    if not isinstance(value, str):
+        raise _DynamicLesson(name)
+    return value
+
+
+def _class_attrs(node: ast.ClassDef) -> dict[str, object]:
+    attrs: dict[str, object] = {}
+    for statement in node.body:
+        if isinstance(statement, ast.Assign):
+            targets = statement.targets
+            value = statement.value
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            targets = [statement.target]
+            value = statement.value
+        else:
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name) and target.id in _LESSON_DEFAULTS:
+                attrs[target.id] = _literal(value, target.id)
+    return attrs
+
+
+def _base_name(node: ast.expr) -> str | None:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def scan_lesson_source(module_name: str, source: str | bytes) -> tuple[list[ManifestLesson], bool]:
+    tree = ast.parse(source)
+    resolved: dict[str, dict[str, object]] = {}
+    lessons: list[ManifestLesson] = []
+    dynamic = False
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        try:
+            own_attrs = _class_attrs(node)
+        except _DynamicLesson:
+            dynamic = True
+            continue
+        inherited: dict[str, object] | None = None
+        for base in node.bases:
+            base_name = _base_name(base)
+            if base_name in resolved:
+                inherited = resolved[base_name]
+                break
+            if base_name in _LESSON_BASES:
+                inherited = _LESSON_DEFAULTS
+                break
+        if inherited is None:
+            if own_attrs:
+                dynamic = True
+            continue
+        attrs = {**inherited, **own_attrs}
+        resolved[node.name] = attrs
+        if not attrs["TITLE"]:
+            continue
+        lessons.append(
+            ManifestLesson(
+                module=module_name,
+                class_name=node.name,
+                title=str(attrs["TITLE"]),
+                category=str(attrs["CATEGORY"]),
+                subcategory=str(attrs["SUBCATEGORY"]),
+                level=str(attrs["LEVEL"]),
+                tags=list(attrs["TAGS"]),
+                badges=list(attrs["BADGES"]),
+                lesson_badge=str(attrs["LESSON_BADGE"]),
+            )
+        )
+    return lessons, dynamic
+
+
+def scan_lesson_file(module_name: str, path: Path) -> ManifestModule:
+    stat = path.stat()
+    payload = path.read_bytes()
+    record = ManifestModule(
+        module=module_name,
+        path=str(path),
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        sha1=hashlib.sha1(payload).hexdigest(),
+    )
+    try:
+        record.lessons, record.dynamic = scan_lesson_source(module_name, payload)
+    except (SyntaxError, ValueError) as exc:
+        record.error = f"{type(exc).__name__}: {exc}"
+    return record
+
+
+def _record_from_json(data: dict) -> ManifestModule:
+    lessons = [ManifestLesson(**lesson) for lesson in data.get("lessons", [])]
+    return ManifestModule(
+        module=data["module"],
+        path=data["path"],
+        mtime_ns=int(data["mtime_ns"]),
+        size=int(data["size"]),
+        sha1=data["sha1"],
+        lessons=lessons,
+        dynamic=bool(data.get("dynamic", False)),
+        error=data.get("error"),
+    )
+
+
+def _load_cached_records() -> dict[str, ManifestModule]:
+    data = disk_cache.read_json(MANIFEST_FILE)
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    records: dict[str, ManifestModule] = {}
+    try:
+        for raw in data.get("modules", []):
+            record = _record_from_json(raw)
+            records[record.path] = record
+    except (KeyError, TypeError, ValueError) as exc:
+        LOGGER.warning("Manifiesto de lecciones inválido, se regenera: %s", exc)
+        return {}
+    return records
+
+
+def _refresh_record(
+    module_name: str,
+    path: Path,
+    cached: ManifestModule | None,
+) -> tuple[ManifestModule, bool]:
+    if cached is None or cached.module != module_name:
+        return scan_lesson_file(module_name, path), True
+    stat = path.stat()
+    if stat.st_mtime_ns == cached.mtime_ns and stat.st_size == cached.size:
+        return cached, False
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()
+    if digest == cached.sha1:
+        cached.mtime_ns = stat.st_mtime_ns
+        cached.size = stat.st_size
+        return cached, True
+    return scan_lesson_file(module_name, path), True
+
+
+def load_manifest(
+    root: Path = LESSONS_ROOT,
+    package: str = LESSONS_PACKAGE,
+    use_cache: bool = True,
+) -> list[ManifestModule]:
+    cached_records = _load_cached_records() if use_cache else {}
+    records: list[ManifestModule] = []
+    changed = not cached_records
+    for module_name, path in iter_lesson_files(root, package):
+        try:
+            record, record_changed = _refresh_record(module_name, path, cached_records.get(str(path)))
+        except OSError as exc:
+            LOGGER.warning("No se pudo leer la lección %s: %s", path, exc)
+            continue
+        changed = changed or record_changed
+        records.append(record)
+    if len(records) != len(cached_records):
+        changed = True
+    if changed:
+        disk_cache.write_json(
+            MANIFEST_FILE,
+            {"version": MANIFEST_VERSION, "modules": [asdict(record) for record in records]},
+        )
+    return records
+
+
+def module_name_for_path(path: str | Path, root: Path = LESSONS_ROOT, package: str = LESSONS_PACKAGE) -> str | None:
+    try:
+        relative = Path(path).resolve().relative_to(root)
+    except ValueError:
+        return None
+    parts = list(relative.with_suffix("").parts)
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join([package, *parts])
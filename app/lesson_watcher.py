@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+from app.lesson_manifest import LESSONS_ROOT, iter_lesson_files, module_name_for_path
+
+LOGGER = logging.getLogger(__name__)
+_DEBOUNCE_MS = 250
+
+
+class LessonWatcher(QObject):
+    moduleChanged = Signal(str, str)
+
+    def __init__(self, parent: QObject | None = None, root: Path = LESSONS_ROOT) -> None:
+        super().__init__(parent)
+        self._root = root
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._pending: set[str] = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(_DEBOUNCE_MS)
+        self._timer.timeout.connect(self._flush)
+        self._known_files: set[str] = set()
+        self._watch_tree()
+
+    def _watch_tree(self) -> list[str]:
+        directories = {str(self._root)}
+        added: list[str] = []
+        for _module_name, path in iter_lesson_files(self._root):
+            directories.add(str(path.parent))
+            file_path = str(path)
+            if file_path not in self._known_files:
+                self._known_files.add(file_path)
+                added.append(file_path)
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        missing = [path for path in sorted(directories | self._known_files) if path not in watched]
+        if missing:
+            self._watcher.addPaths(missing)
+        return added
+
+    def _on_path_changed(self, path: str) -> None:
+        self._pending.add(path)
+        self._timer.start()
+
+    def _on_directory_changed(self, _path: str) -> None:
+        for added in self._watch_tree():
+            self._pending.add(added)
+        for known in list(self._known_files):
+            if not Path(known).exists():
+                self._known_files.discard(known)
+                self._pending.add(known)
+        if self._pending:
+            self._timer.start()
+
+    def _flush(self) -> None:
+        pending = sorted(self._pending)
+        self._pending.clear()
+        self._watch_tree()
+        for path in pending:
+            module_name = module_name_for_path(path, self._root)
+            if module_name is None:
+                continue
+            LOGGER.info("Lección modificada: %s", module_name)
+            self.moduleChanged.emit(module_name, path)
@@ -5,9 +5,11 @@ import logging
 import re
 import sys
 from dataclasses import dataclass
-from urllib.parse import quote
+from pathlib import Path
+from typing import Iterator
+from urllib.parse import quote, unquote
 
-from PySide6.QtCore import QEvent, QObject, QPoint, QRect, QSettings, Qt
+from PySide6.QtCore import QEvent, QObject, QPoint, QRect, QSettings, Qt, QTimer, QUrl
 from PySide6.QtGui import QGuiApplication, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QApplication,
@@ -19,6 +21,7 @@ from PySide6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QMainWindow,
+    QProgressBar,
     QPushButton,
     QScrollArea,
     QSizePolicy,
@@ -32,29 +35,105 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from app.lesson_base import Lesson
-from app.registry import discover_lessons, get_load_errors
+from app.cli import parse_args
+from app.lesson_base import Lesson, LessonContent, LessonInfo, lesson_content
+from app.lesson_cache import DEFAULT_CACHE_SIZE, LessonHandle, LessonInstanceCache
+from app.lesson_indexer import LessonIndexer
+from app.lesson_manifest import MANIFEST_FILE
+from app.lesson_watcher import LessonWatcher
+from app.registry import (
+    discover_lessons,
+    get_load_errors,
+    lesson_source_hash,
+    lesson_sources_fingerprint,
+    reload_lesson_module,
+)
+from app.ui.command_palette import CommandPalette
 from app.ui.glossary_view import GlossaryView
+from app.ui.lazy_tab import LazyTab
 from app.ui.library_reference_view import LibraryReferenceView
 from app.ui.method_reference_view import MethodReferenceView
-from app.utils.glossary import GLOSSARY, definition_text, register_auto_terms
+from app.ui.search_controller import SearchController
+from app.utils.content_index import (
+    GLOSSARY_KINDS,
+    GLOSSARY_SOURCE,
+    KIND_LESSON,
+    KIND_LIBRARY,
+    LIBRARY_SOURCE,
+    ContentHit,
+    ContentIndex,
+    ContentRecord,
+    glossary_records,
+    lesson_record_key,
+    library_record_key,
+    library_records,
+)
+from app.utils.facet_index import FacetIndex, parse_facet_query
+from app.utils.glossary import GLOSSARY, definition_text, register_auto_terms, unregister_auto_terms
+from app.utils import disk_cache, library_catalog, startup_profiler
+from app.utils.library_search import build_search_text, iter_library_items
 from app.utils.mention_indexer import (
-    build_mention_index,
+    CODE_MENTION_CACHE_FILE,
+    MENTION_CACHE_FILE,
+    ResolvedMentionIndex,
+    add_lesson_mentions,
+    content_sources,
     get_related_terms,
     get_lesson_terms,
+    get_term_lessons,
+    get_resolved_index,
     get_term_label,
     get_term_meta,
-    resolve_mention_index,
+    load_mention_index_cache,
+    mention_index_fingerprint,
+    remove_lesson_mentions,
+    save_code_mention_cache,
+)
+from app.utils.lesson_content_store import (
+    LESSON_CONTENT_CACHE_FILE,
+    LessonContentStore,
+    load_lesson_content_store,
+    save_lesson_content_store,
+)
+from app.utils.related_index import (
+    RELATED_CACHE_FILE,
+    RelatedIndex,
+    load_related_index,
+    save_related_index,
+    term_frequencies,
 )
 from app.utils.theme import apply_theme, toggle_theme
 from app.utils.tooltip_controller import InstantTooltipController
 from app.utils.tooltipify import tooltipify_html
 from app.utils.ui_helpers import badge
-from app.utils.validators import warn_if_short_example
+from app.utils.validators import is_dev_mode, warn_if_short_example
 
 logging.basicConfig(level=logging.INFO)
 LOGGER = logging.getLogger(__name__)
 
+LESSON_FACET_ALIASES = {
+    "cat": "category",
+    "categoria": "category",
+    "sub": "subcategory",
+    "subcategoria": "subcategory",
+    "level": "level",
+    "nivel": "level",
+    "tag": "tags",
+    "etiqueta": "tags",
+}
+LESSON_FACET_LABELS = {
+    "category": "cat",
+    "subcategory": "sub",
+    "level": "nivel",
+    "tags": "tag",
+}
+FACET_SUMMARY_LIMIT = 4
+RELATED_LESSON_LIMIT = 5
+RELATED_LIBRARY_LIMIT = 6
+RELATED_MIN_SCORE = 0.08
+TERM_LESSONS_LIMIT = 12
+RELATED_TERMS_LIMIT = 12
+
 
 @dataclass
 class LessonEntry:
@@ -64,9 +143,7 @@ class LessonEntry:
     info_level: str
     info_tags: list[str]
     info_badges: list[str]
-    lesson_cls: type[Lesson]
-    instance: Lesson
-    search_text: str
+    handle: LessonHandle
 
 
 class MainWindow(QMainWindow):
@@ -81,7 +158,14 @@ class MainWindow(QMainWindow):
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Buscar por título, tags o contenido...")
         self.search_input.setClearButtonEnabled(True)
-        self.search_input.textChanged.connect(self._apply_filter)
+        self.search_input.setToolTip("Filtros: cat:, sub:, nivel: y tag: (p. ej. cat:pandas nivel:avanzado groupby)")
+        self.search_controller = SearchController(
+            self.search_input, self._search_lessons, self._show_lesson_matches, "lecciones", parent=self
+        )
+        self.facet_summary = QLabel()
+        self.facet_summary.setObjectName("FacetSummary")
+        self.facet_summary.setWordWrap(True)
+        self.facet_summary.setVisible(False)
 
         self.load_errors_box = QGroupBox("Errores de carga")
         self.load_errors_label = QLabel()
@@ -90,6 +174,11 @@ class MainWindow(QMainWindow):
         load_errors_layout.addWidget(self.load_errors_label)
         self.load_errors_box.setVisible(False)
 
+        self.index_progress = QProgressBar()
+        self.index_progress.setFormat("Indexando lecciones… %v/%m")
+        self.index_progress.setTextVisible(True)
+        self.index_progress.setVisible(False)
+
         self.tree = QTreeWidget()
         self.tree.setHeaderHidden(True)
         self.tree.itemSelectionChanged.connect(self._on_tree_selection)
@@ -104,6 +193,7 @@ class MainWindow(QMainWindow):
         self._tooltip_controller = InstantTooltipController(self.guide_text)
         self.guide_text.installEventFilter(self._tooltip_controller)
         self._tooltip_controller.termPinned.connect(self._on_term_pinned)
+        self.guide_text.anchorClicked.connect(self._on_guide_anchor)
         self.guide_scroll = QScrollArea()
         self.guide_scroll.setWidgetResizable(True)
         self.guide_scroll.setWidget(self.guide_text)
@@ -131,22 +221,25 @@ class MainWindow(QMainWindow):
         self.exercises_scroll.setWidgetResizable(True)
         self.exercises_scroll.setWidget(self.exercises_container)
 
-        self.glossary_view = GlossaryView()
-        self.glossary_view.termSelected.connect(self._on_term_pinned)
-        self.method_reference_view = MethodReferenceView()
-        self.method_reference_view.termSelected.connect(self._on_term_pinned)
-        self.library_reference_view = LibraryReferenceView()
+        self.glossary_view: GlossaryView | None = None
+        self.method_reference_view: MethodReferenceView | None = None
+        self.library_reference_view: LibraryReferenceView | None = None
+        self.glossary_tab = LazyTab(self._create_glossary_view)
+        self.method_reference_tab = LazyTab(self._create_method_reference_view)
+        self.library_reference_tab = LazyTab(self._create_library_reference_view)
 
         self.tabs.addTab(self.guide_scroll, "Tutorial")
         self.tabs.addTab(pitfalls_panel, "Errores típicos")
         self.tabs.addTab(self.exercises_scroll, "Ejercicios")
-        self.tabs.addTab(self.method_reference_view, "Métodos y funciones")
-        self.tabs.addTab(self.glossary_view, "Glosario")
-        self.tabs.addTab(self.library_reference_view, "Librerías")
+        self.tabs.addTab(self.method_reference_tab, "Métodos y funciones")
+        self.tabs.addTab(self.glossary_tab, "Glosario")
+        self.tabs.addTab(self.library_reference_tab, "Librerías")
 
         left_panel = QWidget()
         left_layout = QVBoxLayout(left_panel)
         left_layout.addWidget(self.search_input)
+        left_layout.addWidget(self.facet_summary)
+        left_layout.addWidget(self.index_progress)
         left_layout.addWidget(self.load_errors_box)
         left_layout.addWidget(self.tree)
 
@@ -189,6 +282,7 @@ class MainWindow(QMainWindow):
         if hasattr(self.definition_body, "setOpenLinks"):
             self.definition_body.setOpenLinks(False)
         self.definition_body.setObjectName("DefinitionBody")
+        self.definition_body.anchorClicked.connect(self._on_definition_anchor)
         definition_buttons = QHBoxLayout()
         self.definition_copy = QPushButton("Copiar")
         self.definition_close = QPushButton("Cerrar")
@@ -225,12 +319,28 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(container)
 
         self.lesson_entries: list[LessonEntry] = []
+        self._lesson_cache = LessonInstanceCache(self._lesson_cache_size())
+        self._indexer: LessonIndexer | None = None
+        self._content_index = ContentIndex()
+        self._content_index.add_source(GLOSSARY_SOURCE, GLOSSARY_KINDS, self._glossary_records)
+        self._content_index.add_source(LIBRARY_SOURCE, (KIND_LIBRARY,), library_records)
+        self._facet_index = FacetIndex()
+        self._related_index = RelatedIndex()
+        self._content_store = LessonContentStore()
+        self._library_doc_ids: set[str] = set()
+        self._pending_reloads: dict[str, str] = {}
         self._load_lessons()
         if self.lesson_entries:
             self._select_first()
+        self._lesson_watcher: LessonWatcher | None = None
+        if is_dev_mode():
+            self._lesson_watcher = LessonWatcher(self)
+            self._lesson_watcher.moduleChanged.connect(self._reload_lesson_module)
 
+        self.command_palette = CommandPalette(self._content_index, self)
+        self.command_palette.recordActivated.connect(self._open_content_record)
         search_shortcut = QShortcut(QKeySequence("Ctrl+K"), self)
-        search_shortcut.activated.connect(self.search_input.setFocus)
+        search_shortcut.activated.connect(self.command_palette.open_palette)
         self._update_theme_toggle()
         self._pinned_term: str | None = None
         self._clear_definition_panel()
@@ -278,66 +388,416 @@ class MainWindow(QMainWindow):
             return event.pos()
         return None
 
+    def _lesson_cache_size(self) -> int:
+        try:
+            return int(self.settings.value("lessons/instance_cache_size", DEFAULT_CACHE_SIZE))
+        except (TypeError, ValueError):
+            return DEFAULT_CACHE_SIZE
+
     def _load_lessons(self) -> None:
+        if self._indexer is not None:
+            self._indexer.cancel()
         self.tree.clear()
         self.lesson_entries.clear()
-        for info in discover_lessons():
-            try:
-                instance = info.lesson_cls()
-            except Exception:
-                LOGGER.exception("No se pudo instanciar %s", info.title)
-                continue
-            search_text = self._build_search_text(instance, info)
-            entry = LessonEntry(
-                info_title=info.title,
-                info_category=info.category,
-                info_subcategory=info.subcategory,
-                info_level=info.level,
-                info_tags=info.tags,
-                info_badges=self._extract_lesson_badges(info.lesson_cls),
-                lesson_cls=info.lesson_cls,
-                instance=instance,
-                search_text=search_text,
-            )
-            self.lesson_entries.append(entry)
+        self._lesson_cache.clear()
+        self._content_index.remove_kind(KIND_LESSON)
+        self._facet_index.clear()
+        with startup_profiler.phase("discover_lessons"):
+            infos = discover_lessons()
+        self.lesson_entries = [self._make_entry(LessonHandle(info)) for info in infos]
+        with startup_profiler.phase("load_related_index"):
+            self._load_related_index()
+        with startup_profiler.phase("load_lesson_content"):
+            self._load_lesson_content()
+        for entry in self.lesson_entries:
+            lesson_item = QTreeWidgetItem()
+            self._update_lesson_item(lesson_item, entry)
+            self._lesson_parent_item(entry.info_category, entry.info_subcategory).addChild(lesson_item)
+        self.tree.expandAll()
+        self._update_load_errors()
 
-        if self.lesson_entries:
-            build_mention_index([entry.instance for entry in self.lesson_entries])
-            resolved = resolve_mention_index(GLOSSARY)
+        fingerprint = mention_index_fingerprint(lesson_sources_fingerprint())
+        with startup_profiler.phase("load_mention_index_cache"):
+            resolved = load_mention_index_cache(fingerprint, GLOSSARY)
+        if resolved is not None:
+            self._apply_mention_index(resolved)
+
+        self._indexer = LessonIndexer(
+            [entry.handle for entry in self.lesson_entries],
+            self._content_store,
+            GLOSSARY,
+            None if resolved is not None else fingerprint,
+            self,
+        )
+        self._indexer.lessonsLoaded.connect(self._on_lessons_indexed)
+        self._indexer.lessonFailed.connect(self._on_lesson_index_failed)
+        self._indexer.progress.connect(self._on_index_progress)
+        self._indexer.contentReady.connect(self._on_index_content_ready)
+        self._indexer.mentionIndexReady.connect(self._on_mention_index_ready)
+        self._indexer.mentionIndexFailed.connect(self._on_mention_index_failed)
+        self._indexer.start()
+
+    def _apply_mention_index(self, resolved: ResolvedMentionIndex) -> None:
+        with startup_profiler.phase("register_auto_terms"):
             register_auto_terms(resolved.auto_terms)
-            self.glossary_view.load_terms(
-                GLOSSARY,
-                resolved.term_meta,
-                resolved.term_labels,
-                resolved.term_related,
-            )
-            self.method_reference_view.load_terms(
-                GLOSSARY,
-                resolved.term_meta,
-                resolved.term_labels,
-            )
+        self._content_index.invalidate(GLOSSARY_SOURCE)
+        self._load_reference_terms()
+
+    def _on_lessons_indexed(self, loaded: list[tuple[LessonHandle, LessonContent]]) -> None:
+        for handle, content in loaded:
+            if self._entry_for(handle.lesson_id) is None:
+                continue
+            fields = self._lesson_search_fields(handle.info, content)
+            with startup_profiler.phase("content_index.add"):
+                self._content_index.add(self._lesson_record(handle.info), fields)
+            self._update_related(handle, fields)
+        self.search_controller.invalidate()
+
+    def _on_lesson_index_failed(self, handle: LessonHandle) -> None:
+        entry = self._entry_for(handle.lesson_id)
+        self._content_index.remove(lesson_record_key(handle.lesson_id))
+        self._facet_index.remove(handle.lesson_id)
+        self._related_index.remove(handle.lesson_id)
+        self._content_store.remove(handle.lesson_id)
+        if entry is not None:
+            self.lesson_entries.remove(entry)
+            lesson_item = self._lesson_items().get(handle.lesson_id)
+            if lesson_item is not None:
+                self._detach_lesson_item(lesson_item)
+        self._update_load_errors()
 
-        categories: dict[str, QTreeWidgetItem] = {}
-        subcategories: dict[tuple[str, str], QTreeWidgetItem] = {}
+    def _on_index_progress(self, done: int, total: int) -> None:
+        self.index_progress.setMaximum(max(total, 1))
+        self.index_progress.setValue(done)
+        self.index_progress.setVisible(self._indexer is not None and self._indexer.is_running)
+
+    def _on_index_content_ready(self) -> None:
+        if self.search_input.text().strip():
+            self._apply_filter()
+        self._finish_indexing()
+
+    def _on_mention_index_ready(self, resolved: ResolvedMentionIndex) -> None:
+        self._apply_mention_index(resolved)
+        self._refresh_current_guide()
+        self._finish_indexing()
+
+    def _refresh_current_guide(self) -> None:
+        if not hasattr(self, "current_entry"):
+            return
+        lesson = self._lesson_cache.acquire(self.current_entry.handle)
+        if lesson is not None:
+            self._render_guide(lesson)
+
+    def _on_mention_index_failed(self, message: str) -> None:
+        LOGGER.error("Índice de menciones no disponible: %s", message)
+        self._finish_indexing()
+
+    def _finish_indexing(self) -> None:
+        if self._indexer is None or self._indexer.is_running:
+            return
+        self.index_progress.setVisible(False)
+        pending = self._pending_reloads
+        self._pending_reloads = {}
+        for module_name, path in pending.items():
+            self._reload_lesson_module(module_name, path)
+        if self._content_store.modified:
+            self._save_lesson_content()
+        if self._related_index.modified:
+            self._save_related_index()
+            self._refresh_current_guide()
+
+    def _load_related_index(self) -> None:
+        related = self._related_index
+        if not len(related):
+            load_related_index(related)
+        catalog_source = disk_cache.file_digest(library_catalog.__file__)
+        self._library_doc_ids = set()
+        for library_key, library, item in iter_library_items():
+            doc_id = library_record_key(library_key, item["name"])
+            self._library_doc_ids.add(doc_id)
+            if related.is_current(doc_id, catalog_source):
+                continue
+            fields = {
+                "title": item["name"],
+                "tags": f"{library.get('title', '')} {item.get('category', '')}",
+                "body": build_search_text(library_key, item),
+            }
+            related.set(doc_id, term_frequencies(fields), catalog_source)
+        lesson_ids = {entry.handle.lesson_id for entry in self.lesson_entries}
+        related.retain(lesson_ids | self._library_doc_ids)
+
+    def _save_related_index(self) -> None:
+        with startup_profiler.phase("save_related_index"):
+            save_related_index(self._related_index)
+
+    def _load_lesson_content(self) -> None:
+        if not len(self._content_store):
+            load_lesson_content_store(self._content_store)
+        self._content_store.retain({entry.handle.lesson_id for entry in self.lesson_entries})
+
+    def _save_lesson_content(self) -> None:
+        with startup_profiler.phase("save_lesson_content"):
+            save_lesson_content_store(self._content_store)
+
+    def _update_related(self, handle: LessonHandle, fields: dict[str, str]) -> None:
+        source = lesson_source_hash(handle.info.module)
+        if not self._related_index.is_current(handle.lesson_id, source):
+            self._related_index.set(handle.lesson_id, term_frequencies(fields), source)
+
+    def _glossary_records(self) -> Iterator[tuple[ContentRecord, dict[str, str]]]:
+        resolved = get_resolved_index()
+        term_meta = resolved.term_meta if resolved is not None else {}
+        term_labels = resolved.term_labels if resolved is not None else {}
+        return glossary_records(GLOSSARY, term_meta, term_labels)
+
+    def _lesson_record(self, info: LessonInfo) -> ContentRecord:
+        return ContentRecord(
+            key=lesson_record_key(info.lesson_id),
+            kind=KIND_LESSON,
+            title=info.title,
+            subtitle=f"{info.category} · {info.subcategory}",
+            target=(info.lesson_id,),
+            aliases=tuple(info.tags),
+        )
+
+    def _open_content_record(self, record: ContentRecord) -> None:
+        if record.kind == KIND_LESSON:
+            self._select_lesson(record.target[0])
+        elif record.kind == KIND_LIBRARY:
+            self._open_library_item(*record.target)
+        else:
+            self._on_term_pinned(record.target[0])
+
+    def _open_library_item(self, library_key: str, name: str) -> None:
+        self.tabs.setCurrentWidget(self.library_reference_tab)
+        self.library_reference_tab.ensure_built().show_item(library_key, name)
+
+    def _on_definition_anchor(self, url: QUrl) -> None:
+        anchor = url.toString()
+        if anchor.startswith("tip:"):
+            self._on_term_pinned(unquote(anchor.removeprefix("tip:")))
+        else:
+            self._on_guide_anchor(url)
+
+    def _on_guide_anchor(self, url: QUrl) -> None:
+        anchor = url.toString()
+        if anchor.startswith("lesson:"):
+            self._select_lesson(unquote(anchor.removeprefix("lesson:")))
+        elif anchor.startswith("library:"):
+            library_key, _sep, name = anchor.removeprefix("library:").partition("/")
+            self._open_library_item(unquote(library_key), unquote(name))
+
+    def _select_lesson(self, lesson_id: str) -> None:
+        lesson_item = self._lesson_items().get(lesson_id)
+        if lesson_item is None:
+            return
+        if lesson_item.isHidden():
+            self.search_input.clear()
+            self._apply_filter()
+        self.tree.setCurrentItem(lesson_item)
+        self.tree.scrollToItem(lesson_item)
+        self.tabs.setCurrentWidget(self.guide_scroll)
+
+    def _entry_for(self, lesson_id: str) -> LessonEntry | None:
         for entry in self.lesson_entries:
-            category_item = categories.get(entry.info_category)
-            if category_item is None:
-                category_item = QTreeWidgetItem([entry.info_category])
-                categories[entry.info_category] = category_item
-                self.tree.addTopLevelItem(category_item)
-            sub_key = (entry.info_category, entry.info_subcategory)
-            sub_item = subcategories.get(sub_key)
-            if sub_item is None:
-                sub_item = QTreeWidgetItem([entry.info_subcategory])
-                subcategories[sub_key] = sub_item
-                category_item.addChild(sub_item)
-            badge_prefix = self._badge_prefix(entry.info_badges)
-            lesson_item = QTreeWidgetItem([f"{badge_prefix}{entry.info_title}"])
-            lesson_item.setData(0, Qt.UserRole, entry)
-            sub_item.addChild(lesson_item)
+            if entry.handle.lesson_id == lesson_id:
+                return entry
+        return None
 
-        self.tree.expandAll()
+    def _create_glossary_view(self) -> GlossaryView:
+        self.glossary_view = GlossaryView(self._content_index)
+        self.glossary_view.termSelected.connect(self._on_term_pinned)
+        self._load_reference_terms()
+        return self.glossary_view
+
+    def _create_method_reference_view(self) -> MethodReferenceView:
+        self.method_reference_view = MethodReferenceView(self._content_index)
+        self.method_reference_view.termSelected.connect(self._on_term_pinned)
+        self._load_reference_terms()
+        return self.method_reference_view
+
+    def _create_library_reference_view(self) -> LibraryReferenceView:
+        with startup_profiler.phase("LibraryReferenceView"):
+            self.library_reference_view = LibraryReferenceView(self._content_index)
+        return self.library_reference_view
+
+    def _load_reference_terms(self) -> None:
+        resolved = get_resolved_index()
+        term_meta = resolved.term_meta if resolved is not None else {}
+        term_labels = resolved.term_labels if resolved is not None else {}
+        term_related = resolved.related_map(RELATED_TERMS_LIMIT) if resolved is not None else {}
+        if self.glossary_view is not None:
+            with startup_profiler.phase("GlossaryView.load_terms"):
+                self.glossary_view.load_terms(GLOSSARY, term_meta, term_labels, term_related)
+        if self.method_reference_view is not None:
+            with startup_profiler.phase("MethodReferenceView.load_terms"):
+                self.method_reference_view.load_terms(GLOSSARY, term_meta, term_labels)
+
+    def _lesson_parent_item(self, category: str, subcategory: str) -> QTreeWidgetItem:
+        category_item = None
+        for i in range(self.tree.topLevelItemCount()):
+            if self.tree.topLevelItem(i).text(0) == category:
+                category_item = self.tree.topLevelItem(i)
+                break
+        if category_item is None:
+            category_item = QTreeWidgetItem([category])
+            self.tree.addTopLevelItem(category_item)
+            category_item.setExpanded(True)
+        for j in range(category_item.childCount()):
+            if category_item.child(j).text(0) == subcategory:
+                return category_item.child(j)
+        sub_item = QTreeWidgetItem([subcategory])
+        category_item.addChild(sub_item)
+        sub_item.setExpanded(True)
+        return sub_item
+
+    def _update_lesson_item(self, lesson_item: QTreeWidgetItem, entry: LessonEntry) -> None:
+        badge_prefix = self._badge_prefix(entry.info_badges)
+        lesson_item.setText(0, f"{badge_prefix}{entry.info_title}")
+        lesson_item.setData(0, Qt.UserRole, entry)
+
+    def _make_entry(self, handle: LessonHandle, content: LessonContent | None = None) -> LessonEntry:
+        info = handle.info
+        fields = self._lesson_search_fields(info, content)
+        self._content_index.add(self._lesson_record(info), fields)
+        if content is not None:
+            self._update_related(handle, fields)
+        self._facet_index.add(handle.lesson_id, self._lesson_facets(info))
+        return LessonEntry(
+            info_title=info.title,
+            info_category=info.category,
+            info_subcategory=info.subcategory,
+            info_level=info.level,
+            info_tags=info.tags,
+            info_badges=self._extract_lesson_badges(info),
+            handle=handle,
+        )
+
+    def _lesson_items(self) -> dict[str, QTreeWidgetItem]:
+        items: dict[str, QTreeWidgetItem] = {}
+        for i in range(self.tree.topLevelItemCount()):
+            category_item = self.tree.topLevelItem(i)
+            for j in range(category_item.childCount()):
+                sub_item = category_item.child(j)
+                for k in range(sub_item.childCount()):
+                    lesson_item = sub_item.child(k)
+                    entry = lesson_item.data(0, Qt.UserRole)
+                    if isinstance(entry, LessonEntry):
+                        items[entry.handle.lesson_id] = lesson_item
+        return items
+
+    def _detach_lesson_item(self, lesson_item: QTreeWidgetItem) -> None:
+        sub_item = lesson_item.parent()
+        if sub_item is None:
+            return
+        sub_item.removeChild(lesson_item)
+        if sub_item.childCount() == 0:
+            category_item = sub_item.parent()
+            if category_item is not None:
+                category_item.removeChild(sub_item)
+                if category_item.childCount() == 0:
+                    self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(category_item))
+
+    def _reload_lesson_module(self, module_name: str, path: str) -> None:
+        if self._indexer is not None and self._indexer.is_running:
+            self._pending_reloads[module_name] = path
+            return
+        old_entries = [entry for entry in self.lesson_entries if entry.handle.info.module == module_name]
+        current = getattr(self, "current_entry", None)
+        current_id = current.handle.lesson_id if current in old_entries else None
+        removed_terms: set[str] = set()
+        added_terms: dict[str, dict[str, object]] = {}
+        for entry in old_entries:
+            self._lesson_cache.discard(entry.handle)
+            delta = remove_lesson_mentions(entry.handle.lesson_id)
+            removed_terms |= delta.removed_terms
+
+        new_entries: dict[str, LessonEntry] = {}
+        for info in reload_lesson_module(module_name, Path(path)):
+            handle = LessonHandle(info)
+            lesson = handle.create()
+            if lesson is None:
+                continue
+            try:
+                content = lesson_content(lesson)
+                self._content_store.set(handle.lesson_id, content, lesson_source_hash(info.module))
+                new_entries[handle.lesson_id] = self._make_entry(handle, content)
+                delta = add_lesson_mentions(content_sources(info, content))
+            except Exception:
+                LOGGER.exception("No se pudo indexar la lección %s", info.title)
+                new_entries.pop(handle.lesson_id, None)
+                self._content_index.remove(lesson_record_key(handle.lesson_id))
+                self._facet_index.remove(handle.lesson_id)
+                self._related_index.remove(handle.lesson_id)
+                self._content_store.remove(handle.lesson_id)
+                lesson.deleteLater()
+                continue
+            for term_id in delta.removed_terms:
+                added_terms.pop(term_id, None)
+            removed_terms |= delta.removed_terms
+            removed_terms -= set(delta.added_terms)
+            added_terms.update(delta.added_terms)
+            lesson.deleteLater()
+
+        items = self._lesson_items()
+        for entry in old_entries:
+            lesson_id = entry.handle.lesson_id
+            lesson_item = items.get(lesson_id)
+            replacement = new_entries.get(lesson_id)
+            if replacement is None:
+                self.lesson_entries.remove(entry)
+                self._content_index.remove(lesson_record_key(lesson_id))
+                self._facet_index.remove(lesson_id)
+                self._related_index.remove(lesson_id)
+                self._content_store.remove(lesson_id)
+                if lesson_item is not None:
+                    self._detach_lesson_item(lesson_item)
+                continue
+            self.lesson_entries[self.lesson_entries.index(entry)] = replacement
+            if lesson_item is None:
+                continue
+            self._update_lesson_item(lesson_item, replacement)
+            if (entry.info_category, entry.info_subcategory) != (
+                replacement.info_category,
+                replacement.info_subcategory,
+            ):
+                self._detach_lesson_item(lesson_item)
+                self._lesson_parent_item(replacement.info_category, replacement.info_subcategory).addChild(
+                    lesson_item
+                )
+        known_ids = {entry.handle.lesson_id for entry in old_entries}
+        for lesson_id, entry in new_entries.items():
+            if lesson_id in known_ids:
+                continue
+            self.lesson_entries.append(entry)
+            lesson_item = QTreeWidgetItem()
+            self._update_lesson_item(lesson_item, entry)
+            self._lesson_parent_item(entry.info_category, entry.info_subcategory).addChild(lesson_item)
+
+        unregister_auto_terms(removed_terms)
+        register_auto_terms(added_terms)
+        if removed_terms or added_terms:
+            self._content_index.invalidate(GLOSSARY_SOURCE)
+            self._load_reference_terms()
+        if self._related_index.modified:
+            self._save_related_index()
+        if self._content_store.modified:
+            self._save_lesson_content()
+        save_code_mention_cache()
+        self._apply_filter()
         self._update_load_errors()
+        LOGGER.info("Lección recargada: %s (%d lecciones)", module_name, len(new_entries))
+
+        if current_id is None:
+            return
+        replacement = new_entries.get(current_id)
+        if replacement is None:
+            return
+        lesson_item = self._lesson_items().get(current_id)
+        if lesson_item is not None and lesson_item is not self.tree.currentItem():
+            self.tree.setCurrentItem(lesson_item)
+        else:
+            self._render_lesson(replacement)
 
     def _update_load_errors(self) -> None:
         errors = get_load_errors()
@@ -349,11 +809,10 @@ class MainWindow(QMainWindow):
         self.load_errors_label.setText(details)
         self.load_errors_box.setVisible(True)
 
-    def _extract_lesson_badges(self, lesson_cls: type[Lesson]) -> list[str]:
-        badges = list(getattr(lesson_cls, "BADGES", []) or [])
-        lesson_badge = str(getattr(lesson_cls, "LESSON_BADGE", "") or "")
+    def _extract_lesson_badges(self, info: LessonInfo) -> list[str]:
+        badges = list(info.badges)
         for icon in ("⭐", "🧠"):
-            if icon in lesson_badge and icon not in badges:
+            if icon in info.lesson_badge and icon not in badges:
                 badges.append(icon)
         return badges
 
@@ -375,47 +834,111 @@ class MainWindow(QMainWindow):
             if first_leaf.childCount() > 0:
                 self.tree.setCurrentItem(first_leaf.child(0))
 
-    def _build_search_text(self, lesson: Lesson, info) -> str:
-        parts = [
-            info.title,
-            info.category,
-            info.subcategory,
-            info.level,
-            " ".join(info.tags),
-            lesson.summary(),
-            lesson.tutorial(),
-        ]
-        guide_sections = lesson.guide_sections()
-        if guide_sections:
-            for section in guide_sections:
-                parts.append(section.get("title", ""))
-                parts.append(section.get("content", ""))
-        parts.extend([title + " " + detail for title, detail in lesson.common_pitfalls()])
-        parts.extend([title + " " + code for title, code in lesson.code_examples()])
-        for exercise in lesson.exercises():
-            parts.append(exercise.get("question", ""))
-            parts.append(" ".join(exercise.get("hints", [])))
-            parts.append(exercise.get("solution", ""))
-        return "\n".join(parts).lower()
+    def _lesson_search_fields(self, info: LessonInfo, content: LessonContent | None = None) -> dict[str, str]:
+        fields = {
+            "title": info.title,
+            "tags": " ".join([info.category, info.subcategory, info.level, *info.tags]),
+        }
+        if content is None:
+            return fields
+        body = [content.tutorial]
+        for section in content.sections:
+            body.append(section.title)
+            body.append(section.content)
+        body.extend([title + " " + detail for title, detail in content.pitfalls])
+        code: list[str] = []
+        for title, snippet in content.examples:
+            body.append(title)
+            code.append(snippet)
+        for exercise in content.exercises:
+            body.append(exercise.question)
+            body.append(" ".join(exercise.hints))
+            code.append(exercise.solution)
+        fields["summary"] = content.summary
+        fields["body"] = "\n".join(body)
+        fields["code"] = "\n".join(code)
+        return fields
+
+    def _lesson_facets(self, info: LessonInfo) -> dict[str, str | list[str]]:
+        return {
+            "category": info.category,
+            "subcategory": info.subcategory,
+            "level": info.level,
+            "tags": info.tags,
+        }
 
     def _apply_filter(self) -> None:
-        query = self.search_input.text().strip().lower()
+        self.search_controller.refresh()
+
+    def _search_lessons(self, query: str, candidates: list[str] | None) -> list[str]:
+        parsed = parse_facet_query(query, LESSON_FACET_ALIASES)
+        allowed = None
+        if parsed.filters:
+            allowed = set(self._facet_index.ids(self._facet_index.mask(parsed.filters)))
+        elif candidates is not None:
+            allowed = set(candidates)
+        if not parsed.text.strip():
+            return [
+                entry.handle.lesson_id
+                for entry in self.lesson_entries
+                if allowed is None or entry.handle.lesson_id in allowed
+            ]
+        scope = None if allowed is None else {lesson_record_key(lesson_id) for lesson_id in allowed}
+        hits = self._content_index.search(parsed.text, kind=KIND_LESSON, candidates=scope, limit=None)
+        if hits and not hits[0].fuzzy:
+            return self._rank_lessons(parsed.text, hits)
+        if candidates is not None and not parsed.filters:
+            return self._search_lessons(query, None)
+        return [hit.record.target[0] for hit in hits]
+
+    def _rank_lessons(self, text: str, hits: list[ContentHit]) -> list[str]:
+        top_score = hits[0].score
+        scores = {hit.record.target[0]: hit.score / top_score for hit in hits}
+        similarity = self._related_index.similarity(text, scores)
+        return sorted(scores, key=lambda lesson_id: -(scores[lesson_id] + similarity.get(lesson_id, 0.0)))
+
+    def _show_lesson_matches(self, lesson_ids: list[str]) -> None:
+        self._update_facet_summary(lesson_ids)
+        best_id = lesson_ids[0] if lesson_ids and self.search_input.text().strip() else None
+        best_item = None
+        matches = set(lesson_ids)
         for i in range(self.tree.topLevelItemCount()):
             category_item = self.tree.topLevelItem(i)
-            category_visible = True
+            category_visible = False
             for j in range(category_item.childCount()):
                 sub_item = category_item.child(j)
                 sub_visible = False
                 for k in range(sub_item.childCount()):
                     lesson_item = sub_item.child(k)
                     entry = lesson_item.data(0, Qt.UserRole)
-                    if not query or query in entry.search_text:
-                        lesson_item.setHidden(False)
-                        sub_visible = True
-                    else:
-                        lesson_item.setHidden(True)
+                    visible = entry.handle.lesson_id in matches
+                    lesson_item.setHidden(not visible)
+                    if entry.handle.lesson_id == best_id:
+                        best_item = lesson_item
+                    sub_visible = sub_visible or visible
                 sub_item.setHidden(not sub_visible)
+                category_visible = category_visible or sub_visible
             category_item.setHidden(not category_visible)
+        if best_item is not None:
+            self.tree.scrollToItem(best_item)
+
+    def _update_facet_summary(self, lesson_ids: list[str]) -> None:
+        if not self.search_input.text().strip():
+            self.facet_summary.setVisible(False)
+            return
+        mask = self._facet_index.mask_of(lesson_ids)
+        lines = [f"{len(lesson_ids)} lecciones"]
+        best = self._entry_for(lesson_ids[0]) if lesson_ids else None
+        if best is not None:
+            lines[0] += f" · mejor resultado: {best.info_title}"
+        for field_name, prefix in LESSON_FACET_LABELS.items():
+            counts = self._facet_index.counts(field_name, mask)
+            top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:FACET_SUMMARY_LIMIT]
+            if top:
+                values = ", ".join(f"{self._facet_index.label(field_name, value)} ({count})" for value, count in top)
+                lines.append(f"{prefix}: {values}")
+        self.facet_summary.setText("\n".join(lines))
+        self.facet_summary.setVisible(True)
 
     def _on_tree_selection(self) -> None:
         items = self.tree.selectedItems()
@@ -434,8 +957,11 @@ class MainWindow(QMainWindow):
                 widget.deleteLater()
 
     def _render_lesson(self, entry: LessonEntry) -> None:
+        lesson = self._lesson_cache.acquire(entry.handle)
+        if lesson is None:
+            self._update_load_errors()
+            return
         self.current_entry = entry
-        lesson = entry.instance
 
         self._clear_badges()
         self.title_label.setText(entry.info_title)
@@ -444,11 +970,12 @@ class MainWindow(QMainWindow):
         self.badge_layout.addWidget(badge(entry.info_level, "#2f855a"))
         for tag in entry.info_tags:
             self.badge_layout.addWidget(badge(tag, "#805ad5"))
-        reqs = lesson.requirements()
+        reqs = lesson_content(lesson).requirements
         if reqs:
             self.badge_layout.addWidget(badge("Requiere: " + ", ".join(reqs), "#c05621"))
 
-        self._render_guide(lesson)
+        with startup_profiler.phase("_render_guide"):
+            self._render_guide(lesson)
         self._render_pitfalls(lesson)
         self._render_exercises(lesson)
         self._scroll_to_top()
@@ -683,17 +1210,18 @@ class MainWindow(QMainWindow):
         return "".join(chunks)
 
     def _render_guide(self, lesson: Lesson) -> None:
-        guide_sections = lesson.guide_sections()
-        if guide_sections:
+        content = lesson_content(lesson)
+        if content.sections:
             sections_html = "<h1>Tutorial paso a paso</h1>" + "".join(
-                f"<h2>{html.escape(section.get('title', ''))}</h2>"
-                f"{self._guide_html_from_text(section.get('content', ''))}"
-                for section in guide_sections
+                f"<h2>{html.escape(section.title)}</h2>"
+                f"{self._guide_html_from_text(section.content)}"
+                for section in content.sections
             )
         else:
-            sections_html = f"<h1>Tutorial paso a paso</h1>{self._guide_html_from_text(lesson.tutorial())}"
+            sections_html = f"<h1>Tutorial paso a paso</h1>{self._guide_html_from_text(content.tutorial)}"
 
         mentioned_html = self._mentioned_methods_html(lesson)
+        related_html = self._related_html(lesson)
         examples_html = self._examples_html(lesson)
 
         if self.current_theme == "dark":
@@ -747,7 +1275,7 @@ class MainWindow(QMainWindow):
             divider = "#e2e8f0"
             summary_bg = "#edf2ff"
 
-        summary_text = lesson.summary().strip()
+        summary_text = content.summary.strip()
         summary_html = ""
         if summary_text:
             summary_html = (
@@ -965,6 +1493,7 @@ class MainWindow(QMainWindow):
                 {summary_html}
                 {sections_html}
                 {mentioned_html}
+                {related_html}
                 {examples_html}
             </div>
         </body>
@@ -977,7 +1506,7 @@ class MainWindow(QMainWindow):
         self.guide_text.setMinimumHeight(content_height + 40)
 
     def _examples_html(self, lesson: Lesson) -> str:
-        examples = lesson.code_examples()
+        examples = lesson_content(lesson).examples
         if not examples:
             return ""
         example_blocks = []
@@ -1043,10 +1572,48 @@ class MainWindow(QMainWindow):
             + "</div></div>"
         )
 
+    def _related_html(self, lesson: Lesson) -> str:
+        lesson_id = f"{type(lesson).__module__}.{type(lesson).__qualname__}"
+        lesson_ids = {entry.handle.lesson_id for entry in self.lesson_entries}
+        groups: list[str] = []
+        lesson_links = []
+        for related_id, score in self._related_index.related(lesson_id, RELATED_LESSON_LIMIT, lesson_ids):
+            entry = self._entry_for(related_id)
+            if entry is None or score < RELATED_MIN_SCORE:
+                continue
+            lesson_links.append(
+                f'<a href="lesson:{quote(related_id)}" class="kw">{html.escape(entry.info_title)}</a>'
+            )
+        if lesson_links:
+            groups.append(" ".join(lesson_links))
+        library_links = []
+        for doc_id, score in self._related_index.related(lesson_id, RELATED_LIBRARY_LIMIT, self._library_doc_ids):
+            if score < RELATED_MIN_SCORE:
+                continue
+            _kind, library_key, name = doc_id.split(":", 2)
+            library_title = library_catalog.LIBRARIES[library_key]["title"]
+            library_links.append(
+                f'<a href="library:{quote(library_key, safe="")}/{quote(name, safe="")}" class="kw">'
+                f"{html.escape(name)} ({html.escape(library_title)})</a>"
+            )
+        if library_links:
+            groups.append(
+                "<span class=\"method-index-owner\">En las librerías:</span>" + " ".join(library_links)
+            )
+        if not groups:
+            return ""
+        return (
+            "<div class=\"method-index card\">"
+            "<div class=\"card-header\">Lecciones relacionadas</div>"
+            "<div class=\"card-body\">"
+            + "".join(f"<div class=\"method-index-group\">{group}</div>" for group in groups)
+            + "</div></div>"
+        )
+
     def _render_pitfalls(self, lesson: Lesson) -> None:
         self.pitfalls_list.clear()
         self.pitfall_detail.clear()
-        for title, detail in lesson.common_pitfalls():
+        for title, detail in lesson_content(lesson).pitfalls:
             item = QListWidgetItem(title)
             item.setData(Qt.UserRole, detail)
             self.pitfalls_list.addItem(item)
@@ -1068,28 +1635,28 @@ class MainWindow(QMainWindow):
 
     def _render_exercises(self, lesson: Lesson) -> None:
         self._clear_layout(self.exercises_layout)
-        for idx, exercise in enumerate(lesson.exercises(), start=1):
+        for idx, exercise in enumerate(lesson_content(lesson).exercises, start=1):
             box = QGroupBox(f"Ejercicio {idx}")
             box.setCheckable(True)
             box.setChecked(True)
             layout = QVBoxLayout(box)
             content = QWidget()
             content_layout = QVBoxLayout(content)
-            question = QLabel(exercise.get("question", ""))
+            question = QLabel(exercise.question)
             question.setWordWrap(True)
             content_layout.addWidget(question)
 
             hints_btn = QPushButton("Ver pistas")
             hints_view = QTextEdit()
             hints_view.setReadOnly(True)
-            hints_view.setPlainText("\n".join(exercise.get("hints", [])))
+            hints_view.setPlainText("\n".join(exercise.hints))
             hints_view.setVisible(False)
             hints_btn.clicked.connect(lambda _, v=hints_view: v.setVisible(not v.isVisible()))
 
             solution_btn = QPushButton("Ver solución")
             solution_view = QTextEdit()
             solution_view.setReadOnly(True)
-            solution_view.setPlainText(exercise.get("solution", ""))
+            solution_view.setPlainText(exercise.solution)
             solution_view.setVisible(False)
             solution_btn.clicked.connect(lambda _, v=solution_view: v.setVisible(not v.isVisible()))
 
@@ -1121,7 +1688,9 @@ class MainWindow(QMainWindow):
         apply_theme(self.app, self.current_theme)
         self._update_theme_toggle()
         if hasattr(self, "current_entry"):
-            self._render_guide(self.current_entry.instance)
+            lesson = self._lesson_cache.acquire(self.current_entry.handle)
+            if lesson is not None:
+                self._render_guide(lesson)
         if self._pinned_term:
             data = GLOSSARY.get(self._pinned_term)
             if data:
@@ -1188,7 +1757,7 @@ class MainWindow(QMainWindow):
             definition_text_raw = str(data.get("definition", "")).strip()
             sections_html = self._render_definition_paragraphs(definition_text_raw)
 
-        related = get_related_terms(term_id)
+        related = get_related_terms(term_id, RELATED_TERMS_LIMIT)
         related_html = ""
         if related:
             links = " ".join(
@@ -1196,6 +1765,7 @@ class MainWindow(QMainWindow):
                 for related_id in related
             )
             related_html = f"<div class=\"related\"><strong>Relacionado con:</strong> {links}</div>"
+        usage_html = self._term_usage_html(term_id)
 
         return f"""
         <html>
@@ -1262,11 +1832,31 @@ class MainWindow(QMainWindow):
                 <div class="def-chip">{html.escape(term_id)}</div>
                 {sections_html}
                 {related_html}
+                {usage_html}
             </div>
         </body>
         </html>
         """
 
+    def _term_usage_html(self, term_id: str) -> str:
+        postings = get_term_lessons(term_id)
+        titles = {entry.handle.lesson_id: entry.info_title for entry in self.lesson_entries}
+        usages = sorted(
+            (posting for posting in postings if posting.lesson_id in titles),
+            key=lambda posting: (-posting.count, titles[posting.lesson_id].lower()),
+        )
+        if not usages:
+            return ""
+        links = " ".join(
+            f'<a href="lesson:{quote(posting.lesson_id)}">{html.escape(titles[posting.lesson_id])}</a>'
+            f" ×{posting.count}"
+            for posting in usages[:TERM_LESSONS_LIMIT]
+        )
+        remaining = len(usages) - TERM_LESSONS_LIMIT
+        if remaining > 0:
+            links += f' <span class="def-muted">y {remaining} más</span>'
+        return f"<div class=\"related\"><strong>¿Dónde se usa?</strong> {links}</div>"
+
     def _render_definition_paragraphs(self, text: str) -> str:
         if not text:
             return "<p class=\"def-muted\">Sin contenido disponible.</p>"
@@ -1361,8 +1951,26 @@ class MainWindow(QMainWindow):
         return bool(re.search(r"\b(def|class|print|for|if|while|return)\b|[=():]", text))
 
 
+def _invalidate_caches() -> None:
+    for name in (
+        MANIFEST_FILE,
+        MENTION_CACHE_FILE,
+        CODE_MENTION_CACHE_FILE,
+        RELATED_CACHE_FILE,
+        LESSON_CONTENT_CACHE_FILE,
+    ):
+        disk_cache.remove(name)
+    GLOSSARY.rebuild()
+
+
 def main() -> None:
-    app = QApplication(sys.argv)
+    args, qt_argv = parse_args(sys.argv)
+    if args.profile_startup:
+        startup_profiler.start_profiling(args.profile_startup)
+    if args.rebuild_index:
+        _invalidate_caches()
+    with startup_profiler.phase("QApplication"):
+        app = QApplication(qt_argv)
     style_hints = app.styleHints()
     if hasattr(style_hints, "setToolTipWakeUpDelay"):
         style_hints.setToolTipWakeUpDelay(0)
@@ -1374,9 +1982,14 @@ def main() -> None:
     theme_name = settings.value("ui/theme", "light")
     if not isinstance(theme_name, str):
         theme_name = "light"
-    apply_theme(app, theme_name)
-    window = MainWindow(app, settings, theme_name)
-    window.show()
+    with startup_profiler.phase("apply_theme"):
+        apply_theme(app, theme_name)
+    with startup_profiler.phase("MainWindow"):
+        window = MainWindow(app, settings, theme_name)
+    with startup_profiler.phase("window.show"):
+        window.show()
+    if startup_profiler.get_profiler() is not None:
+        QTimer.singleShot(0, lambda: startup_profiler.mark("event_loop_ready"))
     sys.exit(app.exec())
 
 
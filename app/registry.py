@@ -1,36 +1,28 @@
 from __future__ import annotations
 
+import hashlib
 import importlib
 import logging
-import pkgutil
-from types import ModuleType
-from typing import Iterable
+import sys
+from pathlib import Path
 
 from app.lesson_base import Lesson, LessonInfo
+from app.lesson_manifest import ManifestModule, load_manifest, scan_lesson_file
+from app.utils import startup_profiler
 
 LOGGER = logging.getLogger(__name__)
-_LESSON_CLASSES: list[type[Lesson]] | None = None
+_LESSON_INFOS: list[LessonInfo] | None = None
 _LOAD_ERRORS: list[tuple[str, str]] | None = None
+_SOURCE_HASHES: dict[str, str] = {}
 
 
-def _iter_lesson_modules(package: ModuleType) -> Iterable[str]:
-    stack: list[ModuleType] = [package]
-    while stack:
-        current = stack.pop()
-        yield current.__name__
-        for module in pkgutil.iter_modules(current.__path__, current.__name__ + "."):
-            yield module.name
-            if module.ispkg:
-                try:
-                    stack.append(importlib.import_module(module.name))
-                except Exception as exc:
-                    LOGGER.exception("No se pudo importar el paquete %s", module.name)
-                    _record_error(module.name, exc)
-
-
-def _record_error(module_name: str, error: Exception) -> None:
-    if _LOAD_ERRORS is not None:
-        _LOAD_ERRORS.append((module_name, f"{type(error).__name__}: {error}"))
+def _record_error(module_name: str, error: Exception | str) -> None:
+    if _LOAD_ERRORS is None:
+        return
+    message = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+    entry = (module_name, message)
+    if entry not in _LOAD_ERRORS:
+        _LOAD_ERRORS.append(entry)
 
 
 def _is_valid_lesson(obj: type) -> bool:
@@ -41,36 +33,153 @@ def _is_valid_lesson(obj: type) -> bool:
     )
 
 
+def _info_from_class(lesson_cls: type[Lesson]) -> LessonInfo:
+    return LessonInfo(
+        module=lesson_cls.__module__,
+        class_name=lesson_cls.__qualname__,
+        title=lesson_cls.TITLE,
+        category=lesson_cls.CATEGORY,
+        subcategory=lesson_cls.SUBCATEGORY,
+        level=lesson_cls.LEVEL,
+        tags=list(lesson_cls.TAGS),
+        badges=list(getattr(lesson_cls, "BADGES", []) or []),
+        lesson_badge=str(getattr(lesson_cls, "LESSON_BADGE", "") or ""),
+    )
+
+
+def _import_module_infos(module_name: str) -> list[LessonInfo]:
+    try:
+        module = importlib.import_module(module_name)
+    except Exception as exc:
+        LOGGER.exception("No se pudo importar la lección %s", module_name)
+        _record_error(module_name, exc)
+        return []
+    return [
+        _info_from_class(obj)
+        for obj in module.__dict__.values()
+        if isinstance(obj, type) and _is_valid_lesson(obj) and obj.__module__ == module_name
+    ]
+
+
+def _infos_from_manifest(record: ManifestModule) -> list[LessonInfo]:
+    if record.error:
+        LOGGER.error("No se pudo analizar la lección %s: %s", record.module, record.error)
+        _record_error(record.module, record.error)
+        return []
+    if record.dynamic:
+        return _import_module_infos(record.module)
+    return [
+        LessonInfo(
+            module=lesson.module,
+            class_name=lesson.class_name,
+            title=lesson.title,
+            category=lesson.category,
+            subcategory=lesson.subcategory,
+            level=lesson.level,
+            tags=list(lesson.tags),
+            badges=list(lesson.badges),
+            lesson_badge=lesson.lesson_badge,
+        )
+        for lesson in record.lessons
+    ]
+
+
 def _discover_lessons() -> None:
-    global _LESSON_CLASSES, _LOAD_ERRORS
-    if _LESSON_CLASSES is not None and _LOAD_ERRORS is not None:
+    global _LESSON_INFOS, _LOAD_ERRORS
+    if _LESSON_INFOS is not None and _LOAD_ERRORS is not None:
         return
 
-    _LESSON_CLASSES = []
+    _LESSON_INFOS = []
     _LOAD_ERRORS = []
     try:
-        import app.lessons as lessons_pkg
+        with startup_profiler.phase("registry.load_manifest"):
+            records = load_manifest()
     except Exception as exc:  # pragma: no cover - startup guard
-        LOGGER.exception("No se pudo importar el paquete de lecciones")
+        LOGGER.exception("No se pudo construir el manifiesto de lecciones")
         _record_error("app.lessons", exc)
         return
 
-    for module_name in _iter_lesson_modules(lessons_pkg):
+    _SOURCE_HASHES.clear()
+    for record in records:
+        _SOURCE_HASHES[record.module] = record.sha1
+        with startup_profiler.phase(f"registry.module:{record.module}"):
+            _LESSON_INFOS.extend(_infos_from_manifest(record))
+
+
+def reload_lesson_module(module_name: str, path: Path) -> list[LessonInfo]:
+    _discover_lessons()
+    if _LOAD_ERRORS is not None:
+        _LOAD_ERRORS[:] = [entry for entry in _LOAD_ERRORS if entry[0] != module_name]
+    previous = [info for info in _LESSON_INFOS or [] if info.module == module_name]
+    for info in previous:
+        _LESSON_INFOS.remove(info)
+    _SOURCE_HASHES.pop(module_name, None)
+    if not path.is_file():
+        sys.modules.pop(module_name, None)
+        return []
+
+    importlib.invalidate_caches()
+    try:
+        record = scan_lesson_file(module_name, path)
+    except OSError as exc:
+        _record_error(module_name, exc)
+        return []
+    _SOURCE_HASHES[module_name] = record.sha1
+    module = sys.modules.get(module_name)
+    if module is not None and record.error is None:
         try:
-            module = importlib.import_module(module_name)
+            importlib.reload(module)
         except Exception as exc:
-            LOGGER.exception("No se pudo importar la lección %s", module_name)
+            LOGGER.exception("No se pudo recargar la lección %s", module_name)
             _record_error(module_name, exc)
-            continue
+            return []
+    infos = _infos_from_manifest(record)
+    _LESSON_INFOS.extend(infos)
+    return infos
 
-        for obj in module.__dict__.values():
-            if isinstance(obj, type) and _is_valid_lesson(obj):
-                _LESSON_CLASSES.append(obj)
+
+def load_lesson_class(info: LessonInfo) -> type[Lesson] | None:
+    try:
+        lesson_cls = info.lesson_cls
+    except Exception as exc:
+        LOGGER.exception("No se pudo importar la lección %s", info.module)
+        _record_error(info.module, exc)
+        return None
+    if not isinstance(lesson_cls, type) or not _is_valid_lesson(lesson_cls):
+        _record_error(info.module, f"{info.class_name} no es una lección válida")
+        return None
+    return lesson_cls
 
 
 def get_lessons() -> list[type[Lesson]]:
     _discover_lessons()
-    return list(_LESSON_CLASSES or [])
+    lessons: list[type[Lesson]] = []
+    for info in _LESSON_INFOS or []:
+        lesson_cls = load_lesson_class(info)
+        if lesson_cls is not None:
+            lessons.append(lesson_cls)
+    return lessons
+
+
+def lesson_sources_fingerprint() -> str:
+    _discover_lessons()
+    digest = hashlib.sha1()
+    for module_name, sha1 in sorted(_SOURCE_HASHES.items()):
+        digest.update(f"{module_name}={sha1}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def install_lessons(infos: list[LessonInfo], source_hashes: dict[str, str]) -> None:
+    global _LESSON_INFOS, _LOAD_ERRORS
+    _LESSON_INFOS = list(infos)
+    _LOAD_ERRORS = []
+    _SOURCE_HASHES.clear()
+    _SOURCE_HASHES.update(source_hashes)
+
+
+def lesson_source_hash(module_name: str) -> str:
+    _discover_lessons()
+    return _SOURCE_HASHES.get(module_name, "")
 
 
 def get_load_errors() -> list[tuple[str, str]]:
@@ -79,17 +188,8 @@ def get_load_errors() -> list[tuple[str, str]]:
 
 
 def discover_lessons() -> list[LessonInfo]:
-    lessons = [
-        LessonInfo(
-            lesson_cls=lesson_cls,
-            title=lesson_cls.TITLE,
-            category=lesson_cls.CATEGORY,
-            subcategory=lesson_cls.SUBCATEGORY,
-            level=lesson_cls.LEVEL,
-            tags=list(lesson_cls.TAGS),
-        )
-        for lesson_cls in get_lessons()
-    ]
+    _discover_lessons()
+    lessons = list(_LESSON_INFOS or [])
     category_order = [
         "Python",
         "Bases de datos",
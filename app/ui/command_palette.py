@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QEvent, QObject, QPoint, Qt, Signal
+from PySide6.QtWidgets import (
+    QDialog,
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from app.ui.search_controller import SearchController
+from app.utils.content_index import KIND_LABELS, ContentHit, ContentIndex, ContentRecord
+
+PALETTE_WIDTH = 560
+PALETTE_HEIGHT = 420
+_SUBTITLE_LIMIT = 90
+
+
+class CommandPalette(QDialog):
+    recordActivated = Signal(object)
+
+    def __init__(self, content_index: ContentIndex, parent: QWidget | None = None) -> None:
+        super().__init__(parent, Qt.Popup | Qt.FramelessWindowHint)
+        self.setObjectName("CommandPalette")
+        self._content_index = content_index
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar lecciones, glosario, métodos y librerías...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.installEventFilter(self)
+        self.search_input.returnPressed.connect(self._activate_current)
+
+        self.results = QListWidget()
+        self.results.itemActivated.connect(self._activate_item)
+
+        self.status_label = QLabel("")
+        self.status_label.setObjectName("PaletteStatus")
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.search_input)
+        layout.addWidget(self.results)
+        layout.addWidget(self.status_label)
+        self.resize(PALETTE_WIDTH, PALETTE_HEIGHT)
+
+        self.search_controller = SearchController(
+            self.search_input, self._search, self._show_hits, "paleta", delay_ms=60, parent=self
+        )
+
+    def open_palette(self) -> None:
+        parent = self.parentWidget()
+        if parent is not None:
+            origin = parent.mapToGlobal(QPoint(0, 0))
+            x = origin.x() + max(0, (parent.width() - self.width()) // 2)
+            y = origin.y() + max(0, parent.height() // 8)
+            self.move(x, y)
+        self.search_input.selectAll()
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        self.search_input.setFocus()
+        self.search_controller.refresh()
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if watched is self.search_input and event.type() == QEvent.KeyPress:
+            if event.key() in (Qt.Key_Down, Qt.Key_Up, Qt.Key_PageDown, Qt.Key_PageUp):
+                self.search_controller.flush()
+                self._move_selection(event.key())
+                return True
+        return super().eventFilter(watched, event)
+
+    def _search(self, query: str, _candidates: list | None) -> list[ContentHit]:
+        return self._content_index.search(query)
+
+    def _show_hits(self, hits: list[ContentHit]) -> None:
+        self.results.clear()
+        for hit in hits:
+            record = hit.record
+            subtitle = record.subtitle
+            if len(subtitle) > _SUBTITLE_LIMIT:
+                subtitle = subtitle[: _SUBTITLE_LIMIT - 1] + "…"
+            label = f"[{KIND_LABELS.get(record.kind, record.kind)}]  {record.title}"
+            if subtitle:
+                label = f"{label}  —  {subtitle}"
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, record)
+            item.setToolTip(record.subtitle)
+            self.results.addItem(item)
+        if hits:
+            self.results.setCurrentRow(0)
+        if not self.search_input.text().strip():
+            self.status_label.setText("Escribe para buscar. Enter abre el resultado, Esc cierra.")
+        elif not hits:
+            self.status_label.setText("Sin resultados.")
+        elif hits[0].fuzzy:
+            self.status_label.setText(f"{len(hits)} resultados aproximados")
+        else:
+            self.status_label.setText(f"{len(hits)} resultados")
+
+    def _move_selection(self, key: int) -> None:
+        count = self.results.count()
+        if count == 0:
+            return
+        step = {Qt.Key_Down: 1, Qt.Key_Up: -1, Qt.Key_PageDown: 10, Qt.Key_PageUp: -10}[key]
+        row = min(max(self.results.currentRow() + step, 0), count - 1)
+        self.results.setCurrentRow(row)
+
+    def _activate_current(self) -> None:
+        self.search_controller.flush()
+        item = self.results.currentItem()
+        if item is not None:
+            self._activate_item(item)
+
+    def _activate_item(self, item: QListWidgetItem) -> None:
+        record = item.data(Qt.UserRole)
+        if not isinstance(record, ContentRecord):
+            return
+        self.hide()
+        self.recordActivated.emit(record)
@@ -1,35 +1,120 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QGuiApplication
+from typing import Mapping
+
+from PySide6.QtCore import QEvent, QModelIndex, QObject, QSortFilterProxyModel, Qt, Signal
+from PySide6.QtGui import QGuiApplication, QStandardItem, QStandardItemModel
 from urllib.parse import quote, unquote
 from PySide6.QtWidgets import (
     QHBoxLayout,
     QLineEdit,
     QPushButton,
     QTextBrowser,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTreeView,
     QVBoxLayout,
     QWidget,
 )
 
+from app.ui.search_controller import SearchController
+from app.utils.content_index import GLOSSARY_KINDS, ContentIndex, term_record_key
 from app.utils.glossary import GLOSSARY, definition_text, glossary_tooltip
 
 
+class GlossaryModel(QStandardItemModel):
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._glossary: dict[str, dict[str, object]] = {}
+
+    def set_terms(
+        self,
+        glossary: dict[str, dict[str, object]],
+        groups: list[tuple[str, str | None, str, str]],
+    ) -> None:
+        self._glossary = glossary
+        roots: dict[str, QStandardItem] = {}
+        owners: dict[tuple[str, str], QStandardItem] = {}
+        for root_label, owner_label, term_id, label in groups:
+            parent = roots.get(root_label)
+            if parent is None:
+                parent = roots[root_label] = _item(root_label)
+            if owner_label:
+                owner_key = (root_label, owner_label)
+                owner = owners.get(owner_key)
+                if owner is None:
+                    owner = owners[owner_key] = _item(owner_label)
+                    parent.appendRow(owner)
+                parent = owner
+            parent.appendRow(_item(label, term_id))
+        self.clear()
+        for item in roots.values():
+            self.appendRow(item)
+
+    def term_id(self, index: QModelIndex) -> str | None:
+        if not index.isValid():
+            return None
+        return index.data(Qt.UserRole) or None
+
+    def ensure_tooltip(self, index: QModelIndex) -> None:
+        item = self.itemFromIndex(index)
+        if item is None or item.toolTip():
+            return
+        term_id = item.data(Qt.UserRole)
+        data = self._glossary.get(term_id) if term_id else None
+        if data:
+            item.setToolTip(glossary_tooltip(item.text(), data))
+
+
+def _item(label: str, term_id: str = "") -> QStandardItem:
+    item = QStandardItem(label)
+    item.setEditable(False)
+    item.setData(term_id, Qt.UserRole)
+    return item
+
+
+class GlossaryFilterModel(QSortFilterProxyModel):
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._accepted: set[str] | None = None
+        self.setRecursiveFilteringEnabled(True)
+
+    def set_accepted(self, accepted: set[str] | None) -> bool:
+        if accepted == self._accepted:
+            return False
+        self.beginResetModel()
+        self._accepted = accepted
+        self.endResetModel()
+        return True
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self._accepted is None:
+            return True
+        model = self.sourceModel()
+        return model.itemFromIndex(model.index(source_row, 0, source_parent)).data(Qt.UserRole) in self._accepted
+
+
 class GlossaryView(QWidget):
     termSelected = Signal(str)
 
-    def __init__(self) -> None:
+    def __init__(self, content_index: ContentIndex) -> None:
         super().__init__()
+        self._content_index = content_index
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Buscar por término o definición...")
         self.search_input.setClearButtonEnabled(True)
-        self.search_input.textChanged.connect(self._apply_filter)
+        self.search_controller = SearchController(
+            self.search_input, self._filter_terms, self._show_filtered_terms, "glosario", parent=self
+        )
+
+        self.model = GlossaryModel(self)
+        self.filter_model = GlossaryFilterModel(self)
+        self.filter_model.setSourceModel(self.model)
 
-        self.tree = QTreeWidget()
+        self.tree = QTreeView()
         self.tree.setHeaderHidden(True)
-        self.tree.itemSelectionChanged.connect(self._on_term_selected)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setModel(self.filter_model)
+        self.tree.viewport().installEventFilter(self)
+        self.tree.selectionModel().currentChanged.connect(self._on_term_selected)
 
         self.detail_view = QTextBrowser()
         self.detail_view.setOpenExternalLinks(False)
@@ -52,20 +137,19 @@ class GlossaryView(QWidget):
         layout.addWidget(self.search_input)
         layout.addLayout(content_layout)
 
-        self._glossary = dict(GLOSSARY)
-        self._term_meta: dict[str, dict[str, str | None]] = {}
-        self._term_labels: dict[str, str] = {}
-        self._term_related: dict[str, list[str]] = {}
-        self._terms: list[tuple[str, str]] = []
-        self._filtered_terms: list[tuple[str, str]] = []
-        self._populate_tree()
+        self._glossary = GLOSSARY
+        self._term_meta: Mapping[str, Mapping[str, str | None]] = {}
+        self._term_labels: Mapping[str, str] = {}
+        self._term_related: Mapping[str, list[str]] = {}
+        self._term_ids: list[str] = []
+        self._filtered_terms: list[str] = []
 
     def load_terms(
         self,
         glossary: dict[str, dict[str, object]],
-        term_meta: dict[str, dict[str, str | None]],
-        term_labels: dict[str, str],
-        term_related: dict[str, list[str]],
+        term_meta: Mapping[str, Mapping[str, str | None]],
+        term_labels: Mapping[str, str],
+        term_related: Mapping[str, list[str]],
     ) -> None:
         self._glossary = glossary
         self._term_meta = term_meta
@@ -74,92 +158,64 @@ class GlossaryView(QWidget):
         self._populate_tree()
 
     def _populate_tree(self) -> None:
-        self.tree.clear()
-        self._terms = sorted(
-            [(term_id, definition_text(self._glossary[term_id])) for term_id in self._glossary],
-            key=lambda item: item[0].lower(),
-        )
-        self._filtered_terms = list(self._terms)
-        self._build_tree(self._filtered_terms)
-
-    def _build_tree(self, items: list[tuple[str, str]]) -> None:
-        self.tree.clear()
-        roots: dict[str, QTreeWidgetItem] = {}
-        owners: dict[tuple[str, str], QTreeWidgetItem] = {}
-
-        def get_root(label: str) -> QTreeWidgetItem:
-            root = roots.get(label)
-            if root is None:
-                root = QTreeWidgetItem([label])
-                root.setData(0, Qt.UserRole, None)
-                roots[label] = root
-                self.tree.addTopLevelItem(root)
-            return root
-
-        for term_id, definition in items:
-            meta = self._term_meta.get(term_id)
+        self._term_ids = sorted(self._glossary, key=str.lower)
+        groups: list[tuple[str, str | None, str, str]] = []
+        for term_id in self._term_ids:
             label = self._term_labels.get(term_id, term_id)
-            if meta is None:
-                root_label = "Conceptos"
-                owner_label = None
-            else:
-                namespace = meta.get("namespace") or "manual"
-                kind = meta.get("kind") or "concept"
-                owner = meta.get("owner")
-                if namespace == "builtin":
-                    root_label = "Builtins"
-                elif namespace == "pandas":
-                    root_label = "Pandas"
-                elif namespace == "manual":
-                    root_label = "Conceptos"
-                else:
-                    root_label = namespace.title()
-                if kind in {"method", "attribute"} and owner:
-                    owner_label = owner
-                elif kind in {"builtin", "function"} and namespace == "builtin":
-                    owner_label = "Funciones"
-                else:
-                    owner_label = None
-
-            root_item = get_root(root_label)
-            parent = root_item
-            if owner_label:
-                owner_key = (root_label, owner_label)
-                owner_item = owners.get(owner_key)
-                if owner_item is None:
-                    owner_item = QTreeWidgetItem([owner_label])
-                    owner_item.setData(0, Qt.UserRole, None)
-                    root_item.addChild(owner_item)
-                    owners[owner_key] = owner_item
-                parent = owner_item
-
-            term_item = QTreeWidgetItem([label])
-            term_item.setData(0, Qt.UserRole, term_id)
-            term_item.setToolTip(0, glossary_tooltip(label, self._glossary[term_id]))
-            parent.addChild(term_item)
-
+            root_label, owner_label = self._group_for(term_id)
+            groups.append((root_label, owner_label, term_id, label))
+        self.model.set_terms(self._glossary, groups)
         self.tree.expandAll()
-        if self.tree.topLevelItemCount() == 0:
-            self.detail_view.setPlainText("No hay términos que coincidan.")
+        self.search_controller.refresh()
 
-    def _apply_filter(self) -> None:
-        query = self.search_input.text().strip().lower()
-        if not query:
-            self._filtered_terms = list(self._terms)
+    def _group_for(self, term_id: str) -> tuple[str, str | None]:
+        meta = self._term_meta.get(term_id)
+        if meta is None:
+            return "Conceptos", None
+        namespace = meta.get("namespace") or "manual"
+        kind = meta.get("kind") or "concept"
+        owner = meta.get("owner")
+        if namespace == "builtin":
+            root_label = "Builtins"
+        elif namespace == "pandas":
+            root_label = "Pandas"
+        elif namespace == "manual":
+            root_label = "Conceptos"
         else:
-            self._filtered_terms = [
-                (term, definition)
-                for term, definition in self._terms
-                if query in term.lower() or query in definition.lower()
-            ]
-        self._build_tree(self._filtered_terms)
-
-    def _on_term_selected(self) -> None:
-        item = self.tree.currentItem()
-        if item is None:
+            root_label = namespace.title()
+        if kind in {"method", "attribute"} and owner:
+            return root_label, owner
+        if kind in {"builtin", "function"} and namespace == "builtin":
+            return root_label, "Funciones"
+        return root_label, None
+
+    def _filter_terms(self, query: str, candidates: list[str] | None) -> list[str]:
+        if not query.strip():
+            return list(self._term_ids)
+        scope = None if candidates is None else {term_record_key(term_id) for term_id in candidates}
+        hits = self._content_index.search(query, kind=GLOSSARY_KINDS, candidates=scope, limit=None, ranked=False)
+        if candidates is not None and (not hits or hits[0].fuzzy):
+            return self._filter_terms(query, None)
+        return [hit.record.target[0] for hit in hits]
+
+    def _show_filtered_terms(self, term_ids: list[str]) -> None:
+        self._filtered_terms = term_ids
+        accepted = set(term_ids) if self.search_input.text().strip() else None
+        if self.filter_model.set_accepted(accepted):
+            self.tree.expandAll()
+        if not term_ids:
+            self.detail_view.setPlainText("No hay términos que coincidan.")
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.ToolTip and watched is self.tree.viewport():
+            self.model.ensure_tooltip(self.filter_model.mapToSource(self.tree.indexAt(event.pos())))
+        return super().eventFilter(watched, event)
+
+    def _on_term_selected(self, current: QModelIndex, _previous: QModelIndex | None = None) -> None:
+        if not current.isValid():
             self.detail_view.clear()
             return
-        term_id = item.data(0, Qt.UserRole)
+        term_id = self.model.term_id(current)
         if not term_id:
             return
         self._show_term(term_id)
@@ -193,10 +249,7 @@ class GlossaryView(QWidget):
             self.termSelected.emit(term_id)
 
     def _copy_definition(self) -> None:
-        item = self.tree.currentItem()
-        if item is None:
-            return
-        term_id = item.data(0, Qt.UserRole)
+        term_id = self.model.term_id(self.tree.currentIndex())
         if not term_id:
             return
         data = self._glossary.get(term_id)
@@ -1,53 +1,159 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPalette
 from PySide6.QtWidgets import (
+    QApplication,
     QCheckBox,
     QComboBox,
     QFrame,
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QListView,
     QListWidget,
     QListWidgetItem,
     QSizePolicy,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QVBoxLayout,
     QWidget,
 )
 
+from app.ui.search_controller import SearchController
+from app.utils.content_index import KIND_LIBRARY, ContentIndex, library_record_key
+from app.utils.facet_index import FacetIndex, parse_facet_query
 from app.utils.library_catalog import LIBRARIES
-from app.utils.library_search import build_search_text, iter_library_items
+from app.utils.library_search import COMMON_YES, LIBRARY_FACET_ALIASES, iter_library_items, library_facets
+from app.utils.theme import badge_colors
 from app.utils.validators import warn_if_short_example
 from app.utils.ui_components import CodeCard
 from app.utils.ui_helpers import badge
 
 
-class LibraryItemWidget(QWidget):
-    def __init__(self, name: str, category: str, is_common: bool) -> None:
-        super().__init__()
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(6, 2, 6, 2)
-        layout.setSpacing(8)
-
-        title = QLabel(name)
-        title.setObjectName("LibraryItemTitle")
-        layout.addWidget(title, 1)
-
-        if is_common:
-            common_badge = badge("COMÚN", accent=None, variant="common")
-            layout.addWidget(common_badge, alignment=Qt.AlignRight)
-
-        category_label = badge(category, accent=None, variant="category")
-        layout.addWidget(category_label, alignment=Qt.AlignRight)
+class LibraryItemModel(QAbstractListModel):
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._entries: list[dict] = []
+
+    def set_entries(self, entries: list[dict]) -> None:
+        self.beginResetModel()
+        self._entries = entries
+        self.endResetModel()
+
+    def entry(self, row: int) -> dict | None:
+        if 0 <= row < len(self._entries):
+            return self._entries[row]
+        return None
+
+    def row_of(self, name: str) -> int:
+        for row, entry in enumerate(self._entries):
+            if entry["item"].get("name") == name:
+                return row
+        return -1
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._entries)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> object:
+        entry = self.entry(index.row()) if index.isValid() else None
+        if entry is None:
+            return None
+        if role == Qt.DisplayRole:
+            return entry["item"]["name"]
+        if role == Qt.ToolTipRole:
+            return entry["item"].get("signature", "")
+        return None
+
+
+class LibraryItemDelegate(QStyledItemDelegate):
+    PADDING = 8
+    PILL_PADDING = 10
+    PILL_SPACING = 8
+    MIN_TITLE_WIDTH = 60
+
+    def _fonts(self, option: QStyleOptionViewItem) -> tuple[QFont, QFont]:
+        title_font = QFont(option.font)
+        title_font.setWeight(QFont.DemiBold)
+        pill_font = QFont(option.font)
+        pill_font.setWeight(QFont.Bold)
+        return title_font, pill_font
+
+    def _pills(self, item: dict) -> list[tuple[str, str]]:
+        pills = []
+        if item.get("common", False):
+            pills.append(("COMÚN", "common"))
+        if item.get("category"):
+            pills.append((item["category"], "category"))
+        return pills
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        title_font, pill_font = self._fonts(option)
+        title_metrics = QFontMetrics(title_font)
+        pill_metrics = QFontMetrics(pill_font)
+        height = max(title_metrics.height(), pill_metrics.height() + 4)
+        entry = index.model().entry(index.row())
+        width = 2 * self.PADDING
+        if entry is not None:
+            item = entry["item"]
+            width += min(title_metrics.horizontalAdvance(item.get("name", "")), 4 * self.MIN_TITLE_WIDTH)
+            for text, _variant in self._pills(item):
+                width += self.PILL_SPACING + pill_metrics.horizontalAdvance(text) + 2 * self.PILL_PADDING
+        return QSize(width, height + 2 * self.PADDING)
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        entry = index.model().entry(index.row())
+        if entry is None:
+            return
+        item = entry["item"]
+        style = option.widget.style() if option.widget is not None else QApplication.style()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, option, painter, option.widget)
+
+        title_font, pill_font = self._fonts(option)
+        pill_metrics = QFontMetrics(pill_font)
+        rect = option.rect.adjusted(self.PADDING, self.PADDING // 2, -self.PADDING, -(self.PADDING // 2))
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(pill_font)
+        right = rect.right()
+        pill_height = pill_metrics.height() + 4
+        min_right = rect.left() + min(self.MIN_TITLE_WIDTH, rect.width() // 2)
+        for text, variant in reversed(self._pills(item)):
+            width = pill_metrics.horizontalAdvance(text) + 2 * self.PILL_PADDING
+            if right - width < min_right:
+                break
+            pill_rect = QRect(right - width + 1, rect.center().y() - pill_height // 2, width, pill_height)
+            background, foreground = badge_colors(variant)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(background))
+            painter.drawRoundedRect(pill_rect, pill_height / 2, pill_height / 2)
+            painter.setPen(QColor(foreground))
+            painter.drawText(pill_rect, Qt.AlignCenter, text)
+            right = pill_rect.left() - self.PILL_SPACING
+
+        text_rect = QRect(rect.left(), rect.top(), max(0, right - rect.left()), rect.height())
+        painter.setFont(title_font)
+        painter.setPen(option.palette.color(QPalette.Text))
+        name = QFontMetrics(title_font).elidedText(item.get("name", ""), Qt.ElideRight, text_rect.width())
+        painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft, name)
+        painter.restore()
 
 
 class LibraryReferenceView(QWidget):
-    def __init__(self) -> None:
+    def __init__(self, content_index: ContentIndex) -> None:
         super().__init__()
+        self._content_index = content_index
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Buscar función/clase...")
         self.search_input.setClearButtonEnabled(True)
-        self.search_input.textChanged.connect(self._apply_filter)
+        self.search_input.setToolTip("Filtros: lib:, cat:, tipo: y común:sí (p. ej. lib:torch común:sí tensor)")
+        self.search_controller = SearchController(
+            self.search_input, self._filter_items, self._show_filtered_items, "librerías", parent=self
+        )
 
         self.library_filter = QComboBox()
         self.library_filter.currentIndexChanged.connect(self._apply_filter)
@@ -63,8 +169,14 @@ class LibraryReferenceView(QWidget):
         self.library_list = QListWidget()
         self.library_list.currentItemChanged.connect(self._on_library_selected)
 
-        self.items_list = QListWidget()
-        self.items_list.currentItemChanged.connect(self._on_item_selected)
+        self.items_model = LibraryItemModel(self)
+        self.items_list = QListView()
+        self.items_list.setObjectName("LibraryItemList")
+        self.items_list.setUniformItemSizes(True)
+        self.items_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.items_list.setModel(self.items_model)
+        self.items_list.setItemDelegate(LibraryItemDelegate(self.items_list))
+        self.items_list.selectionModel().currentChanged.connect(self._on_item_selected)
 
         self.detail_panel = QWidget()
         self.detail_panel.setObjectName("LibraryDetailPanel")
@@ -137,8 +249,11 @@ class LibraryReferenceView(QWidget):
         layout.addLayout(search_row)
         layout.addLayout(content_row)
 
-        self._all_items = []
+        self._all_items: dict[str, dict] = {}
         self._filtered_items = []
+        self._facet_index = FacetIndex()
+        self._matched_mask = 0
+        self._library_counts: dict[str, int] = {}
         self._populate_libraries()
         self._load_items()
         self._apply_filter()
@@ -171,36 +286,84 @@ class LibraryReferenceView(QWidget):
         return item
 
     def _load_items(self) -> None:
-        self._all_items = []
+        self._all_items = {}
+        self._facet_index.clear()
         for library_key, library, item in iter_library_items():
-            entry = {
-                "library_key": library_key,
-                "library": library,
-                "item": item,
-                "search_text": build_search_text(library_key, item).lower(),
-            }
-            self._all_items.append(entry)
+            doc_id = library_record_key(library_key, item["name"])
+            self._facet_index.add(doc_id, library_facets(library_key, item))
+            self._all_items[doc_id] = {"library_key": library_key, "library": library, "item": item}
+
+    def show_item(self, library_key: str, name: str) -> bool:
+        self.search_input.clear()
+        self.common_only.blockSignals(True)
+        self.common_only.setChecked(False)
+        self.common_only.blockSignals(False)
+        index = self.library_filter.findData(library_key)
+        if index >= 0:
+            self.library_filter.blockSignals(True)
+            self.library_filter.setCurrentIndex(index)
+            self.library_filter.blockSignals(False)
+        self._apply_filter()
+        row = self.items_model.row_of(name)
+        if row < 0:
+            return False
+        index = self.items_model.index(row, 0)
+        self.items_list.setCurrentIndex(index)
+        self.items_list.scrollTo(index)
+        return True
 
     def _apply_filter(self) -> None:
-        query = self.search_input.text().strip().lower()
+        self._sync_library_list(self.library_filter.currentData())
+        self.search_controller.refresh()
+
+    def _filter_items(self, query: str, candidates: list[dict] | None) -> list[dict]:
+        parsed = parse_facet_query(query, LIBRARY_FACET_ALIASES)
+        text = parsed.text.strip()
+        facets = self._facet_index
+        allowed = facets.mask(parsed.filters)
+        if self.common_only.isChecked():
+            allowed &= facets.value_mask("common", COMMON_YES)
+        scope = allowed
+        if candidates is not None and not parsed.filters:
+            scope &= self._matched_mask
+
+        if text:
+            hits = self._content_index.search(
+                parsed.text,
+                kind=KIND_LIBRARY,
+                candidates=set(facets.ids(scope)),
+                limit=None,
+                fallback=False,
+            )
+            scope &= facets.mask_of(hit.record.key for hit in hits)
+        doc_ids = facets.ids(scope)
+        if not doc_ids and text:
+            if candidates is not None and not parsed.filters:
+                return self._filter_items(query, None)
+            hits = self._content_index.fuzzy(text, kind=KIND_LIBRARY, candidates=set(facets.ids(allowed)))
+            doc_ids = [hit.record.key for hit in hits]
+
+        self._matched_mask = facets.mask_of(doc_ids)
+        self._library_counts = facets.counts("library", self._matched_mask)
+        self._library_counts["all"] = len(doc_ids)
         selected_library = self.library_filter.currentData()
-        common_only = self.common_only.isChecked()
-
-        self._sync_library_list(selected_library)
-
-        self._filtered_items = []
-        for entry in self._all_items:
-            if selected_library and selected_library != "all":
-                if entry["library_key"] != selected_library:
-                    continue
-            if common_only and not entry["item"].get("common", False):
-                continue
-            if query and query not in entry["search_text"]:
-                continue
-            self._filtered_items.append(entry)
-
+        if selected_library and selected_library != "all":
+            library_mask = facets.value_mask("library", selected_library)
+            doc_ids = [doc_id for doc_id in doc_ids if facets.contains(library_mask, doc_id)]
+        return [self._all_items[doc_id] for doc_id in doc_ids]
+
+    def _show_filtered_items(self, entries: list[dict]) -> None:
+        self._filtered_items = entries
+        self._update_library_counts()
         self._populate_items()
 
+    def _update_library_counts(self) -> None:
+        for row in range(self.library_list.count()):
+            item = self.library_list.item(row)
+            key = item.data(Qt.UserRole)
+            title = LIBRARIES[key]["title"] if key in LIBRARIES else "Todas"
+            item.setText(f"{title} ({self._library_counts.get(key, 0)})")
+
     def _sync_library_list(self, selected_library: str | None) -> None:
         if selected_library is None:
             return
@@ -214,22 +377,9 @@ class LibraryReferenceView(QWidget):
                 return
 
     def _populate_items(self) -> None:
-        self.items_list.clear()
-        for entry in self._filtered_items:
-            item_data = entry["item"]
-            list_item = QListWidgetItem()
-            list_item.setData(Qt.UserRole, entry)
-            widget = LibraryItemWidget(
-                item_data["name"],
-                item_data["category"],
-                item_data.get("common", False),
-            )
-            list_item.setSizeHint(widget.sizeHint())
-            self.items_list.addItem(list_item)
-            self.items_list.setItemWidget(list_item, widget)
-
-        if self.items_list.count() > 0:
-            self.items_list.setCurrentRow(0)
+        self.items_model.set_entries(self._filtered_items)
+        if self.items_model.rowCount() > 0:
+            self.items_list.setCurrentIndex(self.items_model.index(0, 0))
         else:
             self._clear_detail_panel()
 
@@ -243,15 +393,8 @@ class LibraryReferenceView(QWidget):
         else:
             self._apply_filter()
 
-    def _on_item_selected(
-        self,
-        current: QListWidgetItem | None,
-        _previous: QListWidgetItem | None = None,
-    ) -> None:
-        if current is None:
-            self._clear_detail_panel()
-            return
-        entry = current.data(Qt.UserRole)
+    def _on_item_selected(self, current: QModelIndex, _previous: QModelIndex | None = None) -> None:
+        entry = self.items_model.entry(current.row()) if current.isValid() else None
         if not entry:
             self._clear_detail_panel()
             return
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Mapping
+
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QLineEdit,
@@ -9,18 +11,23 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from app.ui.search_controller import SearchController
+from app.utils.content_index import KIND_METHOD, ContentIndex, term_record_key
 from app.utils.glossary import definition_text
 
 
 class MethodReferenceView(QWidget):
     termSelected = Signal(str)
 
-    def __init__(self) -> None:
+    def __init__(self, content_index: ContentIndex) -> None:
         super().__init__()
+        self._content_index = content_index
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Buscar método o función...")
         self.search_input.setClearButtonEnabled(True)
-        self.search_input.textChanged.connect(self._apply_filter)
+        self.search_controller = SearchController(
+            self.search_input, self._filter_terms, self._show_filtered_terms, "métodos", parent=self
+        )
 
         self.tree = QTreeWidget()
         self.tree.setHeaderHidden(True)
@@ -31,22 +38,23 @@ class MethodReferenceView(QWidget):
         layout.addWidget(self.tree)
 
         self._glossary: dict[str, dict[str, object]] = {}
-        self._term_meta: dict[str, dict[str, str | None]] = {}
-        self._term_labels: dict[str, str] = {}
+        self._term_meta: Mapping[str, Mapping[str, str | None]] = {}
+        self._term_labels: Mapping[str, str] = {}
         self._terms: list[dict[str, str]] = []
         self._filtered_terms: list[dict[str, str]] = []
+        self._terms_by_id: dict[str, dict[str, str]] = {}
 
     def load_terms(
         self,
         glossary: dict[str, dict[str, object]],
-        term_meta: dict[str, dict[str, str | None]],
-        term_labels: dict[str, str],
+        term_meta: Mapping[str, Mapping[str, str | None]],
+        term_labels: Mapping[str, str],
     ) -> None:
         self._glossary = glossary
         self._term_meta = term_meta
         self._term_labels = term_labels
         self._rebuild_terms()
-        self._apply_filter()
+        self.search_controller.refresh()
 
     def _rebuild_terms(self) -> None:
         self._terms = []
@@ -57,14 +65,8 @@ class MethodReferenceView(QWidget):
             owner = meta.get("owner") or ""
             namespace = meta.get("namespace") or ""
             group = self._resolve_group(owner, meta.get("kind"), namespace)
-            self._terms.append(
-                {
-                    "term_id": term_id,
-                    "label": label,
-                    "group": group,
-                    "search": f"{label} {owner} {namespace} {term_id}",
-                }
-            )
+            self._terms.append({"term_id": term_id, "label": label, "group": group})
+        self._terms_by_id = {term["term_id"]: term for term in self._terms}
 
     def _resolve_group(self, owner: str, kind: str | None, namespace: str) -> str:
         owner_lower = owner.lower()
@@ -78,16 +80,20 @@ class MethodReferenceView(QWidget):
             return "builtin"
         return "otros"
 
-    def _apply_filter(self) -> None:
-        query = self.search_input.text().strip().lower()
-        if not query:
-            self._filtered_terms = list(self._terms)
-        else:
-            self._filtered_terms = [
-                term
-                for term in self._terms
-                if query in term["search"].lower()
-            ]
+    def _filter_terms(
+        self, query: str, candidates: list[dict[str, str]] | None
+    ) -> list[dict[str, str]]:
+        if not query.strip():
+            return list(self._terms if candidates is None else candidates)
+        scope = None if candidates is None else {term_record_key(term["term_id"]) for term in candidates}
+        hits = self._content_index.search(query, kind=KIND_METHOD, candidates=scope, limit=None)
+        if candidates is not None and (not hits or hits[0].fuzzy):
+            return self._filter_terms(query, None)
+        terms = (self._terms_by_id.get(hit.record.target[0]) for hit in hits)
+        return [term for term in terms if term is not None]
+
+    def _show_filtered_terms(self, terms: list[dict[str, str]]) -> None:
+        self._filtered_terms = terms
         self._build_tree()
 
     def _build_tree(self) -> None:
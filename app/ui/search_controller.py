@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtWidgets import QLineEdit
+
+from app.utils.validators import is_dev_mode
+
+LOGGER = logging.getLogger(__name__)
+DEFAULT_DEBOUNCE_MS = 150
+
+SearchFunction = Callable[[str, list | None], list]
+RenderFunction = Callable[[list], None]
+
+
+class SearchController(QObject):
+    def __init__(
+        self,
+        line_edit: QLineEdit,
+        search: SearchFunction,
+        render: RenderFunction,
+        name: str,
+        delay_ms: int = DEFAULT_DEBOUNCE_MS,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._line_edit = line_edit
+        self._search = search
+        self._render = render
+        self._name = name
+        self._last_query: str | None = None
+        self._last_results: list = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(max(0, delay_ms))
+        self._timer.timeout.connect(self._run)
+        line_edit.textChanged.connect(self._schedule)
+
+    @property
+    def query(self) -> str:
+        return self._line_edit.text()
+
+    @property
+    def results(self) -> list:
+        return self._last_results
+
+    def is_pending(self) -> bool:
+        return self._timer.isActive()
+
+    def cancel(self) -> None:
+        self._timer.stop()
+
+    def invalidate(self) -> None:
+        self._last_query = None
+        self._last_results = []
+
+    def refresh(self) -> None:
+        self._timer.stop()
+        self.invalidate()
+        self._run()
+
+    def flush(self) -> None:
+        if self._timer.isActive():
+            self._timer.stop()
+            self._run()
+
+    def _schedule(self) -> None:
+        self._timer.start()
+
+    def _run(self) -> None:
+        query = self._line_edit.text()
+        normalized = query.lower()
+        candidates = None
+        previous = self._last_query
+        if previous and normalized.startswith(previous):
+            candidates = self._last_results
+        started = time.perf_counter()
+        results = self._search(query, candidates)
+        searched = time.perf_counter()
+        self._render(results)
+        finished = time.perf_counter()
+        self._last_query = normalized
+        self._last_results = results
+        if is_dev_mode():
+            LOGGER.info(
+                "Búsqueda %s %r: %d resultados (%s) en %.1f ms + %.1f ms de pintado",
+                self._name,
+                query,
+                len(results),
+                "acotada" if candidates is not None else "completa",
+                (searched - started) * 1000,
+                (finished - searched) * 1000,
+            )
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Collection, Iterable, Iterator, Mapping
+
+from app.utils import startup_profiler
+from app.utils.fuzzy_index import DEFAULT_LIMIT as FUZZY_LIMIT
+from app.utils.fuzzy_index import FuzzyIndex
+from app.utils.glossary import definition_text
+from app.utils.glossary_store import GlossaryStore
+from app.utils.library_catalog import LIBRARIES
+from app.utils.library_search import library_search_fields
+from app.utils.search_index import SearchIndex, fold
+
+KIND_LESSON = "lesson"
+KIND_TERM = "term"
+KIND_METHOD = "method"
+KIND_LIBRARY = "library"
+GLOSSARY_KINDS = (KIND_TERM, KIND_METHOD)
+
+GLOSSARY_SOURCE = "glossary"
+LIBRARY_SOURCE = "library"
+
+KIND_LABELS = {
+    KIND_LESSON: "Lección",
+    KIND_TERM: "Glosario",
+    KIND_METHOD: "Método",
+    KIND_LIBRARY: "Librería",
+}
+KIND_BOOST = {
+    KIND_LESSON: 1.5,
+    KIND_TERM: 1.0,
+    KIND_METHOD: 1.0,
+    KIND_LIBRARY: 0.9,
+}
+DEFAULT_LIMIT = 40
+_METHOD_KINDS = {"method", "builtin", "function", "attribute"}
+_UNKNOWN_NAMESPACE = "unknown"
+
+
+@dataclass(frozen=True)
+class ContentRecord:
+    key: str
+    kind: str
+    title: str
+    subtitle: str
+    target: tuple[str, ...]
+    aliases: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ContentHit:
+    record: ContentRecord
+    score: float
+    fuzzy: bool = False
+
+
+RecordSource = Callable[[], Iterable[tuple[ContentRecord, Mapping[str, str]]]]
+
+
+def lesson_record_key(lesson_id: str) -> str:
+    return f"{KIND_LESSON}:{lesson_id}"
+
+
+def term_record_key(term_id: str) -> str:
+    return f"{KIND_TERM}:{term_id}"
+
+
+def library_record_key(library_key: str, name: str) -> str:
+    return f"{KIND_LIBRARY}:{library_key}:{name}"
+
+
+def _kind_set(kind: str | Collection[str] | None) -> frozenset[str] | None:
+    if kind is None:
+        return None
+    if isinstance(kind, str):
+        return frozenset((kind,))
+    return frozenset(kind)
+
+
+def _names_match(record: ContentRecord, needle: str) -> bool:
+    if not needle:
+        return False
+    return any(needle in fold(name) for name in (record.title, *record.aliases))
+
+
+class ContentIndex:
+    def __init__(self) -> None:
+        self._records: dict[str, ContentRecord] = {}
+        self._search_index = SearchIndex()
+        self._fuzzy_index = FuzzyIndex()
+        self._kind_keys: dict[str, set[str]] = {}
+        self._sources: dict[str, tuple[frozenset[str], RecordSource]] = {}
+        self._pending: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._records
+
+    def add(self, record: ContentRecord, fields: Mapping[str, str]) -> None:
+        self.remove(record.key)
+        self._records[record.key] = record
+        self._kind_keys.setdefault(record.kind, set()).add(record.key)
+        self._search_index.add(record.key, fields)
+        self._fuzzy_index.add_many(record.key, [record.title, *record.aliases])
+
+    def add_all(self, records: Iterable[tuple[ContentRecord, Mapping[str, str]]]) -> None:
+        for record, fields in records:
+            self.add(record, fields)
+
+    def remove(self, key: str) -> None:
+        record = self._records.pop(key, None)
+        if record is None:
+            return
+        self._kind_keys[record.kind].discard(key)
+        self._search_index.remove(key)
+        self._fuzzy_index.remove(key)
+
+    def remove_kind(self, kind: str) -> None:
+        for key in list(self._kind_keys.get(kind, ())):
+            self.remove(key)
+
+    def add_source(self, name: str, kinds: Collection[str], loader: RecordSource) -> None:
+        self._sources[name] = (frozenset(kinds), loader)
+        self.invalidate(name)
+
+    def invalidate(self, name: str) -> None:
+        kinds, _loader = self._sources[name]
+        for kind in kinds:
+            self.remove_kind(kind)
+        self._pending.add(name)
+
+    def ensure(self, kind: str | Collection[str] | None = None) -> None:
+        kinds = _kind_set(kind)
+        for name, (source_kinds, loader) in self._sources.items():
+            if name not in self._pending or (kinds is not None and kinds.isdisjoint(source_kinds)):
+                continue
+            self._pending.discard(name)
+            with startup_profiler.phase(f"ContentIndex.{name}"):
+                self.add_all(loader())
+
+    def search(
+        self,
+        query: str,
+        kind: str | Collection[str] | None = None,
+        candidates: Collection[str] | None = None,
+        limit: int | None = DEFAULT_LIMIT,
+        fallback: bool = True,
+        ranked: bool = True,
+    ) -> list[ContentHit]:
+        if not query.strip():
+            return []
+        kinds = _kind_set(kind)
+        self.ensure(kinds)
+        hits = [
+            self._hit(hit.doc_id, hit.score)
+            for hit in self._search_index.search(query, candidates=self._scope(kinds, candidates), ranked=ranked)
+        ]
+        if not hits and fallback:
+            return self.fuzzy(query, kinds, candidates, FUZZY_LIMIT if limit is None else limit, ranked)
+        if not ranked:
+            return hits if limit is None else hits[:limit]
+        return self._ranked(hits, limit, fold(query.strip()))
+
+    def fuzzy(
+        self,
+        query: str,
+        kind: str | Collection[str] | None = None,
+        candidates: Collection[str] | None = None,
+        limit: int | None = FUZZY_LIMIT,
+        ranked: bool = True,
+    ) -> list[ContentHit]:
+        kinds = _kind_set(kind)
+        self.ensure(kinds)
+        hits = [
+            self._hit(hit.key, hit.score, fuzzy=True)
+            for hit in self._fuzzy_index.search(query, limit=None, candidates=self._scope(kinds, candidates))
+        ]
+        if not ranked:
+            return hits if limit is None else hits[:limit]
+        return self._ranked(hits, limit)
+
+    def _scope(self, kinds: frozenset[str] | None, candidates: Collection[str] | None) -> Collection[str] | None:
+        if kinds is None:
+            return candidates
+        if len(kinds) == 1:
+            scope = self._kind_keys.get(next(iter(kinds)), set())
+        else:
+            scope = set().union(*(self._kind_keys.get(kind, ()) for kind in kinds))
+        if candidates is None:
+            return scope
+        if len(candidates) < len(scope):
+            return {key for key in candidates if key in scope}
+        return {key for key in scope if key in candidates}
+
+    def _ranked(self, hits: list[ContentHit], limit: int | None, needle: str = "") -> list[ContentHit]:
+        hits.sort(key=lambda hit: (not _names_match(hit.record, needle), -hit.score, hit.record.title.lower()))
+        if limit is not None:
+            hits = hits[:limit]
+        return hits
+
+    def _hit(self, key: str, score: float, fuzzy: bool = False) -> ContentHit:
+        record = self._records[key]
+        return ContentHit(record, score * KIND_BOOST.get(record.kind, 1.0), fuzzy)
+
+
+def _glossary_items(glossary: Mapping[str, Mapping[str, object]]) -> Iterator[tuple[str, Mapping[str, object]]]:
+    if isinstance(glossary, GlossaryStore):
+        return glossary.records()
+    return iter(glossary.items())
+
+
+def glossary_records(
+    glossary: Mapping[str, Mapping[str, object]],
+    term_meta: Mapping[str, Mapping[str, str | None]],
+    term_labels: Mapping[str, str],
+) -> Iterator[tuple[ContentRecord, dict[str, str]]]:
+    for term_id, data in _glossary_items(glossary):
+        if not data:
+            continue
+        meta = term_meta.get(term_id) or {}
+        label = term_labels.get(term_id, term_id)
+        kind = KIND_METHOD if meta.get("kind") in _METHOD_KINDS else KIND_TERM
+        owner = meta.get("owner") or ""
+        namespace = meta.get("namespace") or ""
+        if namespace == _UNKNOWN_NAMESPACE:
+            namespace = ""
+        definition = definition_text(data)
+        summary = definition.splitlines()[0] if definition else ""
+        record = ContentRecord(
+            key=term_record_key(term_id),
+            kind=kind,
+            title=label,
+            subtitle=" · ".join(part for part in (namespace, owner) if part) or summary,
+            target=(term_id,),
+            aliases=(term_id,),
+        )
+        fields = {
+            "title": f"{label} {term_id}",
+            "tags": f"{owner} {namespace}",
+            "summary": definition,
+        }
+        yield record, fields
+
+
+def library_records() -> Iterator[tuple[ContentRecord, dict[str, str]]]:
+    for library_key, library in LIBRARIES.items():
+        for item in library.get("items", []):
+            name = item.get("name", "")
+            record = ContentRecord(
+                key=library_record_key(library_key, name),
+                kind=KIND_LIBRARY,
+                title=name,
+                subtitle=f"{library.get('title', library_key)} · {item.get('signature', '')}",
+                target=(library_key, name),
+                aliases=(item.get("signature", ""),),
+            )
+            yield record, library_search_fields(library_key, item)
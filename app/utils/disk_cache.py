@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+LOGGER = logging.getLogger(__name__)
+_APP_NAME = "Pythonpedia"
+
+
+def cache_dir() -> Path:
+    override = os.getenv("PYTHONPEDIA_CACHE_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    if sys.platform.startswith("win"):
+        base = os.getenv("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / _APP_NAME / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / _APP_NAME
+    base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / _APP_NAME.lower()
+
+
+def cache_path(name: str) -> Path:
+    return cache_dir() / name
+
+
+def read_json(name: str) -> object | None:
+    path = cache_path(name)
+    try:
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        LOGGER.warning("No se pudo leer la caché %s: %s", path, exc)
+        return None
+
+
+def write_json(name: str, data: object) -> bool:
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return write_bytes(name, payload)
+
+
+def read_pickle(name: str) -> object | None:
+    path = cache_path(name)
+    try:
+        with path.open("rb") as handle:
+            return pickle.load(handle)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        LOGGER.warning("No se pudo leer la caché %s: %s", path, exc)
+        return None
+
+
+def write_pickle(name: str, data: object) -> bool:
+    try:
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as exc:
+        LOGGER.warning("No se pudo serializar la caché %s: %s", name, exc)
+        return False
+    return write_bytes(name, payload)
+
+
+def file_digest(*paths: str | os.PathLike[str]) -> str:
+    digest = hashlib.sha1()
+    for path in paths:
+        try:
+            digest.update(Path(path).read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def write_bytes(name: str, payload: bytes) -> bool:
+    path = cache_path(name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as exc:
+        LOGGER.warning("No se pudo escribir la caché %s: %s", path, exc)
+        return False
+    return True
+
+
+def remove(name: str) -> None:
+    try:
+        cache_path(name).unlink(missing_ok=True)
+    except OSError as exc:
+        LOGGER.warning("No se pudo borrar la caché %s: %s", name, exc)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+from app.utils.search_index import fold, tokenize
+
+_FACET_RE = re.compile(r'(?<!\S)(\w+):("[^"]*"?|\S*)')
+
+
+def facet_value(text: str) -> str:
+    return "-".join(tokenize(text))
+
+
+@dataclass(frozen=True)
+class FacetQuery:
+    text: str
+    filters: tuple[tuple[str, str], ...]
+
+
+def parse_facet_query(query: str, aliases: Mapping[str, str]) -> FacetQuery:
+    filters: list[tuple[str, str]] = []
+
+    def consume(match: re.Match[str]) -> str:
+        field_name = aliases.get(fold(match.group(1)))
+        if field_name is None:
+            return match.group(0)
+        value = facet_value(match.group(2).strip('"'))
+        if value:
+            filters.append((field_name, value))
+        return ""
+
+    text = " ".join(_FACET_RE.sub(consume, query).split())
+    if text and query[-1:].isspace():
+        text += " "
+    return FacetQuery(text, tuple(filters))
+
+
+class FacetIndex:
+    def __init__(self) -> None:
+        self._ids: list[str | None] = []
+        self._free: list[int] = []
+        self._positions: dict[str, int] = {}
+        self._facets: dict[str, list[tuple[str, str]]] = {}
+        self._bits: dict[str, dict[str, int]] = {}
+        self._labels: dict[tuple[str, str], str] = {}
+        self._live = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def add(self, doc_id: str, facets: Mapping[str, str | Iterable[str]]) -> None:
+        self.remove(doc_id)
+        if self._free:
+            position = self._free.pop()
+            self._ids[position] = doc_id
+        else:
+            position = len(self._ids)
+            self._ids.append(doc_id)
+        bit = 1 << position
+        self._positions[doc_id] = position
+        self._live |= bit
+        assigned: list[tuple[str, str]] = []
+        for field_name, labels in facets.items():
+            if isinstance(labels, str):
+                labels = [labels]
+            values = self._bits.setdefault(field_name, {})
+            for label in labels:
+                value = facet_value(label)
+                if not value or (field_name, value) in assigned:
+                    continue
+                values[value] = values.get(value, 0) | bit
+                self._labels.setdefault((field_name, value), label)
+                assigned.append((field_name, value))
+        self._facets[doc_id] = assigned
+
+    def remove(self, doc_id: str) -> None:
+        position = self._positions.pop(doc_id, None)
+        if position is None:
+            return
+        bit = 1 << position
+        self._ids[position] = None
+        self._free.append(position)
+        self._live &= ~bit
+        for field_name, value in self._facets.pop(doc_id, ()):
+            values = self._bits[field_name]
+            remaining = values[value] & ~bit
+            if remaining:
+                values[value] = remaining
+            else:
+                del values[value]
+                self._labels.pop((field_name, value), None)
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._free.clear()
+        self._positions.clear()
+        self._facets.clear()
+        self._bits.clear()
+        self._labels.clear()
+        self._live = 0
+
+    def mask(self, filters: Iterable[tuple[str, str]] = ()) -> int:
+        mask = self._live
+        for field_name, value in filters:
+            mask &= self._resolve(field_name, value)
+            if not mask:
+                break
+        return mask
+
+    def value_mask(self, field_name: str, value: str) -> int:
+        return self._bits.get(field_name, {}).get(facet_value(value), 0)
+
+    def mask_of(self, doc_ids: Iterable[str]) -> int:
+        mask = 0
+        for doc_id in doc_ids:
+            position = self._positions.get(doc_id)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+    def contains(self, mask: int, doc_id: str) -> bool:
+        position = self._positions.get(doc_id)
+        return position is not None and bool(mask >> position & 1)
+
+    def ids(self, mask: int) -> list[str]:
+        doc_ids: list[str] = []
+        mask &= self._live
+        while mask:
+            low = mask & -mask
+            doc_ids.append(self._ids[low.bit_length() - 1])
+            mask ^= low
+        return doc_ids
+
+    def counts(self, field_name: str, mask: int) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for value, bits in self._bits.get(field_name, {}).items():
+            count = (bits & mask).bit_count()
+            if count:
+                counts[value] = count
+        return counts
+
+    def label(self, field_name: str, value: str) -> str:
+        return self._labels.get((field_name, value), value)
+
+    def _resolve(self, field_name: str, value: str) -> int:
+        values = self._bits.get(field_name, {})
+        exact = values.get(value)
+        if exact is not None:
+            return exact
+        needle = f"-{value}"
+        mask = 0
+        for candidate, bits in values.items():
+            if needle in f"-{candidate}":
+                mask |= bits
+        return mask
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Collection
+
+from app.utils.search_index import fold
+
+DEFAULT_THRESHOLD = 0.45
+DEFAULT_LIMIT = 50
+_SUBSTRING_BONUS = 0.5
+_ALNUM_RE = re.compile(r"[^\W_]+")
+
+
+def compact(text: str) -> str:
+    return "".join(_ALNUM_RE.findall(fold(text)))
+
+
+def trigrams(text: str) -> frozenset[str]:
+    folded = compact(text)
+    if not folded:
+        return frozenset()
+    padded = f"  {folded} "
+    return frozenset(padded[index : index + 3] for index in range(len(padded) - 2))
+
+
+@dataclass(frozen=True)
+class FuzzyHit:
+    key: str
+    label: str
+    score: float
+
+
+class FuzzyIndex:
+    def __init__(self) -> None:
+        self._keys: list[str | None] = []
+        self._labels: list[str] = []
+        self._compact: list[str] = []
+        self._grams: list[frozenset[str]] = []
+        self._sizes: list[int] = []
+        self._free: list[int] = []
+        self._postings: dict[str, set[int]] = {}
+        self._positions: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys) - len(self._free)
+
+    def add(self, key: str, label: str) -> None:
+        grams = trigrams(label)
+        if not grams:
+            return
+        if self._free:
+            position = self._free.pop()
+            self._keys[position] = key
+            self._labels[position] = label
+            self._compact[position] = compact(label)
+            self._grams[position] = grams
+            self._sizes[position] = len(grams)
+        else:
+            position = len(self._keys)
+            self._keys.append(key)
+            self._labels.append(label)
+            self._compact.append(compact(label))
+            self._grams.append(grams)
+            self._sizes.append(len(grams))
+        self._positions.setdefault(key, []).append(position)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(position)
+
+    def add_many(self, key: str, labels: list[str]) -> None:
+        for label in dict.fromkeys(label for label in labels if label):
+            self.add(key, label)
+
+    def remove(self, key: str) -> None:
+        for position in self._positions.pop(key, ()):
+            for gram in self._grams[position]:
+                postings = self._postings[gram]
+                postings.discard(position)
+                if not postings:
+                    del self._postings[gram]
+            self._keys[position] = None
+            self._labels[position] = ""
+            self._compact[position] = ""
+            self._grams[position] = frozenset()
+            self._sizes[position] = 0
+            self._free.append(position)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._labels.clear()
+        self._compact.clear()
+        self._grams.clear()
+        self._sizes.clear()
+        self._free.clear()
+        self._postings.clear()
+        self._positions.clear()
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = DEFAULT_LIMIT,
+        threshold: float = DEFAULT_THRESHOLD,
+        candidates: Collection[str] | None = None,
+    ) -> list[FuzzyHit]:
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        allowed: set[int] | None = None
+        if candidates is not None:
+            allowed = {position for key in candidates for position in self._positions.get(key, ())}
+            if not allowed:
+                return []
+        query_compact = compact(query)
+        size = len(query_grams)
+        min_shared = max(1, math.ceil(size * threshold / 2))
+        shared_counts: Counter[int] = Counter()
+        for gram in query_grams:
+            postings = self._postings.get(gram)
+            if postings:
+                shared_counts.update(postings if allowed is None else postings & allowed)
+
+        best: dict[str, tuple[float, str]] = {}
+        for position, shared in shared_counts.items():
+            if shared < min_shared:
+                continue
+            key = self._keys[position]
+            score = 2.0 * shared / (size + self._sizes[position])
+            if query_compact in self._compact[position]:
+                score += _SUBSTRING_BONUS
+            if score < threshold:
+                continue
+            previous = best.get(key)
+            if previous is None or score > previous[0]:
+                best[key] = (score, self._labels[position])
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[1][1]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [FuzzyHit(key, label, score) for key, (score, label) in ranked]
+
+    def keys(self, query: str, limit: int | None = DEFAULT_LIMIT) -> list[str]:
+        return [hit.key for hit in self.search(query, limit=limit)]
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Iterator
+
+from app.utils import disk_cache
+
+LOGGER = logging.getLogger(__name__)
+
+GLOSSARY_STORE_VERSION = 1
+GLOSSARY_STORE_FILE = "glossary.sqlite3"
+GLOSSARY_DATA_PATH = Path(__file__).resolve().parent / "glossary_data.py"
+DEFAULT_RECORD_CACHE_SIZE = 256
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE terms (term TEXT PRIMARY KEY, record TEXT NOT NULL) WITHOUT ROWID;
+"""
+
+
+def _source_digest() -> str:
+    return f"v{GLOSSARY_STORE_VERSION}:{disk_cache.file_digest(GLOSSARY_DATA_PATH)}"
+
+
+def _load_source() -> dict[str, dict[str, object]]:
+    from app.utils.glossary_data import GLOSSARY_DATA
+
+    return GLOSSARY_DATA
+
+
+def compile_glossary_store(path: Path, glossary: dict[str, dict[str, object]], digest: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    try:
+        connection = sqlite3.connect(tmp_name)
+        try:
+            connection.executescript(_SCHEMA)
+            connection.executemany(
+                "INSERT INTO terms (term, record) VALUES (?, ?)",
+                (
+                    (term, json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+                    for term, data in glossary.items()
+                ),
+            )
+            connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("digest", digest),
+                    ("keywords", json.dumps(list(glossary), ensure_ascii=False)),
+                ],
+            )
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _read_meta(connection: sqlite3.Connection, key: str) -> str | None:
+    row = connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _open_store(path: Path, digest: str) -> tuple[sqlite3.Connection, list[str]] | None:
+    if not path.is_file():
+        return None
+    try:
+        connection = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+    except sqlite3.Error:
+        return None
+    try:
+        if _read_meta(connection, "digest") != digest:
+            connection.close()
+            return None
+        keywords = json.loads(_read_meta(connection, "keywords") or "[]")
+    except (sqlite3.Error, ValueError) as exc:
+        LOGGER.warning("Almacén del glosario inválido, se regenera: %s", exc)
+        connection.close()
+        return None
+    return connection, keywords
+
+
+class GlossaryStore(MutableMapping):
+    def __init__(
+        self,
+        connection: sqlite3.Connection | None,
+        keywords: list[str],
+        fallback: dict[str, dict[str, object]] | None = None,
+        cache_size: int = DEFAULT_RECORD_CACHE_SIZE,
+    ) -> None:
+        self._connection = connection
+        self._fallback = fallback
+        self._keys: dict[str, None] = dict.fromkeys(keywords)
+        self._removed: set[str] = set()
+        self._overlay: dict[str, dict[str, object]] = {}
+        self._records: OrderedDict[str, dict[str, object]] = OrderedDict()
+        self._cache_size = max(1, cache_size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, use_cache: bool = True) -> GlossaryStore:
+        store = cls(None, [])
+        store.rebuild(use_cache=use_cache)
+        return store
+
+    def rebuild(self, use_cache: bool = False) -> None:
+        self.close()
+        path = disk_cache.cache_path(GLOSSARY_STORE_FILE)
+        digest = _source_digest()
+        opened = _open_store(path, digest) if use_cache else None
+        if opened is None:
+            source = _load_source()
+            try:
+                compile_glossary_store(path, source, digest)
+            except (OSError, sqlite3.Error) as exc:
+                LOGGER.warning("No se pudo compilar el glosario en %s: %s", path, exc)
+            opened = _open_store(path, digest)
+            if opened is None:
+                self._fallback = source
+                self._keys = dict.fromkeys(source)
+                return
+        self._connection, keywords = opened
+        self._keys = dict.fromkeys(keywords)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
+        self._fallback = None
+        self._records.clear()
+
+    def keywords(self) -> list[str]:
+        return list(self)
+
+    def _fetch(self, term: str) -> dict[str, object] | None:
+        if self._fallback is not None:
+            return self._fallback.get(term)
+        if self._connection is None:
+            return None
+        with self._lock:
+            row = self._connection.execute("SELECT record FROM terms WHERE term = ?", (term,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def records(self) -> Iterator[tuple[str, dict[str, object]]]:
+        if self._fallback is not None or self._connection is None:
+            for term in self._keys:
+                if term in self._overlay:
+                    continue
+                data = self.get(term)
+                if data is not None:
+                    yield term, data
+        else:
+            with self._lock:
+                rows = self._connection.execute("SELECT term, record FROM terms").fetchall()
+            for term, record in rows:
+                if term in self._keys and term not in self._removed and term not in self._overlay:
+                    yield term, json.loads(record)
+        yield from self._overlay.items()
+
+    def __getitem__(self, term: str) -> dict[str, object]:
+        data = self._overlay.get(term)
+        if data is not None:
+            return data
+        if term not in self._keys or term in self._removed:
+            raise KeyError(term)
+        data = self._records.get(term)
+        if data is not None:
+            self._records.move_to_end(term)
+            return data
+        data = self._fetch(term)
+        if data is None:
+            raise KeyError(term)
+        self._records[term] = data
+        while len(self._records) > self._cache_size:
+            self._records.popitem(last=False)
+        return data
+
+    def __setitem__(self, term: str, data: dict[str, object]) -> None:
+        self._removed.discard(term)
+        self._records.pop(term, None)
+        self._overlay[term] = data
+
+    def __delitem__(self, term: str) -> None:
+        if term not in self:
+            raise KeyError(term)
+        self._overlay.pop(term, None)
+        self._records.pop(term, None)
+        if term in self._keys:
+            self._removed.add(term)
+
+    def __contains__(self, term: object) -> bool:
+        if term in self._overlay:
+            return True
+        return term in self._keys and term not in self._removed
+
+    def __iter__(self) -> Iterator[str]:
+        for term in self._keys:
+            if term not in self._removed:
+                yield term
+        for term in self._overlay:
+            if term not in self._keys:
+                yield term
+
+    def __len__(self) -> int:
+        extra = sum(1 for term in self._overlay if term not in self._keys)
+        return len(self._keys) - len(self._removed) + extra
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import Collection, Mapping
+
+from app.lesson_base import LessonContent
+from app.utils import disk_cache
+
+LESSON_CONTENT_CACHE_VERSION = 1
+LESSON_CONTENT_CACHE_FILE = "lesson_content.pickle"
+_FINGERPRINT_SOURCES = (
+    Path(__file__).resolve().parents[1] / "lesson_base.py",
+    Path(__file__).resolve(),
+)
+
+
+class LessonContentStore:
+    def __init__(self) -> None:
+        self._contents: dict[str, LessonContent] = {}
+        self._sources: dict[str, str] = {}
+        self.modified = False
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    def __contains__(self, lesson_id: object) -> bool:
+        return lesson_id in self._contents
+
+    def is_current(self, lesson_id: str, source: str) -> bool:
+        return lesson_id in self._contents and self._sources.get(lesson_id) == source
+
+    def get(self, lesson_id: str, source: str) -> LessonContent | None:
+        if not self.is_current(lesson_id, source):
+            return None
+        return self._contents[lesson_id]
+
+    def set(self, lesson_id: str, content: LessonContent, source: str) -> None:
+        if self.is_current(lesson_id, source) and self._contents[lesson_id] == content:
+            return
+        self._contents[lesson_id] = content
+        self._sources[lesson_id] = source
+        self.modified = True
+
+    def remove(self, lesson_id: str) -> None:
+        if self._contents.pop(lesson_id, None) is None:
+            return
+        self._sources.pop(lesson_id, None)
+        self.modified = True
+
+    def retain(self, lesson_ids: Collection[str]) -> None:
+        for lesson_id in [lesson_id for lesson_id in self._contents if lesson_id not in lesson_ids]:
+            self.remove(lesson_id)
+
+    def clear(self) -> None:
+        self._contents.clear()
+        self._sources.clear()
+        self.modified = True
+
+    def snapshot(self) -> dict[str, object]:
+        return {"sources": dict(self._sources), "contents": dict(self._contents)}
+
+    def restore(self, snapshot: Mapping[str, object]) -> None:
+        self.clear()
+        sources = snapshot.get("sources")
+        contents = snapshot.get("contents")
+        if isinstance(sources, dict) and isinstance(contents, dict):
+            for lesson_id, content in contents.items():
+                if isinstance(content, LessonContent) and lesson_id in sources:
+                    self._contents[lesson_id] = content
+                    self._sources[lesson_id] = sources[lesson_id]
+        self.modified = False
+
+
+def lesson_content_fingerprint() -> str:
+    digest = hashlib.sha1()
+    digest.update(f"v{LESSON_CONTENT_CACHE_VERSION}:".encode("utf-8"))
+    digest.update(disk_cache.file_digest(*_FINGERPRINT_SOURCES).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_lesson_content_store(store: LessonContentStore) -> bool:
+    data = disk_cache.read_pickle(LESSON_CONTENT_CACHE_FILE)
+    if not isinstance(data, dict):
+        return False
+    if (
+        data.get("version") != LESSON_CONTENT_CACHE_VERSION
+        or data.get("fingerprint") != lesson_content_fingerprint()
+    ):
+        return False
+    snapshot = data.get("snapshot")
+    if not isinstance(snapshot, dict):
+        return False
+    store.restore(snapshot)
+    return True
+
+
+def save_lesson_content_store(store: LessonContentStore) -> bool:
+    saved = disk_cache.write_pickle(
+        LESSON_CONTENT_CACHE_FILE,
+        {
+            "version": LESSON_CONTENT_CACHE_VERSION,
+            "fingerprint": lesson_content_fingerprint(),
+            "snapshot": store.snapshot(),
+        },
+    )
+    if saved:
+        store.modified = False
+    return saved
@@ -1,5 +1,106 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from typing import Iterator
+
+_ITEM_KEYS = ("name", "kind", "common", "category", "signature", "what", "when", "pitfalls", "examples")
+
+_EXAMPLE_VARIANTS = (
+    {
+        "title": "Uso básico de {name}",
+        "learn": (
+            "Aprenderás qué hace {name} y por qué se usa en casos cotidianos.",
+            "Verás cómo encaja {signature} dentro de un flujo realista.",
+            "Reconocerás el resultado esperado para continuar con confianza.",
+        ),
+        "see": "Verás una salida coherente con {what_lower} y un mensaje que confirma que el paso funcionó.",
+        "why_extra": (),
+        "context": "Ejemplo básico de {name}",
+        "min_lines": 10,
+        "extra_context_lines": 1,
+        "pitfalls_limit": 3,
+    },
+    {
+        "title": "Caso realista con {name}",
+        "learn": (
+            "Aprenderás a aplicar {name} en un escenario de trabajo más completo.",
+            "Practicarás cómo preparar datos, ejecutar la acción y validar el resultado.",
+            "Conectarás el ejemplo con decisiones típicas en proyectos reales.",
+        ),
+        "see": "Verás un resultado más completo y señales claras de que {name} aplicó la transformación esperada.",
+        "why_extra": ("El flujo incluye preparación, ejecución y verificación para evitar sorpresas.",),
+        "context": "Caso realista con {name}",
+        "min_lines": 12,
+        "extra_context_lines": 2,
+        "pitfalls_limit": 5,
+    },
+)
+_WHY_TEMPLATES = (
+    "Funciona porque {name} aplica la lógica descrita en su definición.",
+    "La firma {signature} indica los argumentos clave que controlan el comportamiento.",
+)
+_WHY_WHEN_TEMPLATE = "Además, es adecuado {when_lower}."
+
+
+class LibraryItem(Mapping):
+    __slots__ = (
+        "name",
+        "kind",
+        "common",
+        "category",
+        "signature",
+        "what",
+        "when",
+        "pitfalls",
+        "example_code",
+        "_examples",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        common: bool,
+        category: str,
+        signature: str,
+        what: str,
+        when: list[str],
+        pitfalls: list[str],
+        example_code: str,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.common = common
+        self.category = category
+        self.signature = signature
+        self.what = what
+        self.when = when
+        self.pitfalls = pitfalls
+        self.example_code = example_code
+        self._examples: list[dict] | None = None
+
+    @property
+    def examples(self) -> list[dict]:
+        if self._examples is None:
+            self._examples = build_examples(self)
+        return self._examples
+
+    def __getitem__(self, key: str) -> object:
+        if key == "examples":
+            return self.examples
+        if key in _ITEM_KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_ITEM_KEYS)
+
+    def __len__(self) -> int:
+        return len(_ITEM_KEYS)
+
+    def __repr__(self) -> str:
+        return f"LibraryItem({self.name!r}, {self.signature!r})"
+
 
 def _item(
     name: str,
@@ -11,105 +112,40 @@ def _item(
     when: list[str],
     pitfalls: list[str],
     example: str,
-) -> dict:
-    examples = _build_examples(
-        name=name,
-        signature=signature,
-        what=what,
-        when=when,
-        pitfalls=pitfalls,
-        example=example,
-    )
-    return {
-        "name": name,
-        "kind": kind,
-        "common": common,
-        "category": category,
-        "signature": signature,
-        "what": what,
-        "when": when,
-        "pitfalls": pitfalls,
-        "examples": examples,
-    }
+) -> LibraryItem:
+    return LibraryItem(name, kind, common, category, signature, what, when, pitfalls, example)
 
 
-def _build_examples(
-    name: str,
-    signature: str,
-    what: str,
-    when: list[str],
-    pitfalls: list[str],
-    example: str,
-) -> list[dict]:
-    basic_learn = "\n".join(
-        [
-            f"Aprenderás qué hace {name} y por qué se usa en casos cotidianos.",
-            f"Verás cómo encaja {signature} dentro de un flujo realista.",
-            "Reconocerás el resultado esperado para continuar con confianza.",
-        ]
-    )
-    realistic_learn = "\n".join(
-        [
-            f"Aprenderás a aplicar {name} en un escenario de trabajo más completo.",
-            "Practicarás cómo preparar datos, ejecutar la acción y validar el resultado.",
-            "Conectarás el ejemplo con decisiones típicas en proyectos reales.",
-        ]
-    )
-
-    basic_see = (
-        f"Verás una salida coherente con {what.lower()} y un mensaje que confirma que el paso funcionó."
-    )
-    realistic_see = (
-        f"Verás un resultado más completo y señales claras de que {name} aplicó la transformación esperada."
-    )
-
-    why_lines = [
-        f"Funciona porque {name} aplica la lógica descrita en su definición.",
-        f"La firma {signature} indica los argumentos clave que controlan el comportamiento.",
-    ]
-    if when:
-        why_lines.append(f"Además, es adecuado {when[0].lower()}.")
-    basic_why = " ".join(why_lines)
-    realistic_why = " ".join(
-        [
-            basic_why,
-            "El flujo incluye preparación, ejecución y verificación para evitar sorpresas.",
-        ]
-    )
-
-    example_pitfalls = _build_pitfalls(pitfalls)
-
-    basic_do = _build_example_do(
-        example,
-        context=f"Ejemplo básico de {name}",
-        min_lines=10,
-        extra_context_lines=1,
-    )
-    realistic_do = _build_example_do(
-        example,
-        context=f"Caso realista con {name}",
-        min_lines=12,
-        extra_context_lines=2,
-    )
+def build_examples(item: LibraryItem) -> list[dict]:
+    params = {
+        "name": item.name,
+        "signature": item.signature,
+        "what_lower": item.what.lower(),
+        "when_lower": item.when[0].lower() if item.when else "",
+    }
+    why_lines = [template.format(**params) for template in _WHY_TEMPLATES]
+    if item.when:
+        why_lines.append(_WHY_WHEN_TEMPLATE.format(**params))
+    example_pitfalls = _build_pitfalls(item.pitfalls)
 
-    return [
-        {
-            "title": f"Uso básico de {name}",
-            "learn": basic_learn,
-            "do": basic_do,
-            "see": basic_see,
-            "why": basic_why,
-            "pitfalls": example_pitfalls[:3],
-        },
-        {
-            "title": f"Caso realista con {name}",
-            "learn": realistic_learn,
-            "do": realistic_do,
-            "see": realistic_see,
-            "why": realistic_why,
-            "pitfalls": example_pitfalls[:5],
-        },
-    ]
+    examples: list[dict] = []
+    for variant in _EXAMPLE_VARIANTS:
+        examples.append(
+            {
+                "title": variant["title"].format(**params),
+                "learn": "\n".join(line.format(**params) for line in variant["learn"]),
+                "do": _build_example_do(
+                    item.example_code,
+                    context=variant["context"].format(**params),
+                    min_lines=variant["min_lines"],
+                    extra_context_lines=variant["extra_context_lines"],
+                ),
+                "see": variant["see"].format(**params),
+                "why": " ".join([*why_lines, *variant["why_extra"]]),
+                "pitfalls": example_pitfalls[: variant["pitfalls_limit"]],
+            }
+        )
+    return examples
 
 
 def _build_pitfalls(pitfalls: list[str]) -> list[str]:
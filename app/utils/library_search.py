@@ -1,9 +1,27 @@
 from __future__ import annotations
 
-from app.utils.library_catalog import LIBRARIES
+from app.utils.library_catalog import LIBRARIES, LibraryItem, build_examples
 
+LIBRARY_FACET_ALIASES = {
+    "lib": "library",
+    "libreria": "library",
+    "cat": "category",
+    "categoria": "category",
+    "kind": "kind",
+    "tipo": "kind",
+    "comun": "common",
+}
+COMMON_YES = "sí"
+COMMON_NO = "no"
 
-def build_search_text(library_key: str, item: dict) -> str:
+
+def _item_examples(item: dict | LibraryItem) -> list[dict]:
+    if isinstance(item, LibraryItem):
+        return build_examples(item)
+    return item.get("examples", [])
+
+
+def build_search_text(library_key: str, item: dict | LibraryItem) -> str:
     library = LIBRARIES[library_key]
     examples_text = " ".join(
         " ".join(
@@ -16,7 +34,7 @@ def build_search_text(library_key: str, item: dict) -> str:
                 " ".join(example.get("pitfalls", [])),
             ]
         )
-        for example in item.get("examples", [])
+        for example in _item_examples(item)
     )
     parts = [
         library.get("title", ""),
@@ -34,6 +52,29 @@ def build_search_text(library_key: str, item: dict) -> str:
     return " ".join(part for part in parts if part)
 
 
+def library_search_fields(library_key: str, item: dict | LibraryItem) -> dict[str, str]:
+    library = LIBRARIES[library_key]
+    tags = [library.get("title", ""), item.get("category", ""), item.get("kind", ""), *library.get("tags", [])]
+    body = [library.get("summary", ""), *item.get("when", []), *item.get("pitfalls", [])]
+    return {
+        "title": item.get("name", ""),
+        "tags": " ".join(tags),
+        "summary": item.get("what", ""),
+        "body": " ".join(body),
+        "code": item.get("signature", ""),
+    }
+
+
+def library_facets(library_key: str, item: dict | LibraryItem) -> dict[str, str | list[str]]:
+    library = LIBRARIES[library_key]
+    return {
+        "library": [library_key, library.get("title", "")],
+        "category": item.get("category", ""),
+        "kind": item.get("kind", ""),
+        "common": COMMON_YES if item.get("common", False) else COMMON_NO,
+    }
+
+
 def iter_library_items() -> list[tuple[str, dict, dict]]:
     items: list[tuple[str, dict, dict]] = []
     for key, library in LIBRARIES.items():
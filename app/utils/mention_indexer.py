@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_left, insort
+from collections.abc import Mapping
 from dataclasses import dataclass, field
+import ast
+import heapq
 import builtins
+import hashlib
+import io
+import keyword
 import re
-from typing import Iterable
+import sys
+import tokenize
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple
 from urllib.parse import unquote
 
-from app.lesson_base import Lesson
+from app.lesson_base import Lesson, LessonContent, LessonInfo, lesson_content
+from app.utils import disk_cache
 from app.utils.library_catalog import LIBRARIES
 
+_TERM_META_KEYS = ("name", "kind", "owner", "namespace", "label")
+
 
 @dataclass(frozen=True)
 class MentionKey:
@@ -18,33 +32,171 @@ class MentionKey:
     name: str
 
 
-@dataclass
-class MentionedTerm:
-    key: MentionKey
-    aliases: set[str] = field(default_factory=set)
+class LessonMentions:
+    __slots__ = ("term_ids", "counts", "offsets")
+
+    def __init__(self, term_ids: array, counts: array, offsets: array) -> None:
+        self.term_ids = term_ids
+        self.counts = counts
+        self.offsets = offsets
 
 
 @dataclass
 class MentionIndex:
-    terms: dict[MentionKey, MentionedTerm]
-    lesson_mentions: dict[str, set[MentionKey]]
-    lesson_types: dict[str, set[str]]
+    keys: list[MentionKey | None] = field(default_factory=list)
+    key_ids: dict[MentionKey, int] = field(default_factory=dict)
+    alias_bits: array = field(default_factory=lambda: array("B"))
+    term_refs: array = field(default_factory=lambda: array("I"))
+    free_ids: list[int] = field(default_factory=list)
+    lessons: dict[str, LessonMentions] = field(default_factory=dict)
+    lesson_types: dict[str, frozenset[str]] = field(default_factory=dict)
+    catalog_mentions: array = field(default_factory=lambda: array("I"))
+
+
+class TermLesson(NamedTuple):
+    lesson_id: str
+    count: int
+    first_offset: int
+
+
+class TermMeta(Mapping):
+    __slots__ = _TERM_META_KEYS
+
+    def __init__(self, name: str, kind: str, owner: str | None, namespace: str, label: str) -> None:
+        self.name = name
+        self.kind = kind
+        self.owner = owner
+        self.namespace = namespace
+        self.label = label
+
+    def __getitem__(self, key: str) -> str | None:
+        if key not in _TERM_META_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_TERM_META_KEYS)
+
+    def __len__(self) -> int:
+        return len(_TERM_META_KEYS)
+
+    def __reduce__(self) -> tuple[type[TermMeta], tuple[str | None, ...]]:
+        return TermMeta, tuple(getattr(self, name) for name in _TERM_META_KEYS)
+
+    def __repr__(self) -> str:
+        return f"TermMeta({self.kind!r}, {self.owner!r}, {self.name!r})"
+
+
+class _TermLabels(Mapping):
+    def __init__(self, term_meta: dict[str, TermMeta]) -> None:
+        self._term_meta = term_meta
+
+    def __getitem__(self, term_id: str) -> str:
+        return self._term_meta[term_id].label
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._term_meta)
+
+    def __len__(self) -> int:
+        return len(self._term_meta)
+
+
+class _RelatedTerms(Mapping):
+    def __init__(self, resolved: ResolvedMentionIndex, limit: int | None) -> None:
+        self._resolved = resolved
+        self._limit = limit
+
+    def __getitem__(self, term_id: str) -> list[str]:
+        related = self._resolved.related_terms(term_id, self._limit)
+        if not related:
+            raise KeyError(term_id)
+        return related
+
+    def __contains__(self, term_id: object) -> bool:
+        meta = self._resolved.term_meta.get(term_id) if isinstance(term_id, str) else None
+        return meta is not None and len(self._resolved.owner_groups.get(meta.owner or "", ())) > 1
+
+    def __iter__(self) -> Iterator[str]:
+        for members in self._resolved.owner_groups.values():
+            if len(members) > 1:
+                yield from members
+
+    def __len__(self) -> int:
+        return sum(len(members) for members in self._resolved.owner_groups.values() if len(members) > 1)
 
 
 @dataclass
 class ResolvedMentionIndex:
-    auto_terms: dict[str, dict[str, object]]
-    term_meta: dict[str, dict[str, str | None]]
-    term_labels: dict[str, str]
-    term_related: dict[str, list[str]]
-    lesson_terms: dict[str, set[str]]
-    lesson_owner_terms: dict[str, dict[str, set[str]]]
-    lesson_aliases: dict[str, dict[str, str]]
-    lesson_types: dict[str, set[str]]
+    auto_terms: dict[str, dict[str, object]] = field(default_factory=dict)
+    term_meta: dict[str, TermMeta] = field(default_factory=dict)
+    lesson_types: dict[str, frozenset[str]] = field(default_factory=dict)
+    names: list[str] = field(default_factory=list)
+    name_ids: dict[str, int] = field(default_factory=dict)
+    free_ids: list[int] = field(default_factory=list)
+    targets: array = field(default_factory=lambda: array("i"))
+    term_sources: dict[int, list[int]] = field(default_factory=dict)
+    postings: dict[int, list[TermLesson]] = field(default_factory=dict)
+    owner_groups: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def term_labels(self) -> Mapping[str, str]:
+        return _TermLabels(self.term_meta)
+
+    def related_map(self, limit: int | None = None) -> Mapping[str, list[str]]:
+        return _RelatedTerms(self, limit)
+
+    def related_terms(self, term_id: str, limit: int | None = None) -> list[str]:
+        meta = self.term_meta.get(term_id)
+        members = self.owner_groups.get(meta.owner, ()) if meta is not None and meta.owner else ()
+        if len(members) < 2 or (limit is not None and limit <= 0):
+            return []
+        lessons = {posting.lesson_id for posting in self.postings.get(self.name_ids.get(term_id, -1), ())}
+        if not lessons:
+            related = [other for other in members if other != term_id]
+            return related if limit is None else related[:limit]
+        ranked = []
+        for position, other in enumerate(members):
+            if other != term_id:
+                postings = self.postings.get(self.name_ids.get(other, -1), ())
+                shared = sum(1 for posting in postings if posting.lesson_id in lessons)
+                ranked.append((-shared, position, other))
+        if limit is None:
+            ranked.sort()
+        else:
+            ranked = heapq.nsmallest(limit, ranked)
+        return [other for _shared, _position, other in ranked]
+
+
+@dataclass(frozen=True)
+class LessonSources:
+    lesson_key: str
+    texts: list[str]
+    types: set[str]
+    code: list[str] = field(default_factory=list)
+
+
+@dataclass
+class MentionIndexDelta:
+    added_terms: dict[str, dict[str, object]] = field(default_factory=dict)
+    removed_terms: set[str] = field(default_factory=set)
+    changed_lessons: set[str] = field(default_factory=set)
 
 
 _MENTION_INDEX: MentionIndex | None = None
 _RESOLVED_INDEX: ResolvedMentionIndex | None = None
+_GLOSSARY: dict[str, dict[str, object]] = {}
+
+MENTION_CACHE_VERSION = 7
+MENTION_CACHE_FILE = "mention_index.pickle"
+CODE_MENTION_CACHE_VERSION = 2
+CODE_MENTION_CACHE_FILE = "code_mentions.pickle"
+_UTILS_DIR = Path(__file__).resolve().parent
+_FINGERPRINT_SOURCES = (
+    _UTILS_DIR / "library_catalog.py",
+    _UTILS_DIR / "glossary.py",
+    _UTILS_DIR / "glossary_data.py",
+    _UTILS_DIR / "mention_indexer.py",
+)
 
 _LIB_ALIAS_MAP = {
     "pd": "pandas",
@@ -116,19 +268,25 @@ _TYPE_ALIASES = {
     "dataframes": "pandas.DataFrame",
 }
 
-_METHOD_WORD_RE = re.compile(r"\b(" + "|".join(sorted(_METHOD_OWNER_MAP)) + r")\b", re.IGNORECASE)
-_ATTRIBUTE_WORD_RE = re.compile(r"\b(" + "|".join(sorted(_ATTRIBUTE_OWNER_MAP)) + r")\b", re.IGNORECASE)
+_LIB_PREFIXES = {namespace: prefix for prefix, namespace in _LIB_ALIAS_MAP.items()}
+_KNOWN_WORDS = sorted({*_METHOD_OWNER_MAP, *_ATTRIBUTE_OWNER_MAP})
+_KNOWN_INITIALS = "".join(sorted({word[0] for word in _KNOWN_WORDS}))
 
-_LIB_CALL_RE = re.compile(r"\b(?P<prefix>[A-Za-z_]\w*)\.(?P<name>[A-Za-z_]\w*)\s*\(")
-_METHOD_CALL_RE = re.compile(
-    r"(?P<object>(?:\"[^\"]*\"|'[^']*'|\[[^\]]*\]|\{[^\}]*\}|\b[A-Za-z_]\w*\b))\.(?P<name>[A-Za-z_]\w*)\s*\("
-)
-_ATTR_RE = re.compile(
-    r"(?P<object>(?:\"[^\"]*\"|'[^']*'|\[[^\]]*\]|\{[^\}]*\}|\b[A-Za-z_]\w*\b))\.(?P<name>[A-Za-z_]\w*)\b(?!\s*\()"
+_MENTION_SCAN_RE = re.compile(
+    r"(?=(?P<literal>\"[^\"]*\"|'[^']*'|\[[^\]]*\]|\{[^\}]*\})\.(?P<literal_member>[A-Za-z_]\w*)(?P<literal_call>\s*\()?)"
+    r"|(?=tip:(?P<tip>[A-Za-z0-9:_\.\-%]+))"
+    r"|(?=class\s*=\s*[\"'][^\"']*\bkw\b[^\"']*[\"'][^>]*>(?P<kw>[^<]+))"
+    r"|(?<!\w)(?P<word>[A-Za-z_]\w*)(?=(?P<call>\s*\()|\.(?P<member>[A-Za-z_]\w*)(?P<member_call>\s*\()?)"
+    r"|(?<!\w)(?=[" + _KNOWN_INITIALS + _KNOWN_INITIALS.upper() + r"])(?P<known>(?ai:" + "|".join(_KNOWN_WORDS) + r"))(?!\w)"
 )
-_FUNC_CALL_RE = re.compile(r"(?<!\.)\b([A-Za-z_]\w*)\s*\(")
-_TIP_ANCHOR_RE = re.compile(r"tip:([A-Za-z0-9:_\.\-%]+)")
-_KW_MARK_RE = re.compile(r"class\s*=\s*[\"'][^\"']*\bkw\b[^\"']*[\"'][^>]*>([^<]+)")
+
+_ALIAS_WORD = 1
+_ALIAS_CALL = 2
+_ALIAS_MEMBER = 4
+_ALIAS_MEMBER_CALL = 8
+_ALIAS_LIBRARY = 16
+
+_CODE_FENCE_LANGUAGES = {"", "py", "python", "python3", "pycon"}
 
 _BUILTIN_FUNCTIONS = {
     name.lower()
@@ -167,44 +325,56 @@ def _namespace_from_owner(owner: str | None) -> str:
     return "unknown"
 
 
-def _add_term(
-    terms: dict[MentionKey, MentionedTerm],
-    kind: str,
-    namespace: str,
-    owner: str | None,
-    name: str,
-    aliases: Iterable[str],
-) -> MentionKey:
-    key = MentionKey(kind=kind, namespace=namespace, owner=owner, name=name.lower())
-    term = terms.get(key)
-    if term is None:
-        term = MentionedTerm(key=key)
-        terms[key] = term
-    for alias in aliases:
-        alias_clean = alias.strip()
-        if alias_clean:
-            term.aliases.add(alias_clean.lower())
-    return key
-
-
-def _collect_lesson_texts(lesson: Lesson) -> list[str]:
-    texts = [lesson.summary(), lesson.tutorial()]
-    guide_sections = lesson.guide_sections()
-    if guide_sections:
-        for section in guide_sections:
-            texts.append(section.get("title", ""))
-            texts.append(section.get("content", ""))
-    texts.extend([title + " " + detail for title, detail in lesson.common_pitfalls()])
-    texts.extend([title + " " + code for title, code in lesson.code_examples()])
-    for exercise in lesson.exercises():
-        texts.append(exercise.get("question", ""))
-        texts.append(" ".join(exercise.get("hints", [])))
-        texts.append(exercise.get("solution", ""))
-    return [text for text in texts if text]
-
-
-def _detect_lesson_types(lesson: Lesson) -> set[str]:
-    tokens = [lesson.TITLE, *lesson.TAGS]
+_WORD_KEYS = {
+    **{name: ("attribute", _namespace_from_owner(owner), owner, name) for name, owner in _ATTRIBUTE_OWNER_MAP.items()},
+    **{name: ("method", _namespace_from_owner(owner), owner, name) for name, owner in _METHOD_OWNER_MAP.items()},
+}
+
+
+def _split_fenced_code(text: str, texts: list[str], code: list[str]) -> None:
+    if "```" not in text:
+        texts.append(text)
+        return
+    prose: list[str] = []
+    block: list[str] | None = None
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            if block is None:
+                block = [] if stripped[3:].strip().lower() in _CODE_FENCE_LANGUAGES else prose
+            else:
+                if block is not prose:
+                    code.append("\n".join(block))
+                block = None
+            continue
+        (prose if block is None else block).append(line)
+    if block is not None and block is not prose:
+        code.append("\n".join(block))
+    texts.append("\n".join(prose))
+
+
+def _collect_lesson_texts(content: LessonContent) -> tuple[list[str], list[str]]:
+    texts: list[str] = []
+    code: list[str] = []
+    _split_fenced_code(content.summary, texts, code)
+    _split_fenced_code(content.tutorial, texts, code)
+    for section in content.sections:
+        texts.append(section.title)
+        _split_fenced_code(section.content, texts, code)
+    for title, detail in content.pitfalls:
+        _split_fenced_code(title + " " + detail, texts, code)
+    for title, example in content.examples:
+        texts.append(title)
+        code.append(example)
+    for exercise in content.exercises:
+        _split_fenced_code(exercise.question, texts, code)
+        texts.append(" ".join(exercise.hints))
+        code.append(exercise.solution)
+    return [text for text in texts if text.strip()], [block for block in code if block.strip()]
+
+
+def _detect_lesson_types(title: str, tags: Iterable[str]) -> set[str]:
+    tokens = [title, *tags]
     detected = set()
     for token in tokens:
         for raw in re.split(r"[^A-Za-z0-9_]+", token.lower()):
@@ -216,176 +386,584 @@ def _detect_lesson_types(lesson: Lesson) -> set[str]:
     return detected
 
 
-def _extract_mentions_from_text(text: str, terms: dict[MentionKey, MentionedTerm]) -> set[MentionKey]:
-    found: set[MentionKey] = set()
-    for match in _TIP_ANCHOR_RE.finditer(text):
-        term_id = unquote(match.group(1)).strip().lower()
-        if term_id:
-            key = _add_term(
-                terms,
-                kind="explicit",
-                namespace="manual",
-                owner=None,
-                name=term_id,
-                aliases={term_id},
-            )
-            found.add(key)
-
-    for match in _KW_MARK_RE.finditer(text):
-        term_text = match.group(1).strip()
-        if term_text:
-            term_id = term_text.lower()
-            key = _add_term(
-                terms,
-                kind="explicit",
-                namespace="manual",
-                owner=None,
-                name=term_id,
-                aliases={term_text, term_id},
-            )
-            found.add(key)
-    for match in _LIB_CALL_RE.finditer(text):
-        prefix = match.group("prefix")
-        if prefix not in _LIB_ALIAS_MAP:
+def content_sources(info: LessonInfo, content: LessonContent) -> LessonSources:
+    texts, code = _collect_lesson_texts(content)
+    return LessonSources(
+        lesson_key=info.lesson_id,
+        texts=texts,
+        types=_detect_lesson_types(info.title, info.tags),
+        code=code,
+    )
+
+
+def extract_lesson_sources(lesson: Lesson) -> LessonSources:
+    texts, code = _collect_lesson_texts(lesson_content(lesson))
+    return LessonSources(
+        lesson_key=_lesson_id(lesson),
+        texts=texts,
+        types=_detect_lesson_types(lesson.TITLE, lesson.TAGS),
+        code=code,
+    )
+
+
+def _hit(
+    hits: dict[tuple[str, str, str | None, str], list[int]],
+    key: tuple[str, str, str | None, str],
+    aliases: int,
+    offset: int,
+) -> None:
+    hit = hits.get(key)
+    if hit is None:
+        hits[key] = [1, offset, aliases]
+        return
+    hit[0] += 1
+    if offset < hit[1]:
+        hit[1] = offset
+    hit[2] |= aliases
+
+
+def _scan_mentions(
+    text: str,
+    hits: dict[tuple[str, str, str | None, str], list[int]],
+    base_offset: int = 0,
+) -> None:
+    tip_end = kw_end = method_end = attribute_end = 0
+    for match in _MENTION_SCAN_RE.finditer(text):
+        literal, literal_member, literal_call, tip, kw, word, call, member, member_call, known = match.groups()
+        start = match.start()
+        offset = base_offset + start
+        if word is not None:
+            name = word.lower()
+            word_key = _WORD_KEYS.get(name)
+            if word_key is not None:
+                _hit(hits, word_key, _ALIAS_WORD, offset)
+            if call is not None:
+                if start == 0 or text[start - 1] != ".":
+                    if name in _BUILTIN_FUNCTIONS:
+                        _hit(hits, ("builtin", "builtin", None, name), _ALIAS_CALL, offset)
+                    else:
+                        _hit(hits, ("function", "unknown", None, name), _ALIAS_CALL, offset)
+                continue
+            obj = word
+            if member_call is not None and word in _LIB_ALIAS_MAP:
+                _hit(hits, ("function", _LIB_ALIAS_MAP[word], None, member.lower()), _ALIAS_LIBRARY, offset)
+        elif known is not None:
+            _hit(hits, _WORD_KEYS[known.lower()], _ALIAS_WORD, offset)
             continue
-        name = match.group("name").lower()
-        namespace = _LIB_ALIAS_MAP[prefix]
-        key = _add_term(
-            terms,
-            kind="function",
-            namespace=namespace,
-            owner=None,
-            name=name,
-            aliases={f"{prefix}.{name}", f"{prefix}.{name}()", name, f"{name}()"},
-        )
-        found.add(key)
-
-    for match in _METHOD_CALL_RE.finditer(text):
-        obj = match.group("object")
-        if obj in _LIB_ALIAS_MAP:
+        elif literal is not None:
+            obj, member, member_call = literal, literal_member, literal_call
+        elif tip is not None:
+            if start >= tip_end:
+                tip_end = match.end("tip")
+                term_id = unquote(tip).strip().lower()
+                if term_id:
+                    _hit(hits, ("explicit", "manual", None, term_id), _ALIAS_WORD, offset)
             continue
-        name = match.group("name").lower()
-        owner = _infer_owner_from_object(obj, name)
-        namespace = _namespace_from_owner(owner)
-        key = _add_term(
-            terms,
-            kind="method",
-            namespace=namespace,
-            owner=owner,
-            name=name,
-            aliases={f".{name}", f".{name}()", name, f"{name}()"},
-        )
-        found.add(key)
-
-    for match in _ATTR_RE.finditer(text):
-        name = match.group("name").lower()
-        if name in _METHOD_OWNER_MAP:
-            owner = _METHOD_OWNER_MAP.get(name)
-            namespace = _namespace_from_owner(owner)
-            key = _add_term(
-                terms,
-                kind="method",
-                namespace=namespace,
-                owner=owner,
-                name=name,
-                aliases={f".{name}", f".{name}()", name, f"{name}()"},
-            )
-            found.add(key)
+        else:
+            if start >= kw_end:
+                kw_end = match.end("kw")
+                term_id = kw.strip().lower()
+                if term_id:
+                    _hit(hits, ("explicit", "manual", None, term_id), _ALIAS_WORD, offset)
             continue
-        owner = _ATTRIBUTE_OWNER_MAP.get(name)
-        namespace = _namespace_from_owner(owner)
-        key = _add_term(
-            terms,
-            kind="attribute",
-            namespace=namespace,
-            owner=owner,
-            name=name,
-            aliases={f".{name}", name},
-        )
-        found.add(key)
-
-    for match in _FUNC_CALL_RE.finditer(text):
-        name = match.group(1).lower()
-        if name in _BUILTIN_FUNCTIONS:
-            key = _add_term(
-                terms,
-                kind="builtin",
-                namespace="builtin",
-                owner=None,
-                name=name,
-                aliases={name, f"{name}()"},
-            )
-            found.add(key)
+
+        name = member.lower()
+        if member_call is not None:
+            if start < method_end:
+                continue
+            method_end = start + len(obj) + 1 + len(member) + len(member_call)
+            if obj in _LIB_ALIAS_MAP:
+                continue
+            owner = _infer_owner_from_object(obj, name)
+            _hit(hits, ("method", _namespace_from_owner(owner), owner, name), _ALIAS_MEMBER_CALL, offset)
+        elif start >= attribute_end:
+            attribute_end = start + len(obj) + 1 + len(member)
+            if name in _METHOD_OWNER_MAP:
+                _hit(hits, _WORD_KEYS[name], _ALIAS_MEMBER_CALL, offset)
+            else:
+                owner = _ATTRIBUTE_OWNER_MAP.get(name)
+                _hit(hits, ("attribute", _namespace_from_owner(owner), owner, name), _ALIAS_MEMBER, offset)
+
+
+_MENTION_KEYS: dict[tuple[str, str, str | None, str], MentionKey] = {}
+_ALIAS_SETS: dict[tuple[str, str, int], frozenset[str]] = {}
+
+
+def _mention_key(key: tuple[str, str, str | None, str]) -> MentionKey:
+    mention_key = _MENTION_KEYS.get(key)
+    if mention_key is None:
+        kind, namespace, owner, name = key
+        mention_key = _MENTION_KEYS[key] = MentionKey(kind=kind, namespace=namespace, owner=owner, name=name)
+    return mention_key
+
+
+def _alias_set(name: str, namespace: str, aliases: int) -> frozenset[str]:
+    cache_key = (name, namespace, aliases)
+    alias_set = _ALIAS_SETS.get(cache_key)
+    if alias_set is not None:
+        return alias_set
+    values = {name}
+    if aliases & (_ALIAS_CALL | _ALIAS_MEMBER_CALL | _ALIAS_LIBRARY):
+        values.add(f"{name}()")
+    if aliases & (_ALIAS_MEMBER | _ALIAS_MEMBER_CALL):
+        values.add(f".{name}")
+    if aliases & _ALIAS_MEMBER_CALL:
+        values.add(f".{name}()")
+    if aliases & _ALIAS_LIBRARY:
+        prefix = _LIB_PREFIXES[namespace]
+        values.update((f"{prefix}.{name}", f"{prefix}.{name}()"))
+    alias_set = _ALIAS_SETS[cache_key] = frozenset(values)
+    return alias_set
+
+
+_LIB_MODULES = {
+    "pandas": "pandas",
+    "numpy": "numpy",
+    "matplotlib": "matplotlib",
+    "seaborn": "seaborn",
+    "tensorflow": "tensorflow",
+    "torch": "pytorch",
+    "sklearn": "sklearn",
+}
+
+_BUILTIN_TYPES = {"str", "list", "dict", "set", "tuple"}
+_PANDAS_FRAME_FACTORIES = {"dataframe", "concat", "merge", "pivot_table"}
+_METHOD_RESULTS = {
+    "str": {
+        **dict.fromkeys(
+            ("upper", "lower", "strip", "lstrip", "rstrip", "replace", "format", "title", "capitalize", "join"),
+            "str",
+        ),
+        **dict.fromkeys(("split", "rsplit", "splitlines"), "list"),
+    },
+    "list": {"copy": "list"},
+    "dict": {"copy": "dict"},
+    "set": dict.fromkeys(("copy", "union", "intersection", "difference"), "set"),
+    "pandas.DataFrame": dict.fromkeys(
+        (
+            "head", "tail", "copy", "sort_values", "sort_index", "drop", "dropna", "fillna", "rename", "merge",
+            "reset_index", "set_index", "query", "assign", "sample", "drop_duplicates", "astype", "pivot_table",
+        ),
+        "pandas.DataFrame",
+    ),
+}
+_SKIPPED_TOKENS = {tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.INDENT, tokenize.DEDENT}
+
+CodeHit = tuple[tuple[str, str, str | None, str], int, int, int]
+
+
+@dataclass
+class CodeMentionCache:
+    entries: dict[bytes, tuple[CodeHit, ...]] = field(default_factory=dict)
+    live: set[bytes] | None = None
+    modified: bool = False
+
+
+_CODE_MENTIONS: CodeMentionCache | None = None
+
+
+def _line_starts(code: str) -> tuple[list[str], list[int]]:
+    lines = code.split("\n")
+    starts = [0]
+    for line in lines:
+        starts.append(starts[-1] + len(line) + 1)
+    return lines, starts
+
+
+def _returns_frame(name: str) -> bool:
+    name = name.lower()
+    return name in _PANDAS_FRAME_FACTORIES or name.startswith("read_")
+
+
+class _CodeMentionVisitor(ast.NodeVisitor):
+    def __init__(self, code: str) -> None:
+        self.hits: dict[tuple[str, str, str | None, str], list[int]] = {}
+        self._lines, self._starts = _line_starts(code)
+        self._modules = dict(_LIB_ALIAS_MAP)
+        self._symbols: dict[str, str] = {}
+        self._types: dict[str, str] = {}
+
+    def _offset(self, node: ast.expr) -> int:
+        line = self._lines[node.lineno - 1]
+        column = node.col_offset
+        if not line.isascii():
+            column = len(line.encode("utf-8")[:column].decode("utf-8", "ignore"))
+        return self._starts[node.lineno - 1] + column
+
+    def _library(self, node: ast.expr) -> tuple[str, bool] | None:
+        depth = 0
+        while isinstance(node, ast.Attribute):
+            node = node.value
+            depth += 1
+        if not isinstance(node, ast.Name):
+            return None
+        namespace = self._modules.get(node.id) or self._symbols.get(node.id)
+        if namespace is None:
+            return None
+        return namespace, depth == 0
+
+    def _type_of(self, node: ast.expr) -> str | None:
+        if isinstance(node, ast.Constant):
+            return "str" if isinstance(node.value, str) else None
+        if isinstance(node, ast.JoinedStr):
+            return "str"
+        if isinstance(node, (ast.List, ast.ListComp)):
+            return "list"
+        if isinstance(node, (ast.Dict, ast.DictComp)):
+            return "dict"
+        if isinstance(node, (ast.Set, ast.SetComp)):
+            return "set"
+        if isinstance(node, ast.Tuple):
+            return "tuple"
+        if isinstance(node, ast.Name):
+            return self._types.get(node.id)
+        if not isinstance(node, ast.Call):
+            return None
+        func = node.func
+        if isinstance(func, ast.Name):
+            if func.id in _BUILTIN_TYPES and func.id not in self._types:
+                return func.id
+            if self._symbols.get(func.id) == "pandas" and _returns_frame(func.id):
+                return "pandas.DataFrame"
+            return None
+        if not isinstance(func, ast.Attribute):
+            return None
+        library = self._library(func.value)
+        if library is not None:
+            return "pandas.DataFrame" if library[0] == "pandas" and _returns_frame(func.attr) else None
+        receiver = self._type_of(func.value)
+        return _METHOD_RESULTS.get(receiver, {}).get(func.attr) if receiver else None
+
+    def _annotation_type(self, node: ast.expr | None) -> str | None:
+        if isinstance(node, ast.Subscript):
+            node = node.value
+        if isinstance(node, ast.Name):
+            if node.id in _BUILTIN_TYPES:
+                return node.id
+            if node.id == "DataFrame" and self._symbols.get(node.id) == "pandas":
+                return "pandas.DataFrame"
+        if isinstance(node, ast.Attribute) and node.attr == "DataFrame":
+            library = self._library(node.value)
+            if library is not None and library[0] == "pandas":
+                return "pandas.DataFrame"
+        return None
+
+    def _bind(self, target: ast.expr, value_type: str | None) -> None:
+        if isinstance(target, ast.Name) and value_type is not None:
+            self._types[target.id] = value_type
+
+    def _member(self, node: ast.Attribute, called: bool) -> None:
+        name = node.attr.lower()
+        owner = self._type_of(node.value)
+        offset = self._offset(node)
+        if called or name in _METHOD_OWNER_MAP:
+            owner = owner or _METHOD_OWNER_MAP.get(name)
+            _hit(self.hits, ("method", _namespace_from_owner(owner), owner, name), _ALIAS_MEMBER_CALL, offset)
+        else:
+            owner = owner or _ATTRIBUTE_OWNER_MAP.get(name)
+            _hit(self.hits, ("attribute", _namespace_from_owner(owner), owner, name), _ALIAS_MEMBER, offset)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            root = alias.name.split(".", 1)[0]
+            namespace = _LIB_MODULES.get(root)
+            if namespace is not None:
+                self._modules[alias.asname or root] = namespace
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        namespace = _LIB_MODULES.get((node.module or "").split(".", 1)[0])
+        if namespace is None or node.level:
+            return
+        for alias in node.names:
+            if alias.name != "*":
+                self._symbols[alias.asname or alias.name] = namespace
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.visit(node.value)
+        value_type = self._type_of(node.value)
+        for target in node.targets:
+            self.visit(target)
+            self._bind(target, value_type)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if node.value is not None:
+            self.visit(node.value)
+        self.visit(node.annotation)
+        self.visit(node.target)
+        value_type = self._annotation_type(node.annotation)
+        if value_type is None and node.value is not None:
+            value_type = self._type_of(node.value)
+        self._bind(node.target, value_type)
+
+    def visit_arguments(self, node: ast.arguments) -> None:
+        self.generic_visit(node)
+        for arg in (*node.posonlyargs, *node.args, *node.kwonlyargs):
+            self._types.pop(arg.arg, None)
+            value_type = self._annotation_type(arg.annotation)
+            if value_type is not None:
+                self._types[arg.arg] = value_type
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if not isinstance(node.ctx, ast.Load):
+            self._types.pop(node.id, None)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if isinstance(func, ast.Name):
+            name = func.id.lower()
+            namespace = self._symbols.get(func.id)
+            if namespace is not None:
+                _hit(self.hits, ("function", namespace, None, name), _ALIAS_CALL, self._offset(func))
+            elif name in _BUILTIN_FUNCTIONS:
+                _hit(self.hits, ("builtin", "builtin", None, name), _ALIAS_CALL, self._offset(func))
+            else:
+                _hit(self.hits, ("function", "unknown", None, name), _ALIAS_CALL, self._offset(func))
+        elif isinstance(func, ast.Attribute):
+            library = self._library(func.value)
+            if library is not None:
+                namespace, direct = library
+                aliases = _ALIAS_LIBRARY if direct else _ALIAS_MEMBER_CALL
+                _hit(self.hits, ("function", namespace, None, func.attr.lower()), aliases, self._offset(func))
+            else:
+                self._member(func, called=True)
+                self.visit(func.value)
         else:
-            key = _add_term(
-                terms,
-                kind="function",
-                namespace="unknown",
-                owner=None,
-                name=name,
-                aliases={name, f"{name}()"},
-            )
-            found.add(key)
-
-    for match in _METHOD_WORD_RE.finditer(text):
-        name = match.group(1).lower()
-        owner = _METHOD_OWNER_MAP.get(name)
-        namespace = _namespace_from_owner(owner)
-        key = _add_term(
-            terms,
-            kind="method",
-            namespace=namespace,
-            owner=owner,
-            name=name,
-            aliases={name},
-        )
-        found.add(key)
-
-    for match in _ATTRIBUTE_WORD_RE.finditer(text):
-        name = match.group(1).lower()
-        owner = _ATTRIBUTE_OWNER_MAP.get(name)
-        namespace = _namespace_from_owner(owner)
-        key = _add_term(
-            terms,
-            kind="attribute",
-            namespace=namespace,
-            owner=owner,
-            name=name,
-            aliases={name},
-        )
-        found.add(key)
-
-    return found
-
-
-def build_mention_index(lessons: Iterable[Lesson]) -> MentionIndex:
-    terms: dict[MentionKey, MentionedTerm] = {}
-    lesson_mentions: dict[str, set[MentionKey]] = {}
-    lesson_types: dict[str, set[str]] = {}
+            self.visit(func)
+        for argument in node.args:
+            self.visit(argument)
+        for keyword_argument in node.keywords:
+            self.visit(keyword_argument)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        library = self._library(node.value)
+        if library is not None:
+            _hit(self.hits, ("attribute", library[0], None, node.attr.lower()), _ALIAS_MEMBER, self._offset(node))
+            return
+        self._member(node, called=False)
+        self.visit(node.value)
+
+
+def _token_hits(code: str) -> dict[tuple[str, str, str | None, str], list[int]]:
+    hits: dict[tuple[str, str, str | None, str], list[int]] = {}
+    _lines, starts = _line_starts(code)
+    tokens: list[tokenize.TokenInfo] = []
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(code).readline):
+            if token.type not in _SKIPPED_TOKENS:
+                tokens.append(token)
+    except (tokenize.TokenError, SyntaxError):
+        pass
+
+    def offset(token: tokenize.TokenInfo) -> int:
+        return starts[token.start[0] - 1] + token.start[1]
+
+    def is_call(position: int) -> bool:
+        return position < len(tokens) and tokens[position].string == "("
+
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        position += 1
+        if token.type not in (tokenize.NAME, tokenize.STRING) or keyword.iskeyword(token.string):
+            continue
+        chain = [token]
+        while (
+            position + 1 < len(tokens)
+            and tokens[position].string == "."
+            and tokens[position].start == chain[-1].end
+            and tokens[position + 1].type == tokenize.NAME
+            and tokens[position + 1].start == tokens[position].end
+        ):
+            chain.append(tokens[position + 1])
+            position += 2
+        called = is_call(position)
+        if len(chain) == 1:
+            if token.type == tokenize.NAME and called:
+                name = token.string.lower()
+                if name in _BUILTIN_FUNCTIONS:
+                    _hit(hits, ("builtin", "builtin", None, name), _ALIAS_CALL, offset(token))
+                else:
+                    _hit(hits, ("function", "unknown", None, name), _ALIAS_CALL, offset(token))
+            continue
+        namespace = _LIB_ALIAS_MAP.get(token.string)
+        if namespace is not None:
+            name = chain[-1].string.lower()
+            if called:
+                aliases = _ALIAS_LIBRARY if len(chain) == 2 else _ALIAS_MEMBER_CALL
+                _hit(hits, ("function", namespace, None, name), aliases, offset(token))
+            else:
+                _hit(hits, ("attribute", namespace, None, name), _ALIAS_MEMBER, offset(token))
+            continue
+        for index, member in enumerate(chain[1:], start=1):
+            name = member.string.lower()
+            owner = "str" if index == 1 and token.type == tokenize.STRING else None
+            if (called and index == len(chain) - 1) or name in _METHOD_OWNER_MAP:
+                owner = owner or _METHOD_OWNER_MAP.get(name)
+                _hit(hits, ("method", _namespace_from_owner(owner), owner, name), _ALIAS_MEMBER_CALL, offset(token))
+            else:
+                owner = owner or _ATTRIBUTE_OWNER_MAP.get(name)
+                _hit(hits, ("attribute", _namespace_from_owner(owner), owner, name), _ALIAS_MEMBER, offset(token))
+    return hits
+
+
+def _code_hits(code: str) -> tuple[CodeHit, ...]:
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        hits = _token_hits(code)
+    else:
+        visitor = _CodeMentionVisitor(code)
+        visitor.visit(tree)
+        hits = visitor.hits
+    return tuple((key, count, first, aliases) for key, (count, first, aliases) in hits.items())
+
+
+def _code_mention_fingerprint() -> str:
+    version = f"{sys.version_info.major}.{sys.version_info.minor}"
+    return f"{version}:{disk_cache.file_digest(_UTILS_DIR / 'mention_indexer.py')}"
+
+
+def load_code_mention_cache() -> CodeMentionCache:
+    data = disk_cache.read_pickle(CODE_MENTION_CACHE_FILE)
+    entries = None
+    if isinstance(data, dict) and data.get("version") == CODE_MENTION_CACHE_VERSION:
+        if data.get("fingerprint") == _code_mention_fingerprint():
+            entries = data.get("entries")
+    return CodeMentionCache(entries if isinstance(entries, dict) else {})
+
+
+def _code_mentions() -> CodeMentionCache:
+    global _CODE_MENTIONS
+    if _CODE_MENTIONS is None:
+        _CODE_MENTIONS = load_code_mention_cache()
+    return _CODE_MENTIONS
+
+
+def _scan_code(
+    code: str,
+    hits: dict[tuple[str, str, str | None, str], list[int]],
+    cache: CodeMentionCache,
+    base_offset: int = 0,
+) -> None:
+    digest = hashlib.sha1(code.encode("utf-8", "surrogatepass")).digest()
+    code_hits = cache.entries.get(digest)
+    if code_hits is None:
+        code_hits = cache.entries[digest] = _code_hits(code)
+        cache.modified = True
+    if cache.live is not None:
+        cache.live.add(digest)
+    for key, count, first, aliases in code_hits:
+        hit = hits.get(key)
+        if hit is None:
+            hits[key] = [count, base_offset + first, aliases]
+            continue
+        hit[0] += count
+        if base_offset + first < hit[1]:
+            hit[1] = base_offset + first
+        hit[2] |= aliases
+
+
+def save_code_mention_cache(cache: CodeMentionCache | None = None) -> bool:
+    cache = _CODE_MENTIONS if cache is None else cache
+    if cache is None:
+        return False
+    if cache.live is not None and len(cache.live) < len(cache.entries):
+        cache.entries = {digest: hits for digest, hits in cache.entries.items() if digest in cache.live}
+        cache.modified = True
+    if not cache.modified:
+        return False
+    saved = disk_cache.write_pickle(
+        CODE_MENTION_CACHE_FILE,
+        {
+            "version": CODE_MENTION_CACHE_VERSION,
+            "fingerprint": _code_mention_fingerprint(),
+            "entries": cache.entries,
+        },
+    )
+    if saved:
+        cache.modified = False
+    return saved
+
+
+def _term_id(index: MentionIndex, key: MentionKey) -> tuple[int, bool]:
+    term_id = index.key_ids.get(key)
+    if term_id is not None:
+        return term_id, False
+    if index.free_ids:
+        term_id = index.free_ids.pop()
+        index.keys[term_id] = key
+    else:
+        term_id = len(index.keys)
+        index.keys.append(key)
+        index.alias_bits.append(0)
+        index.term_refs.append(0)
+    index.key_ids[key] = term_id
+    return term_id, True
+
+
+def _intern_hits(
+    index: MentionIndex,
+    hits: dict[tuple[str, str, str | None, str], list[int]],
+) -> tuple[list[tuple[int, int, int]], set[int]]:
+    entries: list[tuple[int, int, int]] = []
+    grown: set[int] = set()
+    for raw_key, (count, first_offset, aliases) in hits.items():
+        term_id, created = _term_id(index, _mention_key(raw_key))
+        known = index.alias_bits[term_id]
+        if aliases & ~known:
+            index.alias_bits[term_id] = known | aliases
+            if not created:
+                grown.add(term_id)
+        index.term_refs[term_id] += 1
+        entries.append((term_id, count, first_offset))
+    entries.sort()
+    return entries, grown
+
+
+_TYPE_SETS: dict[frozenset[str], frozenset[str]] = {}
+
+
+def _intern_types(lesson_types: Iterable[str]) -> frozenset[str]:
+    types = frozenset(lesson_types)
+    return _TYPE_SETS.setdefault(types, types)
+
+
+def _index_lesson_texts(
+    index: MentionIndex,
+    lesson_key: str,
+    texts: Iterable[str],
+    code: Iterable[str],
+    lesson_types: set[str],
+    code_cache: CodeMentionCache,
+) -> tuple[LessonMentions, set[int]]:
+    hits: dict[tuple[str, str, str | None, str], list[int]] = {}
+    offset = 0
+    for text in texts:
+        _scan_mentions(text, hits, offset)
+        offset += len(text) + 1
+    for block in code:
+        _scan_code(block, hits, code_cache, offset)
+        offset += len(block) + 1
+    entries, grown = _intern_hits(index, hits)
+    mentions = LessonMentions(
+        array("I", [term_id for term_id, _count, _offset in entries]),
+        array("I", [count for _term_id, count, _offset in entries]),
+        array("I", [first_offset for _term_id, _count, first_offset in entries]),
+    )
+    index.lessons[lesson_key] = mentions
+    index.lesson_types[lesson_key] = _intern_types(lesson_types)
+    return mentions, grown
 
-    for lesson in lessons:
-        lesson_key = _lesson_id(lesson)
-        lesson_types[lesson_key] = _detect_lesson_types(lesson)
-        mentions: set[MentionKey] = set()
-        for text in _collect_lesson_texts(lesson):
-            mentions.update(_extract_mentions_from_text(text, terms))
-        lesson_mentions[lesson_key] = mentions
 
+def _collect_catalog_mentions(index: MentionIndex) -> array:
+    hits: dict[tuple[str, str, str | None, str], list[int]] = {}
     for library_key, library in LIBRARIES.items():
         namespace = library_key
         for item in library.get("items", []):
             name = str(item.get("name", "")).strip().lower()
             if not name:
                 continue
-            aliases = {name}
-            _add_term(
-                terms,
-                kind="function",
-                namespace=namespace,
-                owner=None,
-                name=name,
-                aliases=aliases,
-            )
+            _hit(hits, ("function", namespace, None, name), 0, 0)
             for text in (
                 item.get("signature", ""),
                 item.get("what", ""),
@@ -393,149 +971,410 @@ def build_mention_index(lessons: Iterable[Lesson]) -> MentionIndex:
                 " ".join(item.get("pitfalls", [])),
                 item.get("example", ""),
             ):
-                _extract_mentions_from_text(str(text), terms)
+                _scan_mentions(str(text), hits)
+    entries, _grown = _intern_hits(index, hits)
+    return array("I", [term_id for term_id, _count, _offset in entries])
 
-    global _MENTION_INDEX, _RESOLVED_INDEX
-    _MENTION_INDEX = MentionIndex(
-        terms=terms,
-        lesson_mentions=lesson_mentions,
-        lesson_types=lesson_types,
-    )
-    _RESOLVED_INDEX = None
-    return _MENTION_INDEX
 
+def build_mention_index(
+    lessons: Iterable[Lesson | LessonSources],
+    code_cache: CodeMentionCache | None = None,
+) -> MentionIndex:
+    code_cache = _code_mentions() if code_cache is None else code_cache
+    code_cache.live = set()
+    index = MentionIndex()
+
+    for lesson in lessons:
+        sources = lesson if isinstance(lesson, LessonSources) else extract_lesson_sources(lesson)
+        _index_lesson_texts(index, sources.lesson_key, sources.texts, sources.code, sources.types, code_cache)
+
+    index.catalog_mentions = _collect_catalog_mentions(index)
+    return index
+
+
+def _term_label(name: str, kind: str) -> str:
+    if kind in {"method", "function", "builtin"}:
+        return f"{name}()"
+    return name
+
+
+def _build_term_id(
+    key: MentionKey,
+    resolved: ResolvedMentionIndex,
+    glossary: Mapping[str, dict[str, object]],
+) -> str:
+    if key.name in glossary and key.name not in resolved.auto_terms:
+        return key.name
+    if key.kind == "explicit":
+        return key.name
+    if key.kind == "method":
+        owner = key.owner or "unknown"
+        return f"method:{owner}.{key.name}"
+    if key.kind == "attribute":
+        owner = key.owner or "unknown"
+        return f"attr:{owner}.{key.name}"
+    if key.kind == "builtin":
+        return f"builtin:{key.name}"
+    if key.namespace != "unknown":
+        return f"{key.namespace}:{key.name}"
+    return f"unknown:{key.name}"
+
+
+_AUTO_TERM_DATA: dict[str, object] = {
+    "tooltip": "Término detectado en las lecciones. Abre para ver detalles.",
+    "definition_parts": {
+        "que_es": "Pendiente de documentar.",
+        "sintaxis": "Pendiente de documentar.",
+        "ejemplo": "Pendiente de documentar.",
+        "error_tipico": "Pendiente de documentar.",
+        "ver_tambien": "Pendiente de documentar.",
+    },
+}
+
+
+def _key_order(key: MentionKey) -> tuple[str, str, str, str]:
+    return (key.kind, key.namespace, key.owner or "", key.name)
+
+
+def _apply_term_meta(
+    resolved: ResolvedMentionIndex,
+    index: MentionIndex,
+    resolved_id: int,
+    touched_owners: set[str],
+) -> None:
+    key = min((index.keys[source] for source in resolved.term_sources[resolved_id]), key=_key_order)
+    term_id = resolved.names[resolved_id]
+    previous = resolved.term_meta.get(term_id)
+    previous_owner = previous.owner if previous is not None else None
+    if previous is not None and previous.kind == key.kind and previous_owner == key.owner and (
+        previous.namespace == key.namespace and previous.name == key.name
+    ):
+        return
+    resolved.term_meta[term_id] = TermMeta(key.name, key.kind, key.owner, key.namespace, _term_label(key.name, key.kind))
+    if previous_owner != key.owner:
+        if previous_owner:
+            members = resolved.owner_groups.get(previous_owner)
+            if members and term_id in members:
+                members.remove(term_id)
+            touched_owners.add(previous_owner)
+        if key.owner:
+            resolved.owner_groups.setdefault(key.owner, []).append(term_id)
+    if key.owner:
+        touched_owners.add(key.owner)
+
+
+def _resolve_term(
+    resolved: ResolvedMentionIndex,
+    index: MentionIndex,
+    mention_id: int,
+    touched_owners: set[str],
+    glossary: Mapping[str, dict[str, object]],
+    delta: MentionIndexDelta | None = None,
+) -> int:
+    targets = resolved.targets
+    if mention_id < len(targets) and targets[mention_id] >= 0:
+        return targets[mention_id]
+    term_id = _build_term_id(index.keys[mention_id], resolved, glossary)
+    resolved_id = resolved.name_ids.get(term_id)
+    if resolved_id is None:
+        if resolved.free_ids:
+            resolved_id = resolved.free_ids.pop()
+            resolved.names[resolved_id] = term_id
+        else:
+            resolved_id = len(resolved.names)
+            resolved.names.append(term_id)
+        resolved.name_ids[term_id] = resolved_id
+    if mention_id >= len(targets):
+        targets.extend([-1] * (mention_id + 1 - len(targets)))
+    targets[mention_id] = resolved_id
+    resolved.term_sources.setdefault(resolved_id, []).append(mention_id)
+    is_new = term_id not in resolved.term_meta
+    _apply_term_meta(resolved, index, resolved_id, touched_owners)
+    if is_new and (term_id not in glossary or term_id in resolved.auto_terms):
+        resolved.auto_terms[term_id] = _AUTO_TERM_DATA
+        if delta is not None:
+            if term_id in delta.removed_terms:
+                delta.removed_terms.discard(term_id)
+            else:
+                delta.added_terms[term_id] = _AUTO_TERM_DATA
+    return resolved_id
+
+
+def _drop_term(
+    resolved: ResolvedMentionIndex,
+    index: MentionIndex,
+    mention_id: int,
+    touched_owners: set[str],
+    delta: MentionIndexDelta,
+) -> None:
+    if mention_id >= len(resolved.targets) or resolved.targets[mention_id] < 0:
+        return
+    resolved_id = resolved.targets[mention_id]
+    resolved.targets[mention_id] = -1
+    sources = resolved.term_sources[resolved_id]
+    sources.remove(mention_id)
+    if sources:
+        _apply_term_meta(resolved, index, resolved_id, touched_owners)
+        return
+    del resolved.term_sources[resolved_id]
+    term_id = resolved.names[resolved_id]
+    resolved.names[resolved_id] = ""
+    resolved.name_ids.pop(term_id, None)
+    resolved.free_ids.append(resolved_id)
+    resolved.postings.pop(resolved_id, None)
+    meta = resolved.term_meta.pop(term_id, None)
+    owner = meta.owner if meta is not None else None
+    if owner:
+        members = resolved.owner_groups.get(owner)
+        if members and term_id in members:
+            members.remove(term_id)
+        touched_owners.add(owner)
+    if resolved.auto_terms.pop(term_id, None) is not None:
+        if term_id in delta.added_terms:
+            delta.added_terms.pop(term_id)
+        else:
+            delta.removed_terms.add(term_id)
+
+
+def _refresh_owner_group(resolved: ResolvedMentionIndex, owner: str) -> None:
+    members = resolved.owner_groups.get(owner, [])
+    if not members:
+        resolved.owner_groups.pop(owner, None)
+        return
+    members.sort(key=lambda tid: resolved.term_meta[tid].label)
+
+
+def _unlink_lesson(resolved: ResolvedMentionIndex, lesson_key: str, mentions: LessonMentions) -> None:
+    for resolved_id in {resolved.targets[mention_id] for mention_id in mentions.term_ids}:
+        postings = resolved.postings.get(resolved_id)
+        if not postings:
+            continue
+        position = bisect_left(postings, (lesson_key,))
+        if position == len(postings) or postings[position].lesson_id != lesson_key:
+            continue
+        del postings[position]
+        if not postings:
+            del resolved.postings[resolved_id]
+
+
+def _resolve_lesson(resolved: ResolvedMentionIndex, lesson_key: str, mentions: LessonMentions) -> None:
+    totals: dict[int, list[int]] = {}
+    for mention_id, count, first_offset in zip(mentions.term_ids, mentions.counts, mentions.offsets):
+        resolved_id = resolved.targets[mention_id]
+        total = totals.get(resolved_id)
+        if total is None:
+            totals[resolved_id] = [count, first_offset]
+        else:
+            total[0] += count
+            total[1] = min(total[1], first_offset)
+    for resolved_id, (count, first_offset) in totals.items():
+        insort(resolved.postings.setdefault(resolved_id, []), TermLesson(lesson_key, count, first_offset))
+
+
+def resolve_mention_index(index: MentionIndex, glossary: dict[str, dict[str, object]]) -> ResolvedMentionIndex:
+    resolved = ResolvedMentionIndex(lesson_types=index.lesson_types)
+    touched_owners: set[str] = set()
+    for mention_id, key in enumerate(index.keys):
+        if key is not None:
+            _resolve_term(resolved, index, mention_id, touched_owners, glossary)
+
+    for owner in touched_owners:
+        _refresh_owner_group(resolved, owner)
 
-def resolve_mention_index(glossary: dict[str, dict[str, object]]) -> ResolvedMentionIndex:
+    for lesson_key, mentions in sorted(index.lessons.items()):
+        _resolve_lesson(resolved, lesson_key, mentions)
+    return resolved
+
+
+def install_mention_index(
+    index: MentionIndex,
+    resolved: ResolvedMentionIndex,
+    glossary: dict[str, dict[str, object]],
+    code_cache: CodeMentionCache | None = None,
+) -> None:
+    global _MENTION_INDEX, _RESOLVED_INDEX, _GLOSSARY, _CODE_MENTIONS
+    _MENTION_INDEX = index
+    _RESOLVED_INDEX = resolved
+    _GLOSSARY = glossary
+    if code_cache is not None:
+        _CODE_MENTIONS = code_cache
+
+
+def _release_mentions(
+    index: MentionIndex,
+    mention_ids: Iterable[int],
+    touched_owners: set[str],
+    delta: MentionIndexDelta,
+) -> None:
+    for mention_id in mention_ids:
+        remaining = index.term_refs[mention_id] - 1
+        index.term_refs[mention_id] = max(remaining, 0)
+        if remaining > 0:
+            continue
+        if _RESOLVED_INDEX is not None:
+            _drop_term(_RESOLVED_INDEX, index, mention_id, touched_owners, delta)
+        key = index.keys[mention_id]
+        index.keys[mention_id] = None
+        index.key_ids.pop(key, None)
+        index.alias_bits[mention_id] = 0
+        index.free_ids.append(mention_id)
+
+
+def remove_lesson_mentions(lesson: Lesson | str) -> MentionIndexDelta:
+    delta = MentionIndexDelta()
     if _MENTION_INDEX is None:
-        raise RuntimeError("Mention index must be built before resolving.")
-
-    term_meta: dict[str, dict[str, str | None]] = {}
-    term_labels: dict[str, str] = {}
-    term_related: dict[str, list[str]] = {}
-    auto_terms: dict[str, dict[str, object]] = {}
-    lesson_terms: dict[str, set[str]] = {key: set() for key in _MENTION_INDEX.lesson_mentions}
-    lesson_owner_terms: dict[str, dict[str, set[str]]] = {key: {} for key in _MENTION_INDEX.lesson_mentions}
-    lesson_aliases: dict[str, dict[str, str]] = {key: {} for key in _MENTION_INDEX.lesson_mentions}
-
-    def term_label(name: str, kind: str) -> str:
-        if kind in {"method", "function", "builtin"}:
-            return f"{name}()"
-        return name
-
-    def build_term_id(key: MentionKey) -> str:
-        if key.name in glossary:
-            return key.name
-        if key.kind == "explicit":
-            return key.name
-        if key.kind == "method":
-            owner = key.owner or "unknown"
-            return f"method:{owner}.{key.name}"
-        if key.kind == "attribute":
-            owner = key.owner or "unknown"
-            return f"attr:{owner}.{key.name}"
-        if key.kind == "builtin":
-            return f"builtin:{key.name}"
-        if key.namespace != "unknown":
-            return f"{key.namespace}:{key.name}"
-        return f"unknown:{key.name}"
-
-    term_id_map: dict[MentionKey, str] = {}
-    for key, term in _MENTION_INDEX.terms.items():
-        term_id = build_term_id(key)
-        term_id_map[key] = term_id
-        label = term_label(key.name, key.kind)
-        term_labels[term_id] = label
-        term_meta[term_id] = {
-            "name": key.name,
-            "kind": key.kind,
-            "owner": key.owner,
-            "namespace": key.namespace,
-            "label": label,
-        }
-        if term_id not in glossary:
-            auto_terms[term_id] = {
-                "tooltip": "Término detectado en las lecciones. Abre para ver detalles.",
-                "definition_parts": {
-                    "que_es": "Pendiente de documentar.",
-                    "sintaxis": "Pendiente de documentar.",
-                    "ejemplo": "Pendiente de documentar.",
-                    "error_tipico": "Pendiente de documentar.",
-                    "ver_tambien": "Pendiente de documentar.",
-                },
-            }
-
-    owner_groups: dict[str, list[str]] = {}
-    for term_id, meta in term_meta.items():
-        owner = meta.get("owner")
-        if owner:
-            owner_groups.setdefault(owner, []).append(term_id)
-
-    for owner, terms in owner_groups.items():
-        sorted_terms = sorted(terms, key=lambda tid: term_labels.get(tid, tid))
-        for term_id in terms:
-            related = [tid for tid in sorted_terms if tid != term_id]
-            if related:
-                term_related[term_id] = related
-
-    for lesson_key, mentions in _MENTION_INDEX.lesson_mentions.items():
-        for mention in sorted(mentions, key=lambda k: (k.name, k.kind, k.owner or "")):
-            term_id = term_id_map[mention]
-            lesson_terms[lesson_key].add(term_id)
-            owner = mention.owner
-            if owner:
-                lesson_owner_terms.setdefault(lesson_key, {}).setdefault(owner, set()).add(term_id)
-            aliases = _MENTION_INDEX.terms[mention].aliases
-            alias_map = lesson_aliases[lesson_key]
-            for alias in sorted(aliases):
-                alias_map.setdefault(alias, term_id)
-
-    resolved = ResolvedMentionIndex(
-        auto_terms=auto_terms,
-        term_meta=term_meta,
-        term_labels=term_labels,
-        term_related=term_related,
-        lesson_terms=lesson_terms,
-        lesson_owner_terms=lesson_owner_terms,
-        lesson_aliases=lesson_aliases,
-        lesson_types=_MENTION_INDEX.lesson_types,
+        return delta
+    lesson_key = lesson if isinstance(lesson, str) else _lesson_id(lesson)
+    mentions = _MENTION_INDEX.lessons.pop(lesson_key, None)
+    _MENTION_INDEX.lesson_types.pop(lesson_key, None)
+    if mentions is None:
+        return delta
+    delta.changed_lessons.add(lesson_key)
+    if _RESOLVED_INDEX is not None:
+        _unlink_lesson(_RESOLVED_INDEX, lesson_key, mentions)
+    touched_owners: set[str] = set()
+    _release_mentions(_MENTION_INDEX, mentions.term_ids, touched_owners, delta)
+    if _RESOLVED_INDEX is not None:
+        for owner in touched_owners:
+            _refresh_owner_group(_RESOLVED_INDEX, owner)
+    return delta
+
+
+def add_lesson_mentions(lesson: Lesson | LessonSources) -> MentionIndexDelta:
+    if _MENTION_INDEX is None:
+        raise RuntimeError("Mention index must be built before adding lessons.")
+    sources = lesson if isinstance(lesson, LessonSources) else extract_lesson_sources(lesson)
+    lesson_key = sources.lesson_key
+    delta = remove_lesson_mentions(lesson_key)
+    mentions, grown = _index_lesson_texts(
+        _MENTION_INDEX, lesson_key, sources.texts, sources.code, sources.types, _code_mentions()
     )
-    global _RESOLVED_INDEX
-    _RESOLVED_INDEX = resolved
+    delta.changed_lessons.add(lesson_key)
+    resolved = _RESOLVED_INDEX
+    if resolved is None:
+        return delta
+
+    touched_owners: set[str] = set()
+    for mention_id in mentions.term_ids:
+        _resolve_term(resolved, _MENTION_INDEX, mention_id, touched_owners, _GLOSSARY, delta)
+    for owner in touched_owners:
+        _refresh_owner_group(resolved, owner)
+
+    _resolve_lesson(resolved, lesson_key, mentions)
+    if grown:
+        for other_key, other_mentions in _MENTION_INDEX.lessons.items():
+            if other_key != lesson_key and not grown.isdisjoint(other_mentions.term_ids):
+                delta.changed_lessons.add(other_key)
+    return delta
+
+
+def replace_lesson_mentions(lesson: Lesson | LessonSources) -> MentionIndexDelta:
+    return add_lesson_mentions(lesson)
+
+
+def mention_index_fingerprint(lesson_sources: str) -> str:
+    digest = hashlib.sha1()
+    digest.update(f"v{MENTION_CACHE_VERSION}:{lesson_sources}:".encode("utf-8"))
+    digest.update(disk_cache.file_digest(*_FINGERPRINT_SOURCES).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_mention_index_cache(
+    fingerprint: str,
+    glossary: dict[str, dict[str, object]],
+) -> ResolvedMentionIndex | None:
+    data = disk_cache.read_pickle(MENTION_CACHE_FILE)
+    if not isinstance(data, dict):
+        return None
+    if data.get("version") != MENTION_CACHE_VERSION or data.get("fingerprint") != fingerprint:
+        return None
+    index = data.get("index")
+    resolved = data.get("resolved")
+    if not isinstance(index, MentionIndex) or not isinstance(resolved, ResolvedMentionIndex):
+        return None
+    install_mention_index(index, resolved, glossary)
     return resolved
 
 
+def save_mention_index_cache(
+    fingerprint: str,
+    index: MentionIndex,
+    resolved: ResolvedMentionIndex,
+    code_cache: CodeMentionCache | None = None,
+) -> bool:
+    save_code_mention_cache(code_cache)
+    return disk_cache.write_pickle(
+        MENTION_CACHE_FILE,
+        {
+            "version": MENTION_CACHE_VERSION,
+            "fingerprint": fingerprint,
+            "index": index,
+            "resolved": resolved,
+        },
+    )
+
+
 def get_resolved_index() -> ResolvedMentionIndex | None:
     return _RESOLVED_INDEX
 
 
+def _lesson_mentions(lesson: Lesson) -> LessonMentions | None:
+    if _MENTION_INDEX is None or _RESOLVED_INDEX is None:
+        return None
+    return _MENTION_INDEX.lessons.get(_lesson_id(lesson))
+
+
+def _mention_order(mention_id: int) -> tuple[str, str, str, str]:
+    key = _MENTION_INDEX.keys[mention_id]
+    return (key.name, key.kind, key.owner or "", key.namespace)
+
+
 def get_lesson_aliases(lesson: Lesson) -> dict[str, str]:
-    if _RESOLVED_INDEX is None:
+    mentions = _lesson_mentions(lesson)
+    if mentions is None:
         return {}
-    return _RESOLVED_INDEX.lesson_aliases.get(_lesson_id(lesson), {})
+    alias_map: dict[str, str] = {}
+    for mention_id in sorted(mentions.term_ids, key=_mention_order):
+        key = _MENTION_INDEX.keys[mention_id]
+        term_id = _RESOLVED_INDEX.names[_RESOLVED_INDEX.targets[mention_id]]
+        for alias in sorted(_alias_set(key.name, key.namespace, _MENTION_INDEX.alias_bits[mention_id])):
+            alias_map.setdefault(alias, term_id)
+    return alias_map
 
 
 def get_lesson_owner_terms(lesson: Lesson) -> dict[str, set[str]]:
-    if _RESOLVED_INDEX is None:
+    mentions = _lesson_mentions(lesson)
+    if mentions is None:
         return {}
-    return _RESOLVED_INDEX.lesson_owner_terms.get(_lesson_id(lesson), {})
+    owner_terms: dict[str, set[str]] = {}
+    for mention_id in mentions.term_ids:
+        owner = _MENTION_INDEX.keys[mention_id].owner
+        if owner:
+            term_id = _RESOLVED_INDEX.names[_RESOLVED_INDEX.targets[mention_id]]
+            owner_terms.setdefault(owner, set()).add(term_id)
+    return owner_terms
 
 
 def get_lesson_terms(lesson: Lesson) -> set[str]:
-    if _RESOLVED_INDEX is None:
+    mentions = _lesson_mentions(lesson)
+    if mentions is None:
         return set()
-    return set(_RESOLVED_INDEX.lesson_terms.get(_lesson_id(lesson), set()))
+    names = _RESOLVED_INDEX.names
+    targets = _RESOLVED_INDEX.targets
+    return {names[targets[mention_id]] for mention_id in mentions.term_ids}
 
 
 def get_lesson_types(lesson: Lesson) -> set[str]:
     if _RESOLVED_INDEX is None:
         return set()
-    return _RESOLVED_INDEX.lesson_types.get(_lesson_id(lesson), set())
+    return set(_RESOLVED_INDEX.lesson_types.get(_lesson_id(lesson), ()))
 
 
 def get_term_label(term_id: str) -> str:
     if _RESOLVED_INDEX is None:
         return term_id
-    return _RESOLVED_INDEX.term_labels.get(term_id, term_id)
+    meta = _RESOLVED_INDEX.term_meta.get(term_id)
+    return meta.label if meta is not None else term_id
 
 
 def get_term_meta(term_id: str) -> dict[str, str | None]:
@@ -544,7 +1383,13 @@ def get_term_meta(term_id: str) -> dict[str, str | None]:
     return dict(_RESOLVED_INDEX.term_meta.get(term_id, {}))
 
 
-def get_related_terms(term_id: str) -> list[str]:
+def get_term_lessons(term_id: str) -> list[TermLesson]:
+    if _RESOLVED_INDEX is None:
+        return []
+    return list(_RESOLVED_INDEX.postings.get(_RESOLVED_INDEX.name_ids.get(term_id, -1), ()))
+
+
+def get_related_terms(term_id: str, limit: int | None = None) -> list[str]:
     if _RESOLVED_INDEX is None:
         return []
-    return list(_RESOLVED_INDEX.term_related.get(term_id, []))
+    return _RESOLVED_INDEX.related_terms(term_id, limit)
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+import math
+from pathlib import Path
+from typing import Collection, Mapping
+
+from app.utils import disk_cache
+from app.utils.search_index import FIELD_WEIGHTS, tokenize
+
+RELATED_CACHE_VERSION = 2
+RELATED_CACHE_FILE = "related_index.pickle"
+DEFAULT_RELATED_LIMIT = 5
+MIN_TOKEN_LENGTH = 3
+_UTILS_DIR = Path(__file__).resolve().parent
+_FINGERPRINT_SOURCES = (
+    _UTILS_DIR / "related_index.py",
+    _UTILS_DIR / "search_index.py",
+)
+
+TermVector = dict[str, float]
+
+
+def term_frequencies(fields: Mapping[str, str]) -> TermVector:
+    counts: TermVector = {}
+    for field_name, text in fields.items():
+        weight = FIELD_WEIGHTS.get(field_name, 1.0)
+        for token in tokenize(text):
+            if len(token) >= MIN_TOKEN_LENGTH and not token.isdigit():
+                counts[token] = counts.get(token, 0.0) + weight
+    return {token: 1.0 + math.log(count) for token, count in counts.items()}
+
+
+class RelatedIndex:
+    def __init__(self) -> None:
+        self._frequencies: dict[str, TermVector] = {}
+        self._sources: dict[str, str] = {}
+        self._documents: dict[str, set[str]] = {}
+        self._idf: dict[str, float] = {}
+        self._vectors: dict[str, TermVector] = {}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._total = 0
+        self._dirty_docs: set[str] = set()
+        self._dirty_tokens: set[str] = set()
+        self.modified = False
+
+    def __len__(self) -> int:
+        return len(self._frequencies)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._frequencies
+
+    def is_current(self, doc_id: str, source: str) -> bool:
+        return doc_id in self._frequencies and self._sources.get(doc_id) == source
+
+    def set(self, doc_id: str, frequencies: TermVector, source: str = "") -> None:
+        self.remove(doc_id)
+        self._frequencies[doc_id] = frequencies
+        self._sources[doc_id] = source
+        for token in frequencies:
+            self._documents.setdefault(token, set()).add(doc_id)
+        self._dirty_docs.add(doc_id)
+        self._dirty_tokens.update(frequencies)
+        self.modified = True
+
+    def remove(self, doc_id: str) -> None:
+        frequencies = self._frequencies.pop(doc_id, None)
+        if frequencies is None:
+            return
+        self._sources.pop(doc_id, None)
+        for token in frequencies:
+            documents = self._documents[token]
+            documents.discard(doc_id)
+            if not documents:
+                del self._documents[token]
+        self._dirty_docs.add(doc_id)
+        self._dirty_tokens.update(frequencies)
+        self.modified = True
+
+    def retain(self, doc_ids: Collection[str]) -> None:
+        for doc_id in [doc_id for doc_id in self._frequencies if doc_id not in doc_ids]:
+            self.remove(doc_id)
+
+    def clear(self) -> None:
+        self._frequencies.clear()
+        self._sources.clear()
+        self._documents.clear()
+        self._idf.clear()
+        self._vectors.clear()
+        self._postings.clear()
+        self._total = 0
+        self._dirty_docs.clear()
+        self._dirty_tokens.clear()
+        self.modified = True
+
+    def related(
+        self,
+        doc_id: str,
+        limit: int | None = DEFAULT_RELATED_LIMIT,
+        candidates: Collection[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        self._refresh()
+        vector = self._vectors.get(doc_id)
+        if not vector:
+            return []
+        return self._ranked(vector, limit, candidates, exclude=doc_id)
+
+    def similarity(self, text: str, doc_ids: Collection[str]) -> dict[str, float]:
+        self._refresh()
+        weights: TermVector = {}
+        for token in tokenize(text):
+            idf = self._idf.get(token)
+            if idf:
+                weights[token] = weights.get(token, 0.0) + idf
+        vector = _normalized(weights)
+        if not vector:
+            return {}
+        return dict(self._ranked(vector, None, doc_ids))
+
+    def snapshot(self) -> dict[str, object]:
+        self._refresh()
+        return {
+            "sources": dict(self._sources),
+            "frequencies": dict(self._frequencies),
+            "idf": dict(self._idf),
+            "vectors": dict(self._vectors),
+            "postings": dict(self._postings),
+        }
+
+    def restore(self, snapshot: Mapping[str, object]) -> None:
+        self.clear()
+        sources = snapshot.get("sources")
+        frequencies = snapshot.get("frequencies")
+        if not isinstance(sources, dict) or not isinstance(frequencies, dict):
+            return
+        for doc_id, doc_frequencies in frequencies.items():
+            self.set(doc_id, doc_frequencies, sources.get(doc_id, ""))
+        idf = snapshot.get("idf")
+        vectors = snapshot.get("vectors")
+        postings = snapshot.get("postings")
+        if isinstance(idf, dict) and isinstance(vectors, dict) and isinstance(postings, dict):
+            if vectors.keys() == self._frequencies.keys():
+                self._idf = idf
+                self._vectors = vectors
+                self._postings = postings
+                self._total = len(self._frequencies)
+                self._dirty_docs.clear()
+                self._dirty_tokens.clear()
+        self.modified = False
+
+    def _ranked(
+        self,
+        vector: TermVector,
+        limit: int | None,
+        candidates: Collection[str] | None,
+        exclude: str | None = None,
+    ) -> list[tuple[str, float]]:
+        scores: dict[str, float] = {}
+        for token, weight in vector.items():
+            for other_id, other_weight in self._postings.get(token, {}).items():
+                if other_id == exclude or (candidates is not None and other_id not in candidates):
+                    continue
+                scores[other_id] = scores.get(other_id, 0.0) + weight * other_weight
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return ranked
+
+    def _refresh(self) -> None:
+        if not self._dirty_docs:
+            return
+        total = len(self._frequencies)
+        if total != self._total:
+            tokens: Collection[str] = self._documents
+            doc_ids: Collection[str] = set(self._frequencies) | self._dirty_docs
+            self._idf = {}
+        else:
+            tokens = self._dirty_tokens
+            doc_ids = set(self._dirty_docs)
+            for token in tokens:
+                doc_ids.update(self._documents.get(token, ()))
+        for token in tokens:
+            count = len(self._documents.get(token, ()))
+            if 0 < count < total:
+                self._idf[token] = math.log(total / count)
+            else:
+                self._idf.pop(token, None)
+        for doc_id in doc_ids:
+            for token in self._vectors.pop(doc_id, {}):
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self._postings[token]
+            frequencies = self._frequencies.get(doc_id)
+            if frequencies is None:
+                continue
+            vector = _normalized(
+                {token: weight * self._idf[token] for token, weight in frequencies.items() if token in self._idf}
+            )
+            self._vectors[doc_id] = vector
+            for token, weight in vector.items():
+                self._postings.setdefault(token, {})[doc_id] = weight
+        self._total = total
+        self._dirty_docs.clear()
+        self._dirty_tokens.clear()
+
+
+def _normalized(weights: TermVector) -> TermVector:
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    if not norm:
+        return {}
+    return {token: weight / norm for token, weight in weights.items()}
+
+
+def related_index_fingerprint() -> str:
+    digest = hashlib.sha1()
+    digest.update(f"v{RELATED_CACHE_VERSION}:".encode("utf-8"))
+    digest.update(disk_cache.file_digest(*_FINGERPRINT_SOURCES).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_related_index(index: RelatedIndex) -> bool:
+    data = disk_cache.read_pickle(RELATED_CACHE_FILE)
+    if not isinstance(data, dict):
+        return False
+    if data.get("version") != RELATED_CACHE_VERSION or data.get("fingerprint") != related_index_fingerprint():
+        return False
+    snapshot = data.get("snapshot")
+    if not isinstance(snapshot, dict):
+        return False
+    index.restore(snapshot)
+    return True
+
+
+def save_related_index(index: RelatedIndex) -> bool:
+    saved = disk_cache.write_pickle(
+        RELATED_CACHE_FILE,
+        {
+            "version": RELATED_CACHE_VERSION,
+            "fingerprint": related_index_fingerprint(),
+            "snapshot": index.snapshot(),
+        },
+    )
+    if saved:
+        index.modified = False
+    return saved
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Collection, Mapping
+
+FIELD_WEIGHTS: dict[str, float] = {
+    "title": 8.0,
+    "tags": 4.0,
+    "summary": 2.0,
+    "body": 1.0,
+    "code": 0.5,
+}
+
+MIN_INFIX_LENGTH = 4
+INFIX_WEIGHT = 0.5
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    doc_id: str
+    score: float
+
+
+class SearchIndex:
+    def __init__(self, weights: Mapping[str, float] | None = None) -> None:
+        self._weights = dict(FIELD_WEIGHTS if weights is None else weights)
+        self._postings: dict[str, dict[str, float]] = {}
+        self._doc_tokens: dict[str, tuple[str, ...]] = {}
+        self._vocabulary: list[str] = []
+        self._vocabulary_text = ""
+        self._vocabulary_starts: list[int] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._doc_tokens
+
+    def add(self, doc_id: str, fields: Mapping[str, str]) -> None:
+        self.remove(doc_id)
+        weights: dict[str, float] = {}
+        for field_name, text in fields.items():
+            weight = self._weights.get(field_name, 1.0)
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + weight
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._vocabulary_dirty = True
+            postings[doc_id] = 1.0 + math.log(weight)
+        self._doc_tokens[doc_id] = tuple(weights)
+
+    def remove(self, doc_id: str) -> None:
+        tokens = self._doc_tokens.pop(doc_id, None)
+        if tokens is None:
+            return
+        for token in tokens:
+            postings = self._postings[token]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary_dirty = True
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_tokens.clear()
+        self._vocabulary = []
+        self._vocabulary_text = ""
+        self._vocabulary_starts = []
+        self._vocabulary_dirty = False
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        candidates: Collection[str] | None = None,
+        ranked: bool = True,
+    ) -> list[SearchHit]:
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        exact = tokens[:-1]
+        if query[-1].isspace():
+            exact = tokens
+            last_candidates: list[tuple[str, float]] = []
+        else:
+            last_candidates = [(token, 1.0) for token in self._expand_prefix(tokens[-1])]
+            if len(tokens[-1]) >= MIN_INFIX_LENGTH:
+                last_candidates.extend((token, INFIX_WEIGHT) for token in self._expand_infix(tokens[-1]))
+            if not last_candidates:
+                return []
+
+        groups: list[dict[str, float]] = []
+        for token in dict.fromkeys(exact):
+            postings = self._postings.get(token)
+            if not postings:
+                return []
+            groups.append(self._scored(postings, candidates))
+        if last_candidates:
+            merged: dict[str, float] = {}
+            for token, factor in last_candidates:
+                for doc_id, score in self._scored(self._postings[token], candidates).items():
+                    score *= factor
+                    if score > merged.get(doc_id, 0.0):
+                        merged[doc_id] = score
+            groups.append(merged)
+
+        groups.sort(key=len)
+        scores = groups[0]
+        for group in groups[1:]:
+            scores = {doc_id: score + group[doc_id] for doc_id, score in scores.items() if doc_id in group}
+            if not scores:
+                return []
+        hits = list(scores.items())
+        if ranked:
+            hits.sort(key=lambda item: (-item[1], item[0]))
+        if limit is not None:
+            hits = hits[:limit]
+        return [SearchHit(doc_id, score) for doc_id, score in hits]
+
+    def matching_ids(self, query: str, candidates: Collection[str] | None = None) -> set[str]:
+        return {hit.doc_id for hit in self.search(query, candidates=candidates, ranked=False)}
+
+    def _scored(self, postings: dict[str, float], candidates: Collection[str] | None = None) -> dict[str, float]:
+        idf = math.log(1.0 + len(self._doc_tokens) / len(postings))
+        if candidates is None:
+            return {doc_id: weight * idf for doc_id, weight in postings.items()}
+        if len(candidates) < len(postings):
+            return {doc_id: postings[doc_id] * idf for doc_id in candidates if doc_id in postings}
+        return {doc_id: weight * idf for doc_id, weight in postings.items() if doc_id in candidates}
+
+    def _refresh_vocabulary(self) -> None:
+        if not self._vocabulary_dirty:
+            return
+        self._vocabulary = sorted(self._postings)
+        self._vocabulary_text = "\n".join(self._vocabulary)
+        self._vocabulary_starts = []
+        start = 0
+        for token in self._vocabulary:
+            self._vocabulary_starts.append(start)
+            start += len(token) + 1
+        self._vocabulary_dirty = False
+
+    def _expand_infix(self, fragment: str) -> list[str]:
+        self._refresh_vocabulary()
+        text = self._vocabulary_text
+        starts = self._vocabulary_starts
+        matches: list[str] = []
+        position = text.find(fragment, 1)
+        while position >= 0:
+            index = bisect_right(starts, position) - 1
+            if starts[index] != position:
+                matches.append(self._vocabulary[index])
+            if index + 1 == len(starts):
+                break
+            position = text.find(fragment, starts[index + 1])
+        return matches
+
+    def _expand_prefix(self, prefix: str) -> list[str]:
+        self._refresh_vocabulary()
+        vocabulary = self._vocabulary
+        position = bisect_left(vocabulary, prefix)
+        matches: list[str] = []
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            matches.append(vocabulary[position])
+            position += 1
+        return matches
+
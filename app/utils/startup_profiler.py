@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import ContextManager, Iterator
+
+LOGGER = logging.getLogger(__name__)
+REPORT_VERSION = 1
+DEFAULT_REPORT_FILE = "startup_profile.json"
+
+
+@dataclass
+class PhaseRecord:
+    name: str
+    parent: str | None
+    thread: str
+    started_at: float
+    seconds: float = 0.0
+    allocated_bytes: int = 0
+    peak_bytes: int = 0
+
+
+@dataclass
+class _OpenPhase:
+    record: PhaseRecord
+    started: float
+    memory_before: int
+    peak: int = 0
+
+
+@dataclass
+class StartupProfiler:
+    report_path: Path
+    origin: float = field(default_factory=time.perf_counter)
+    records: list[PhaseRecord] = field(default_factory=list)
+    marks: dict[str, float] = field(default_factory=dict)
+    _local: threading.local = field(default_factory=threading.local)
+    _written: bool = False
+
+    @property
+    def _stack(self) -> list[_OpenPhase]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        self._fold_peak()
+        memory_before, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        parent = self._stack[-1].record.name if self._stack else None
+        started = time.perf_counter()
+        record = PhaseRecord(
+            name=name,
+            parent=parent,
+            thread=threading.current_thread().name,
+            started_at=started - self.origin,
+        )
+        frame = _OpenPhase(record=record, started=started, memory_before=memory_before)
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            record.seconds = time.perf_counter() - started
+            memory_after, peak = tracemalloc.get_traced_memory()
+            self._stack.pop()
+            record.allocated_bytes = memory_after - memory_before
+            record.peak_bytes = max(frame.peak, peak) - memory_before
+            if self._stack:
+                self._stack[-1].peak = max(self._stack[-1].peak, frame.peak, peak)
+            tracemalloc.reset_peak()
+            self.records.append(record)
+
+    def mark(self, name: str) -> None:
+        self.marks.setdefault(name, time.perf_counter() - self.origin)
+
+    def _fold_peak(self) -> None:
+        if self._stack:
+            _current, peak = tracemalloc.get_traced_memory()
+            self._stack[-1].peak = max(self._stack[-1].peak, peak)
+
+    def summary(self) -> list[dict[str, object]]:
+        totals: dict[tuple[str, str | None], dict[str, object]] = {}
+        for record in self.records:
+            key = (record.name, record.parent)
+            total = totals.get(key)
+            if total is None:
+                total = totals[key] = {
+                    "name": record.name,
+                    "parent": record.parent,
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "first_seconds": record.seconds,
+                    "allocated_bytes": 0,
+                    "peak_bytes": 0,
+                }
+            total["calls"] += 1
+            total["seconds"] += record.seconds
+            total["allocated_bytes"] += record.allocated_bytes
+            total["peak_bytes"] = max(total["peak_bytes"], record.peak_bytes)
+        return sorted(totals.values(), key=lambda item: item["seconds"], reverse=True)
+
+    def report(self) -> dict[str, object]:
+        current, _peak = tracemalloc.get_traced_memory()
+        return {
+            "version": REPORT_VERSION,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "pid": os.getpid(),
+            "total_seconds": time.perf_counter() - self.origin,
+            "traced_bytes": current,
+            "marks": self.marks,
+            "summary": self.summary(),
+            "phases": [asdict(record) for record in sorted(self.records, key=lambda item: item.started_at)],
+        }
+
+    def write_report(self) -> None:
+        if self._written:
+            return
+        self._written = True
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(
+                json.dumps(self.report(), ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+        except OSError as exc:
+            LOGGER.warning("No se pudo escribir el perfil de arranque %s: %s", self.report_path, exc)
+            return
+        LOGGER.info("Perfil de arranque guardado en %s", self.report_path)
+
+
+_PROFILER: StartupProfiler | None = None
+_DISABLED = nullcontext()
+
+
+def start_profiling(report_path: str | os.PathLike[str] = DEFAULT_REPORT_FILE) -> StartupProfiler:
+    global _PROFILER
+    if _PROFILER is not None:
+        return _PROFILER
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _PROFILER = StartupProfiler(report_path=Path(report_path).expanduser().resolve())
+    atexit.register(_PROFILER.write_report)
+    return _PROFILER
+
+
+def get_profiler() -> StartupProfiler | None:
+    return _PROFILER
+
+
+def phase(name: str) -> ContextManager[None]:
+    if _PROFILER is None:
+        return _DISABLED
+    return _PROFILER.phase(name)
+
+
+def mark(name: str) -> None:
+    if _PROFILER is not None:
+        _PROFILER.mark(name)
@@ -20,17 +20,17 @@ QLineEdit {
 QLineEdit:focus {
     border-color: #4c8df6;
 }
-QTreeWidget, QListWidget {
+QTreeView, QListWidget, QListView#LibraryItemList {
     background: #ffffff;
     border: 1px solid #d7dde8;
     border-radius: 12px;
     padding: 6px;
 }
-QTreeWidget::item, QListWidget::item {
+QTreeView::item, QListWidget::item, QListView#LibraryItemList::item {
     padding: 6px 8px;
     border-radius: 8px;
 }
-QTreeWidget::item:selected, QListWidget::item:selected {
+QTreeView::item:selected, QListWidget::item:selected, QListView#LibraryItemList::item:selected {
     background: #e0ecff;
     color: #1f2937;
 }
@@ -205,17 +205,17 @@ QLineEdit {
 QLineEdit:focus {
     border-color: #d4af37;
 }
-QTreeWidget, QListWidget {
+QTreeView, QListWidget, QListView#LibraryItemList {
     background: #2a2a2a;
     border: 1px solid #3a3a3a;
     border-radius: 12px;
     padding: 6px;
 }
-QTreeWidget::item, QListWidget::item {
+QTreeView::item, QListWidget::item, QListView#LibraryItemList::item {
     padding: 6px 8px;
     border-radius: 8px;
 }
-QTreeWidget::item:selected, QListWidget::item:selected {
+QTreeView::item:selected, QListWidget::item:selected, QListView#LibraryItemList::item:selected {
     background: #333333;
     color: #f7f2e4;
 }
@@ -375,14 +375,34 @@ QToolTip {
 """
 
 THEMES = {"light": QSS_LIGHT, "dark": QSS_DARK}
+BADGE_COLORS = {
+    "light": {
+        "common": ("#c7d2fe", "#1e3a8a"),
+        "category": ("#e2e8f0", "#1f2937"),
+        "library": ("#bfdbfe", "#1e3a8a"),
+    },
+    "dark": {
+        "common": ("#d4af37", "#1e1e1e"),
+        "category": ("#3a3a3a", "#f7f2e4"),
+        "library": ("#4b5563", "#f7f2e4"),
+    },
+}
+_CURRENT_THEME = "light"
 
 
 def apply_theme(app: QApplication, theme_name: str) -> None:
+    global _CURRENT_THEME
+    _CURRENT_THEME = theme_name if theme_name in THEMES else "light"
     theme = THEMES.get(theme_name, QSS_LIGHT)
     base_font = QFont("Segoe UI", 10)
     app.setFont(base_font)
     app.setStyleSheet(theme)
 
 
+def badge_colors(variant: str) -> tuple[str, str]:
+    palette = BADGE_COLORS[_CURRENT_THEME]
+    return palette.get(variant, palette["category"])
+
+
 def toggle_theme(current: str) -> str:
     return "dark" if current == "light" else "light"
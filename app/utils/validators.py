@@ -7,7 +7,7 @@ LOGGER = logging.getLogger(__name__)
 
 
 def warn_if_short_example(code: str, context: str) -> None:
-    if not _is_dev_mode():
+    if not is_dev_mode():
         return
     code_lines = [
         line
@@ -21,7 +21,7 @@ def warn_if_short_example(code: str, context: str) -> None:
         )
 
 
-def _is_dev_mode() -> bool:
+def is_dev_mode() -> bool:
     env_value = os.getenv("PYTHONPEDIA_ENV", "").lower()
     explicit_flag = os.getenv("PYTHONPEDIA_DEV", "").lower()
     return env_value in {"dev", "development", "local"} or explicit_flag in {"1", "true", "yes"}